@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+
+def create_monthly_sales(n_shops, n_blocks, missing_ratio, seed=42):
+    """
+    Creates synthetic monthly sales data in the format of creating_monthly_data output.
+
+    Args:
+        n_shops (int): Number of shops.
+        n_blocks (int): Number of months (date_block_num values).
+        missing_ratio (float): Ratio of (month, shop) cells without any sale.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: Monthly sales data with missing months.
+    """
+    rng = np.random.default_rng(seed)
+    date_block_num = np.repeat(np.arange(n_blocks), n_shops)
+    shop_id = np.tile(np.arange(n_shops), n_blocks)
+
+    monthly_sales = pd.DataFrame({
+        'date_block_num': date_block_num,
+        'month': (date_block_num % 12 + 1).astype(np.int32),
+        'shop_id': shop_id,
+        'sales_item_price_mean': rng.gamma(2, 500, len(shop_id)),
+        'sales_sum': rng.integers(0, 5000, len(shop_id)).astype(np.float64),
+        'item_category_id_37_ratio': rng.random(len(shop_id))
+    })
+
+    return monthly_sales[rng.random(len(shop_id)) >= missing_ratio].reset_index(drop=True)
+
+
+def time_call(func, repeat):
+    """Returns the best wall clock time of repeat calls and the output of the last call."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the gap filling and lag feature engines.')
+    parser.add_argument('--shops', type=int, nargs='+', default=[60, 600, 6000])
+    parser.add_argument('--blocks', type=int, default=34)
+    parser.add_argument('--missing-ratio', type=float, default=0.1)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    feature_data = CreateFeatureData()
+
+    print(f"{'shops':>8} {'pandas (s)':>12} {'tensor (s)':>12} {'speedup':>8}")
+    for n_shops in args.shops:
+        monthly_sales = create_monthly_sales(n_shops, args.blocks, args.missing_ratio)
+
+        pandas_time, pandas_df = time_call(lambda: feature_data.create_lag_features(
+            feature_data.fill_empty_months_where_sale_not_exist(monthly_sales.copy())), args.repeat)
+        tensor_time, tensor_df = time_call(lambda: feature_data.create_lag_features_dense(monthly_sales),
+                                           args.repeat)
+
+        # Both engines must give the same output
+        pd.testing.assert_frame_equal(tensor_df, pandas_df)
+
+        print(f"{n_shops:>8} {pandas_time:>12.4f} {tensor_time:>12.4f} {pandas_time / tensor_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
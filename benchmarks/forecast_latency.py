@@ -0,0 +1,100 @@
+import argparse
+import http.client
+import json
+import os
+import sys
+import threading
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from benchmarks.feature_engines import create_monthly_sales
+from feature_data.create_feature_data import CreateFeatureData
+from forecast_service.forecast_service import ForecastService
+from modelling.packed_forest import PackedForest
+
+
+def run_client(port, shop_ids, n_requests, batch_size, seed, latencies):
+    """
+    Sends forecast requests of random shops over one keep-alive connection and records their latencies.
+
+    Args:
+        port (int): Port of the local server.
+        shop_ids (np.ndarray): shop_id values to request.
+        n_requests (int): Number of requests.
+        batch_size (int): Number of shops in each request.
+        seed (int): Seed of the random generator.
+        latencies (list): List where the latency of each request is appended in seconds.
+    """
+    rng = np.random.default_rng(seed)
+    connection = http.client.HTTPConnection('127.0.0.1', port)
+
+    for _ in range(n_requests):
+        # The body is sent as bytes, so http.client sends it together with the headers
+        body = json.dumps({"shop_ids": rng.choice(shop_ids, batch_size).tolist()}).encode()
+        start = time.perf_counter()
+        connection.request('POST', '/forecast', body, {'Content-Type': 'application/json'})
+        response = connection.getresponse()
+        response.read()
+        latencies.append(time.perf_counter() - start)
+
+        if response.status != 200:
+            raise RuntimeError(f"Forecast request failed with status {response.status}.")
+
+    connection.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test of the forecast service against a local HTTP server.')
+    parser.add_argument('--shops', type=int, default=60)
+    parser.add_argument('--blocks', type=int, default=34)
+    parser.add_argument('--trees', type=int, default=100)
+    parser.add_argument('--clients', type=int, default=8)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--batch-size', type=int, default=1)
+    parser.add_argument('--sklearn-rf', action='store_true', help='Serve the sklearn RF instead of PackedForest.')
+    args = parser.parse_args()
+
+    # Train a RF model on synthetic monthly sales with the feature pipeline
+    feature_data = CreateFeatureData()
+    monthly_sales = create_monthly_sales(args.shops, args.blocks, missing_ratio=0.1)
+    feature_df = feature_data.create_lag_features_dense(monthly_sales)
+    feature_df = feature_data.create_cyclic_features(feature_df)
+    feature_df = feature_data.drop_irrelevant_features(feature_df)
+    feature_df = feature_data.process_features(feature_df)
+
+    train_x = feature_df.drop(columns=['target'])
+    model = RandomForestRegressor(n_estimators=args.trees, random_state=42).fit(train_x, feature_df['target'])
+    if not args.sklearn_rf:
+        model = PackedForest.from_model(model)
+
+    service = ForecastService(model, feature_data.create_next_month_features(monthly_sales), train_x.columns)
+    server = service.create_server(port=0)
+    server_thread = threading.Thread(target=server.serve_forever, daemon=True)
+    server_thread.start()
+
+    latencies = []
+    clients = [threading.Thread(target=run_client, args=(server.server_port, service.shop_ids, args.requests,
+                                                          args.batch_size, seed, latencies))
+               for seed in range(args.clients)]
+
+    start = time.perf_counter()
+    for client in clients:
+        client.start()
+    for client in clients:
+        client.join()
+    elapsed = time.perf_counter() - start
+
+    server.shutdown()
+    service.stop()
+
+    latencies_ms = np.array(latencies) * 1000
+    print(f"{len(latencies)} requests of {args.batch_size} shops from {args.clients} clients "
+          f"in {elapsed:.2f} seconds ({len(latencies) / elapsed:.0f} requests/s)")
+    print(f"p50 latency: {np.percentile(latencies_ms, 50):.2f} ms, p99 latency: {np.percentile(latencies_ms, 99):.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
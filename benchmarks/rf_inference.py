@@ -0,0 +1,78 @@
+import argparse
+import os
+import sys
+import time
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.packed_forest import PackedForest
+
+
+def create_regression_data(n_rows, n_features, seed=42):
+    """
+    Creates synthetic regression data with a non-linear target.
+
+    Args:
+        n_rows (int): Number of rows.
+        n_features (int): Number of features.
+        seed (int): Seed of the random generator.
+
+    Returns:
+        pd.DataFrame: Features.
+        np.ndarray: Target values.
+    """
+    rng = np.random.default_rng(seed)
+    features = pd.DataFrame(rng.random((n_rows, n_features)), columns=[f'feature_{i}' for i in range(n_features)])
+    target = features['feature_0'] * 3 + np.sin(features['feature_1'] * 9) + rng.random(n_rows)
+
+    return features, target.to_numpy()
+
+
+def time_call(func, repeat):
+    """Returns the best wall clock time of repeat calls and the output of the last call."""
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        output = func()
+        best = min(best, time.perf_counter() - start)
+    return best, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmarks the packed RF inference engine against sklearn.')
+    parser.add_argument('--trees', type=int, default=300)
+    parser.add_argument('--train-rows', type=int, default=20000)
+    parser.add_argument('--predict-rows', type=int, default=10000)
+    parser.add_argument('--features', type=int, default=12)
+    parser.add_argument('--batch-size', type=int, default=1024)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    train_x, train_y = create_regression_data(args.train_rows, args.features)
+    predict_x, _ = create_regression_data(args.predict_rows, args.features, seed=0)
+
+    # Fully grown trees, like max_depth None in rf_param_dist
+    model = RandomForestRegressor(n_estimators=args.trees, random_state=42).fit(train_x, train_y)
+    packed_forest = PackedForest.from_model(model, batch_size=args.batch_size)
+
+    sklearn_bytes = sum(estimator.tree_.__getstate__()["nodes"].nbytes + estimator.tree_.value.nbytes
+                        for estimator in model.estimators_)
+    print(f"Node memory: sklearn {sklearn_bytes / 2 ** 20:.1f} MB, packed {packed_forest.nbytes / 2 ** 20:.1f} MB")
+
+    print(f"{'rows':>8} {'sklearn (s)':>12} {'packed (s)':>12} {'speedup':>8}")
+    for n_rows in [1, 100, args.predict_rows]:
+        rows = predict_x.iloc[:n_rows]
+        sklearn_time, sklearn_predictions = time_call(lambda: model.predict(rows), args.repeat)
+        packed_time, packed_predictions = time_call(lambda: packed_forest.predict(rows), args.repeat)
+
+        # Both engines must give the same predictions, up to the float32 leaf values
+        np.testing.assert_allclose(packed_predictions, sklearn_predictions, rtol=1e-5)
+
+        print(f"{n_rows:>8} {sklearn_time:>12.4f} {packed_time:>12.4f} {sklearn_time / packed_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
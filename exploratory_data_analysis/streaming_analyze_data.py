@@ -0,0 +1,362 @@
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from exploratory_data_analysis.analyze_data import AnalyzeData
+
+
+class QuantileSketch:
+    """
+    A mergeable quantile sketch of a stream of values, with a bounded number of stored values.
+
+    The values are kept in levels of compactors, where a value of level i stands for 2**i values of the stream.
+    When a level holds more than sketch_size values, it is sorted and every other value, from a random offset,
+    is promoted to the next level. The rank error of a quantile is about log2(n / sketch_size) / sketch_size,
+    and two sketches are merged by merging their levels, so chunks can be sketched separately.
+
+    Attributes:
+        sketch_size (int): Maximum number of values of a level.
+        levels (list): Stored values of each level.
+    """
+
+    def __init__(self, sketch_size=2048, random_state=0):
+        """
+        Initializes the QuantileSketch class with empty levels.
+
+        Args:
+            sketch_size (int): Maximum number of values of a level.
+            random_state (int): Seed of the compaction offsets.
+        """
+        self.sketch_size = sketch_size
+        self.levels = [np.empty(0)]
+        self._rng = np.random.default_rng(random_state)
+
+    def _compress(self):
+        """Compacts the levels, from the lowest level, until no level holds more than sketch_size values."""
+        level = 0
+        while level < len(self.levels):
+            values = self.levels[level]
+            if len(values) > self.sketch_size:
+                values = np.sort(values)
+
+                # An odd value stays on its level, so the total weight of the sketch does not change
+                kept = values[:len(values) % 2]
+                promoted = values[len(kept):][self._rng.integers(2)::2]
+
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                self.levels[level] = kept
+                self.levels[level + 1] = np.concatenate([self.levels[level + 1], promoted])
+            level += 1
+
+    def update(self, values):
+        """
+        Adds values of the stream to the sketch, missing values are skipped.
+
+        Args:
+            values (array-like): Values of the stream.
+        """
+        values = np.asarray(values, dtype=np.float64)
+        self.levels[0] = np.concatenate([self.levels[0], values[~np.isnan(values)]])
+        self._compress()
+
+    def merge(self, other):
+        """
+        Adds the values of another sketch to the sketch.
+
+        Args:
+            other (QuantileSketch): The sketch of other values of the stream.
+        """
+        for level, values in enumerate(other.levels):
+            if level == len(self.levels):
+                self.levels.append(np.empty(0))
+            self.levels[level] = np.concatenate([self.levels[level], values])
+        self._compress()
+
+    def quantile(self, q):
+        """
+        Estimates quantiles of the values of the stream.
+
+        Args:
+            q (array-like): Quantiles between 0 and 1.
+
+        Returns:
+            np.ndarray: Estimated value of each quantile, NaN if the sketch is empty.
+        """
+        values = np.concatenate(self.levels)
+        if len(values) == 0:
+            return np.full(np.shape(q), np.nan)
+
+        weights = np.concatenate([np.full(len(level_values), 2.0 ** level)
+                                  for level, level_values in enumerate(self.levels)])
+        order = np.argsort(values, kind='stable')
+        cumulative_weights = np.cumsum(weights[order])
+
+        positions = np.searchsorted(cumulative_weights, np.asarray(q) * cumulative_weights[-1], side='left')
+        return values[order][np.minimum(positions, len(values) - 1)]
+
+
+class StreamingAnalyzeData(AnalyzeData):
+    """
+    Performs the exploratory data analysis of AnalyzeData on a stream of DataFrame chunks,
+    e.g. of a csv file which does not fit in memory.
+
+    Each chunk is read once:
+        - The count, mean and variance of the numeric columns are combined with the running moments of the
+          previous chunks, and the min, max and missing values are updated.
+        - The quantiles of the numeric columns are estimated with a QuantileSketch of each column.
+        - A uniform reservoir sample of the numeric rows is kept, on which the Spearman correlation is calculated.
+
+    The sample is the df of AnalyzeData, so the correlation matrix is created by AnalyzeData.
+
+    Attributes:
+        df (pd.DataFrame): The reservoir sample of the numeric columns.
+        sample_size (int): Maximum number of rows of the reservoir sample.
+        sketch_size (int): Maximum number of values of a level of the quantile sketches.
+        n_rows (int): Number of rows of the stream.
+        dtypes (pd.Series): Data types of the columns, from the first chunk.
+        numeric_columns (list): Names of the numeric columns.
+        null_counts (pd.Series): Number of missing values of each column.
+        sketches (list): QuantileSketch of each numeric column.
+    """
+
+    def __init__(self, sample_size=100000, sketch_size=2048, random_state=0):
+        """
+        Initializes the StreamingAnalyzeData class with empty statistics.
+
+        Args:
+            sample_size (int): Maximum number of rows of the reservoir sample.
+            sketch_size (int): Maximum number of values of a level of the quantile sketches.
+            random_state (int): Seed of the reservoir sample and the quantile sketches.
+        """
+        super().__init__(None)
+        self.sample_size = sample_size
+        self.sketch_size = sketch_size
+        self.n_rows = 0
+        self.dtypes = None
+        self.numeric_columns = None
+        self.null_counts = None
+        self.sketches = None
+        self._random_state = random_state
+        self._rng = np.random.default_rng(random_state)
+
+        # Running moments of the numeric columns
+        self._count = None
+        self._mean = None
+        self._m2 = None
+        self._min = None
+        self._max = None
+
+        # Random key of each row of the reservoir sample, the rows with the smallest keys are kept
+        self._sample_keys = np.empty(0)
+
+    @classmethod
+    def from_csv(cls, csv_path, chunk_size=1000000, **kwargs):
+        """
+        Analyzes a csv file chunk by chunk.
+
+        Args:
+            csv_path (str): Path to the csv file.
+            chunk_size (int): Number of rows read at a time.
+            **kwargs: Arguments of StreamingAnalyzeData.
+
+        Returns:
+            StreamingAnalyzeData: The analysis of the file.
+        """
+        analyze_data = cls(**kwargs)
+        for chunk in pd.read_csv(csv_path, chunksize=chunk_size):
+            analyze_data.update(chunk)
+
+        return analyze_data
+
+    def _initialize(self, chunk):
+        """
+        Initializes the statistics with the columns of the first chunk.
+
+        Args:
+            chunk (pd.DataFrame): The first chunk of the stream.
+        """
+        self.dtypes = chunk.dtypes
+        self.numeric_columns = list(chunk.select_dtypes(include='number').columns)
+        self.null_counts = pd.Series(0, index=chunk.columns)
+        self.sketches = [QuantileSketch(self.sketch_size, self._random_state + i)
+                         for i in range(len(self.numeric_columns))]
+
+        n_numeric = len(self.numeric_columns)
+        self._count = np.zeros(n_numeric)
+        self._mean = np.zeros(n_numeric)
+        self._m2 = np.zeros(n_numeric)
+        self._min = np.full(n_numeric, np.inf)
+        self._max = np.full(n_numeric, -np.inf)
+        self.df = chunk[self.numeric_columns].iloc[:0]
+
+    def _combine_moments(self, count, mean, m2):
+        """
+        Combines the running moments with the moments of other rows, with the parallel variance formula.
+
+        Args:
+            count (np.ndarray): Number of non-missing values of each numeric column.
+            mean (np.ndarray): Mean of each numeric column.
+            m2 (np.ndarray): Sum of squared deviations from the mean of each numeric column.
+        """
+        total_count = self._count + count
+        delta = mean - self._mean
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            self._mean = np.where(total_count > 0, self._mean + delta * count / total_count, 0)
+            self._m2 = np.where(total_count > 0, self._m2 + m2 + delta ** 2 * self._count * count / total_count, 0)
+        self._count = total_count
+
+    def _update_sample(self, rows, keys):
+        """
+        Adds rows to the reservoir sample, and keeps the sample_size rows with the smallest random keys.
+
+        Args:
+            rows (pd.DataFrame): Numeric rows.
+            keys (np.ndarray): Uniform random key of each row.
+        """
+        # Once the sample is full, only the rows with a smaller key than the largest key of the sample can be kept
+        if len(self._sample_keys) >= self.sample_size:
+            candidates = keys < self._sample_keys.max()
+            rows, keys = rows[candidates], keys[candidates]
+
+        sample = pd.concat([self.df, rows], ignore_index=True)
+        sample_keys = np.concatenate([self._sample_keys, keys])
+
+        if len(sample_keys) > self.sample_size:
+            kept = np.sort(np.argpartition(sample_keys, self.sample_size)[:self.sample_size])
+            sample, sample_keys = sample.iloc[kept].reset_index(drop=True), sample_keys[kept]
+
+        self.df, self._sample_keys = sample, sample_keys
+
+    def update(self, chunk):
+        """
+        Adds a chunk of the stream to the statistics.
+
+        Args:
+            chunk (pd.DataFrame): A chunk of rows, with the columns of the first chunk.
+        """
+        if self.dtypes is None:
+            self._initialize(chunk)
+
+        self.n_rows += len(chunk)
+        self.null_counts += chunk.isnull().sum()
+
+        values = chunk[self.numeric_columns].to_numpy(dtype=np.float64)
+        count = (~np.isnan(values)).sum(axis=0)
+
+        with np.errstate(invalid='ignore', divide='ignore'):
+            mean = np.where(count > 0, np.nansum(values, axis=0) / count, 0)
+        m2 = np.nansum((values - mean) ** 2, axis=0)
+        self._combine_moments(count, mean, m2)
+
+        if len(chunk):
+            self._min = np.minimum(self._min, np.where(np.isnan(values), np.inf, values).min(axis=0))
+            self._max = np.maximum(self._max, np.where(np.isnan(values), -np.inf, values).max(axis=0))
+
+        for column_index, sketch in enumerate(self.sketches):
+            sketch.update(values[:, column_index])
+
+        self._update_sample(chunk[self.numeric_columns], self._rng.random(len(chunk)))
+
+    def merge(self, other):
+        """
+        Adds the statistics of another analysis of the same columns, e.g. of another part of the data.
+        The analyses of the parts need different random states, so their sample keys are independent.
+
+        Args:
+            other (StreamingAnalyzeData): The analysis of the other rows.
+        """
+        if other.dtypes is None:
+            return
+        if self.dtypes is None:
+            self._initialize(other.df)
+            self.dtypes = other.dtypes
+            self.null_counts = pd.Series(0, index=other.null_counts.index)
+
+        self.n_rows += other.n_rows
+        self.null_counts += other.null_counts
+        self._combine_moments(other._count, other._mean, other._m2)
+        self._min = np.minimum(self._min, other._min)
+        self._max = np.maximum(self._max, other._max)
+
+        for sketch, other_sketch in zip(self.sketches, other.sketches):
+            sketch.merge(other_sketch)
+
+        self._update_sample(other.df, other._sample_keys)
+
+    def get_statistics(self):
+        """
+        Calculates the descriptive statistics of the numeric columns, like describe().
+
+        Returns:
+            pd.DataFrame: Count, mean, std, min, estimated quartiles and max of each numeric column.
+        """
+        with np.errstate(invalid='ignore', divide='ignore'):
+            std = np.sqrt(self._m2 / (self._count - 1))
+
+        quartiles = np.array([sketch.quantile([0.25, 0.5, 0.75]) for sketch in self.sketches]).reshape(-1, 3)
+
+        return pd.DataFrame({
+            'count': self._count,
+            'mean': np.where(self._count > 0, self._mean, np.nan),
+            'std': std,
+            'min': np.where(self._count > 0, self._min, np.nan),
+            '25%': quartiles[:, 0],
+            '50%': quartiles[:, 1],
+            '75%': quartiles[:, 2],
+            'max': np.where(self._count > 0, self._max, np.nan)
+        }, index=self.numeric_columns)
+
+    def get_descriptive_statistics(self):
+        """Prints the shape and selected descriptive statistics (mean, min, max, std and median) of the stream."""
+
+        print("\n" + "-"*40)
+        print(f"Shape of the DataFrame: {(self.n_rows, len(self.dtypes))}")
+        print("-"*40)
+
+        # Display a heading
+        print("\n" + "="*40)
+        print(" Descriptive Statistics ".center(40, "="))
+        print("="*40 + "\n")
+
+        # The median is estimated with the quantile sketch
+        stats = self.get_statistics()[['mean', 'std', 'min', '50%', 'max']]
+        print(stats)
+
+    def get_missing_values(self):
+        """Prints any missing values of the stream."""
+        # Display a heading
+        print("\n" + "="*40)
+        print(" Missing Values ".center(40, "="))
+        print("="*40 + "\n")
+
+        missing = self.null_counts[self.null_counts > 0]
+
+        if not missing.empty:
+            print(missing.sort_values(ascending=False))
+        else:
+            print("No missing values found!")
+
+        # Print a separator
+        print("\n" + "-"*40)
+
+    def get_data_types(self):
+        """Prints the data types of each column of the first chunk."""
+        # Display a heading
+        print("\n" + "="*40)
+        print(" Data Types ".center(40, "="))
+        print("="*40 + "\n")
+
+        print(self.dtypes)
+
+        # Print a separator
+        print("\n" + "-"*40)
+
+    def get_correlation_matrix(self):
+        """Prints the size of the reservoir sample, and visualizes its Spearman correlation matrix."""
+        print(f"\nSpearman correlation is calculated on a sample of {len(self.df)} of {self.n_rows} rows.")
+        super().get_correlation_matrix()
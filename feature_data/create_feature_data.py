@@ -4,6 +4,24 @@ import pandas as pd
 import numpy as np
 import json
 import os
+import hashlib
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+
+# Compact dtypes used by the streaming ingest of sales_train.csv.
+# shop_id (< 60) and item_id (< 22170) fit into int16, and float32 is precise enough for price and count.
+SALES_TRAIN_DTYPES = {'date': 'str',
+                      'date_block_num': 'int16',
+                      'shop_id': 'int16',
+                      'item_id': 'int16',
+                      'item_price': 'float32',
+                      'item_cnt_day': 'float32'}
+
+# Monthly columns for which lag features are created
+LAG_FEATURE_COLUMNS = ['sales_sum', 'sales_item_price_mean', 'item_category_id_37_ratio']
+
+# Raw files read by getting_data, which are fingerprinted for the raw data cache
+RAW_DATA_FILES = ['sales_train.csv', 'items.csv']
 
 class CreateFeatureData:
     """
@@ -47,20 +65,254 @@ class CreateFeatureData:
         
         test_csv and sample_submission.csv are ignored in the analysis
         because their outputs will not be used for the Kaggle competition.
+
+        If "ingest_chunk_size" is set in the config, sales_train.csv is streamed in chunks
+        with compact dtypes instead of being read at once (see getting_data_in_chunks).
+
+        If "raw_data_cache" is enabled in the config, the result is kept in a columnar on-disk cache
+        keyed by the fingerprint of the raw files, so later runs skip parsing the CSV files
+        until one of them changes.
+
+        If "raw_data_format" is "columnar" in the config, the typed columnar files of
+        GettingDataFromKaggle.extract_zip_files_to_columnar are read instead of the CSV files
+        (see getting_data_from_columnar).
+        """
+        if self.config.get("raw_data_format", "csv") == "columnar":
+            return self.getting_data_from_columnar()
+
+        use_cache = self.config.get("raw_data_cache", False)
+        if use_cache:
+            fingerprint = self._fingerprint_raw_data()
+            sales_df = self._load_cached_data(fingerprint)
+            if sales_df is not None:
+                return sales_df
+
+        chunk_size = self.config.get("ingest_chunk_size")
+        if chunk_size:
+            sales_df = self.getting_data_in_chunks(chunk_size)
+        else:
+            sales_train_df = pd.read_csv(self.raw_data_path + '/sales_train.csv')
+            items_df = pd.read_csv(self.raw_data_path + '/items.csv')
+
+            # Merge sales and item data on item_id
+            sales_df = sales_train_df.merge(items_df, how='left', on='item_id')
+            sales_df.drop(labels="item_name", axis=1, inplace=True)
+
+            # item_category_id only contains 37 & 40 values, so creating a binary value is suitable
+            sales_df["item_category_id_37"] = np.where(sales_df["item_category_id"] == 37, 1, 0)
+            sales_df.drop(labels=['item_category_id'], axis=1, inplace=True)
+
+        if use_cache:
+            self._save_cached_data(sales_df, fingerprint)
+
+        return sales_df
+
+    def getting_data_in_chunks(self, chunk_size):
+        """
+        Streaming version of getting_data, which keeps the peak memory low on the full sales history.
+
+        sales_train.csv is read chunk by chunk with pinned compact dtypes, and the item_category_id_37
+        flag is joined through an item_id -> flag lookup array instead of merging items_df onto every row.
+
+        Args:
+            chunk_size (int): Number of rows read from sales_train.csv at a time.
+
+        Returns:
+            pd.DataFrame: DataFrame with the same columns and values as getting_data, in compact dtypes.
+        """
+        items_df = pd.read_csv(self.raw_data_path + '/items.csv',
+                               usecols=['item_id', 'item_category_id'],
+                               dtype={'item_id': 'int32', 'item_category_id': 'int16'})
+
+        category_flag_lookup = self._create_category_flag_lookup(items_df)
+
+        chunks = []
+        for chunk in pd.read_csv(self.raw_data_path + '/sales_train.csv',
+                                 usecols=list(SALES_TRAIN_DTYPES),
+                                 dtype=SALES_TRAIN_DTYPES,
+                                 chunksize=chunk_size):
+            chunk['item_category_id_37'] = self._lookup_category_flag(chunk['item_id'].to_numpy(),
+                                                                      category_flag_lookup)
+            chunks.append(chunk)
+
+        sales_df = pd.concat(chunks, ignore_index=True)
+
+        return sales_df
+
+    def _create_category_flag_lookup(self, items_df):
+        """
+        Creates the item_id -> item_category_id_37 lookup array of the items.
+
+        Args:
+            items_df (pd.DataFrame): Items with item_id and item_category_id columns.
+
+        Returns:
+            np.ndarray: Lookup array indexed by item_id.
+        """
+        category_flag_lookup = np.zeros(int(items_df['item_id'].max()) + 1, dtype='int8')
+        category_flag_lookup[items_df['item_id'].to_numpy()] = items_df['item_category_id'].to_numpy() == 37
+
+        return category_flag_lookup
+
+    def _lookup_category_flag(self, item_ids, category_flag_lookup):
         """
-        sales_train_df = pd.read_csv(self.raw_data_path + '/sales_train.csv')
-        items_df = pd.read_csv(self.raw_data_path + '/items.csv')
+        Looks up the item_category_id_37 flag of the items.
+        Items which are not in items.csv get 0 like the left merge of getting_data does.
 
-        # Merge sales and item data on item_id
-        sales_df = sales_train_df.merge(items_df, how='left', on='item_id')
-        sales_df.drop(labels="item_name", axis=1, inplace=True)
+        Args:
+            item_ids (np.ndarray): item_id of each row.
+            category_flag_lookup (np.ndarray): Lookup array of _create_category_flag_lookup.
+
+        Returns:
+            np.ndarray: item_category_id_37 flag of each row.
+        """
+        known_item = (item_ids >= 0) & (item_ids < len(category_flag_lookup))
+        return np.where(known_item, category_flag_lookup[np.where(known_item, item_ids, 0)], 0).astype('int8')
+
+    def getting_data_from_columnar(self):
+        """
+        Loads the sales and item data from the columnar files of GettingDataFromKaggle.extract_zip_files_to_columnar,
+        which are already parsed with the compact dtypes of getting_data_in_chunks, so no CSV file is parsed.
+
+        Returns:
+            pd.DataFrame: DataFrame with the same columns and values as getting_data_in_chunks.
+
+        Raises:
+            FileNotFoundError: If the columnar files are not extracted.
+            ValueError: If a file is extracted from more than one zip file or folder.
+        """
+        manifest_path = self.raw_data_path + '/columnar/manifest.json'
+        if not os.path.exists(manifest_path):
+            raise FileNotFoundError("Columnar raw files are not found, run extract_zip_files_to_columnar first.")
+
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+        raw_dfs = []
+        for member_name in ['sales_train.csv', 'items.csv']:
+            # The files are kept by zip name and member path, so the member is found by its name in the manifest
+            output_paths = [member_info['output'] for member_key, member_info in manifest.items()
+                            if os.path.basename(member_key) == member_name]
+            if len(output_paths) > 1:
+                raise ValueError(f"{member_name} is extracted from more than one zip file or folder: {output_paths}")
+
+            raw_df = self._read_columnar_file(os.path.splitext(output_paths[0])[0]) if output_paths else None
+            if raw_df is None:
+                raise FileNotFoundError("Columnar raw files are not found, run extract_zip_files_to_columnar first.")
+            raw_dfs.append(raw_df)
+
+        sales_train_df, items_df = raw_dfs
 
-        # item_category_id only contains 37 & 40 values, so creating a binary value is suitable
-        sales_df["item_category_id_37"] = np.where(sales_df["item_category_id"] == 37, 1, 0)
-        sales_df.drop(labels=['item_category_id'], axis=1, inplace=True)
+        sales_df = sales_train_df[list(SALES_TRAIN_DTYPES)].astype(SALES_TRAIN_DTYPES)
+        sales_df['item_category_id_37'] = self._lookup_category_flag(
+            sales_df['item_id'].to_numpy(), self._create_category_flag_lookup(items_df))
 
         return sales_df
 
+    def _fingerprint_raw_data(self):
+        """
+        Creates a fingerprint of the raw files used by getting_data from their size, mtime and content hash.
+
+        Content hashes are remembered in a manifest in the cache folder, so a file is only hashed again
+        when its size or mtime changes.
+
+        Returns:
+            str: Hex digest which changes whenever the content of any raw file or the ingest mode changes.
+        """
+        cache_path = self.raw_data_path + '/cache'
+        manifest_path = cache_path + '/manifest.json'
+
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+
+        file_fingerprints = {}
+        for file_name in RAW_DATA_FILES:
+            file_stat = os.stat(self.raw_data_path + '/' + file_name)
+            previous = manifest.get(file_name, {})
+
+            if previous.get('size') == file_stat.st_size and previous.get('mtime') == file_stat.st_mtime_ns:
+                content_hash = previous['hash']
+            else:
+                file_hash = hashlib.blake2b(digest_size=16)
+                with open(self.raw_data_path + '/' + file_name, 'rb') as f:
+                    for block in iter(lambda: f.read(1 << 20), b''):
+                        file_hash.update(block)
+                content_hash = file_hash.hexdigest()
+
+            file_fingerprints[file_name] = {'size': file_stat.st_size,
+                                            'mtime': file_stat.st_mtime_ns,
+                                            'hash': content_hash}
+
+        os.makedirs(cache_path, exist_ok=True)
+        with open(manifest_path, 'w') as f:
+            json.dump(file_fingerprints, f, indent=2)
+
+        # The key is content addressed, mtime is only used to skip hashing unchanged files.
+        # The ingest mode changes the dtypes of the frame, so it is a part of the key as well
+        key = {'files': {file_name: [file_fingerprint['size'], file_fingerprint['hash']]
+                         for file_name, file_fingerprint in file_fingerprints.items()},
+               'ingest_chunked': bool(self.config.get("ingest_chunk_size"))}
+        return hashlib.blake2b(json.dumps(key, sort_keys=True).encode(), digest_size=16).hexdigest()
+
+    def _load_cached_data(self, fingerprint):
+        """
+        Loads the frame of getting_data from the cache if an entry exists for the given fingerprint.
+
+        Args:
+            fingerprint (str): Fingerprint of the raw files.
+
+        Returns:
+            pd.DataFrame or None: Cached DataFrame, or None if there is no matching cache entry.
+        """
+        return self._read_columnar_file(self.raw_data_path + '/cache/sales_df_' + fingerprint)
+
+    def _read_columnar_file(self, file_path):
+        """
+        Reads a DataFrame saved as a Parquet file, or as a NumPy .npz file when pyarrow is not installed.
+
+        Args:
+            file_path (str): Path of the file, without the extension.
+
+        Returns:
+            pd.DataFrame or None: The DataFrame, or None if neither file exists.
+        """
+        if os.path.exists(file_path + '.parquet'):
+            return pd.read_parquet(file_path + '.parquet')
+
+        if os.path.exists(file_path + '.npz'):
+            with np.load(file_path + '.npz', allow_pickle=False) as arrays:
+                # Strings are stored as fixed width unicode arrays, convert them back to objects
+                return pd.DataFrame({column: arrays[column].astype(object) if arrays[column].dtype.kind == 'U'
+                                     else arrays[column] for column in arrays.files})
+
+        return None
+
+    def _save_cached_data(self, df, fingerprint):
+        """
+        Saves the frame of getting_data to the cache as Parquet, or as a NumPy .npz file when pyarrow
+        is not installed, and removes the entries of older fingerprints.
+
+        Args:
+            df (pd.DataFrame): The output of getting_data.
+            fingerprint (str): Fingerprint of the raw files.
+        """
+        cache_path = self.raw_data_path + '/cache'
+        os.makedirs(cache_path, exist_ok=True)
+
+        # Remove stale entries, since they can not be matched by any later fingerprint
+        for file_name in os.listdir(cache_path):
+            if file_name.startswith('sales_df_'):
+                os.remove(cache_path + '/' + file_name)
+
+        cache_file = cache_path + '/sales_df_' + fingerprint
+        if importlib.util.find_spec('pyarrow') is not None:
+            df.to_parquet(cache_file + '.parquet', index=False)
+        else:
+            np.savez(cache_file + '.npz', **{column: df[column].to_numpy(dtype=str) if df[column].dtype == object
+                                            else df[column].to_numpy() for column in df.columns})
+
     def creating_monthly_data(self, df):
         """
         Groups the data by month and aggregates relevant features.
@@ -70,7 +322,12 @@ class CreateFeatureData:
 
         Returns:
             pd.DataFrame: Aggregated DataFrame with monthly data.
+
+        If "monthly_aggregation_engine" is set to "numpy" in the config,
+        the aggregation is done by creating_monthly_data_fast.
         """
+        if self.config.get("monthly_aggregation_engine", "pandas") == "numpy":
+            return self.creating_monthly_data_fast(df)
 
         df['date'] = pd.to_datetime(df['date'], format='%d.%m.%Y')
         df['month']= df['date'].dt.month
@@ -88,19 +345,77 @@ class CreateFeatureData:
 
         return monthly_sales
 
-    def fill_empty_months_where_sale_not_exist(self, df):
+    def creating_monthly_data_fast(self, df):
+        """
+        Vectorized version of creating_monthly_data, which gives the same output without parsing the dates.
+
+        date_block_num 0 is January 2013, so the calendar month is computed arithmetically from date_block_num.
+        All aggregates are computed with a single np.bincount pass per column over a dense
+        (date_block_num, shop_id) index instead of a multi-key groupby.
+
+        Args:
+            df (pd.DataFrame): The input DataFrame, which is daily sales data
+
+        Returns:
+            pd.DataFrame: Aggregated DataFrame with monthly data.
+        """
+
+        date_block_num = df['date_block_num'].to_numpy()
+        shop_id = df['shop_id'].to_numpy()
+
+        # Dense index of each (date_block_num, shop_id) cell
+        n_shops = int(shop_id.max()) + 1
+        n_cells = (int(date_block_num.max()) + 1) * n_shops
+        cell_index = date_block_num.astype(np.int64) * n_shops + shop_id
+
+        row_count = np.bincount(cell_index, minlength=n_cells)
+        item_price_sum = np.bincount(cell_index, weights=df['item_price'].to_numpy(dtype=np.float64),
+                                     minlength=n_cells)
+        item_cnt_sum = np.bincount(cell_index, weights=df['item_cnt_day'].to_numpy(dtype=np.float64),
+                                   minlength=n_cells)
+        item_category_id_37_sum = np.bincount(cell_index,
+                                              weights=df['item_category_id_37'].to_numpy(dtype=np.float64),
+                                              minlength=n_cells)
+
+        # Keep only the cells where a sale exists, their order is the same as the groupby order
+        observed = np.flatnonzero(row_count)
+        observed_block = observed // n_shops
+
+        # Keep the result dtypes of pandas: integer sums stay int64 and float columns keep their precision
+        def sum_dtype(column):
+            return np.int64 if df[column].dtype.kind in 'iub' else df[column].dtype
+
+        def mean_dtype(column):
+            return df[column].dtype if df[column].dtype.kind == 'f' else np.float64
+
+        monthly_sales = pd.DataFrame({
+            'date_block_num': observed_block.astype(df['date_block_num'].dtype),
+            'month': (observed_block % 12 + 1).astype(np.int32),
+            'shop_id': (observed % n_shops).astype(df['shop_id'].dtype),
+            'sales_item_price_mean': (item_price_sum[observed] / row_count[observed]).astype(mean_dtype('item_price')),
+            'sales_sum': item_cnt_sum[observed].astype(sum_dtype('item_cnt_day')),
+            'item_category_id_37_ratio': (item_category_id_37_sum[observed] /
+                                          row_count[observed]).astype(mean_dtype('item_category_id_37'))
+        })
+
+        return monthly_sales
+
+    def fill_empty_months_where_sale_not_exist(self, df, date_values=None):
         """
         Fills missing sales data by generating rows for months when no sales occurred.
 
         Args:
             df (pd.DataFrame): The input monthly sales dataFrame of shops with missing sales data
+            date_values (pd.DataFrame, optional): The date_block_num and month values to create rows for.
+                By default, they are the values in df.
 
         Returns:
             pd.DataFrame: DataFrame with missing sales data filled with zeros.
         """
 
         # Extract unique date and shop values
-        date_values = df[['date_block_num', 'month']].drop_duplicates()
+        if date_values is None:
+            date_values = df[['date_block_num', 'month']].drop_duplicates()
         shop_values = df[['shop_id']].drop_duplicates()
 
         # Create a cross join (Cartesian product) between date_values and shop_values
@@ -121,13 +436,16 @@ class CreateFeatureData:
 
         Returns:
             pd.DataFrame: DataFrame with lag features added.
+
+        If "lag_feature_engine" is set to "tensor" in the config, the lag features are created
+        by create_lag_features_dense, which also fills the empty months.
         """
+        if self.config.get("lag_feature_engine", "pandas") == "tensor":
+            return self.create_lag_features_dense(df)
 
         df = df.sort_values(by=['shop_id', 'date_block_num']).reset_index(drop=True)
-        to_be_created_lag_features = ['sales_sum', 'sales_item_price_mean',
-                                      'item_category_id_37_ratio']
 
-        for col_name in to_be_created_lag_features:
+        for col_name in LAG_FEATURE_COLUMNS:
             for lag_value in self.config["lag_features_list"]:
 
                 # Create lag features for price
@@ -140,6 +458,388 @@ class CreateFeatureData:
 
         return df
 
+    def _create_monthly_tensor(self, df):
+        """
+        Converts the monthly sales data into a dense NumPy array shaped [shop_id, date_block_num, feature].
+
+        Months where a shop has no sale become zero filled cells, like in fill_empty_months_where_sale_not_exist.
+        The month is expected to be a function of date_block_num, which holds for the output of creating_monthly_data.
+
+        Args:
+            df (pd.DataFrame): The input monthly sales dataFrame
+
+        Returns:
+            dict: Sorted date_block_num, month and shop_id values of the axes, the feature column names
+            and the dense array of the feature values.
+        """
+
+        date_block_nums, block_index = np.unique(df['date_block_num'].to_numpy(), return_inverse=True)
+        shop_ids, shop_index = np.unique(df['shop_id'].to_numpy(), return_inverse=True)
+
+        months = np.zeros(len(date_block_nums), dtype=df['month'].dtype)
+        months[block_index] = df['month'].to_numpy()
+
+        feature_columns = [col_name for col_name in df.columns if col_name not in ['date_block_num', 'month', 'shop_id']]
+        tensor = np.zeros((len(shop_ids), len(date_block_nums), len(feature_columns)), dtype=np.float64)
+        tensor[shop_index, block_index] = df[feature_columns].to_numpy(dtype=np.float64)
+
+        return {'date_block_num': date_block_nums.astype(df['date_block_num'].dtype),
+                'month': months,
+                'shop_id': shop_ids.astype(df['shop_id'].dtype),
+                'feature_columns': feature_columns,
+                'tensor': tensor}
+
+    def create_lag_features_dense(self, df):
+        """
+        Fills the empty months and creates the lag features on a dense [shop_id, date_block_num, feature] array.
+
+        It gives the same DataFrame as running fill_empty_months_where_sale_not_exist and create_lag_features,
+        but without the cross join, merges and groupby shifts: each lag is a slice of the array along the
+        date_block_num axis.
+
+        Args:
+            df (pd.DataFrame): The input monthly sales dataFrame, with or without the empty months
+
+        Returns:
+            pd.DataFrame: DataFrame with lag features added.
+        """
+
+        monthly_tensor = self._create_monthly_tensor(df)
+        tensor = monthly_tensor['tensor']
+        feature_columns = monthly_tensor['feature_columns']
+        n_shops, n_blocks, _ = tensor.shape
+
+        # Since we have created lag features, we need to exclude the initial months.
+        drop_threshold = max(self.config["lag_features_list"])
+        kept_blocks = np.flatnonzero(monthly_tensor['date_block_num'] >= drop_threshold)
+        n_kept_blocks = len(kept_blocks)
+
+        # Rows are ordered by shop_id and date_block_num like in create_lag_features
+        columns = {'date_block_num': np.tile(monthly_tensor['date_block_num'][kept_blocks], n_shops),
+                   'month': np.tile(monthly_tensor['month'][kept_blocks], n_shops),
+                   'shop_id': np.repeat(monthly_tensor['shop_id'], n_kept_blocks)}
+
+        # The array is float64, so the columns are cast back to the dtypes the pandas path keeps:
+        # the source dtype, or float64 for integer columns which get NaN (lags) or 0.0 (filled months)
+        has_empty_months = len(df) < n_shops * n_blocks
+        for feature_index, col_name in enumerate(feature_columns):
+            source_dtype = df[col_name].dtype
+            if has_empty_months and source_dtype.kind != 'f':
+                source_dtype = np.float64
+            columns[col_name] = tensor[:, kept_blocks, feature_index].ravel().astype(source_dtype, copy=False)
+
+        for col_name in LAG_FEATURE_COLUMNS:
+            feature_index = feature_columns.index(col_name)
+            lag_dtype = df[col_name].dtype if df[col_name].dtype.kind == 'f' else np.float64
+            for lag_value in self.config["lag_features_list"]:
+
+                # The lag is the same array shifted by lag_value months, the first months have no history
+                lagged = np.full((n_shops, n_blocks), np.nan)
+                if lag_value < n_blocks:
+                    lagged[:, lag_value:] = tensor[:, :n_blocks - lag_value, feature_index]
+                columns[f'{col_name}_lag_{lag_value}'] = lagged[:, kept_blocks].ravel().astype(lag_dtype, copy=False)
+
+        return pd.DataFrame(columns)
+
+    def create_incremental_state(self, df):
+        """
+        Creates the state of the incremental mode from the full monthly history and saves it to the feature data path.
+
+        The state only keeps the per-shop monthly aggregates of the trailing max(lag_features_list) months,
+        which is all that append_month needs to create the lag features of the next month.
+
+        Args:
+            df (pd.DataFrame): The input monthly sales dataFrame of the full history
+
+        Returns:
+            dict: The saved incremental state.
+        """
+
+        monthly_tensor = self._create_monthly_tensor(df)
+        window_size = max(self.config["lag_features_list"])
+
+        state = {'date_block_num': monthly_tensor['date_block_num'][-window_size:],
+                 'month': monthly_tensor['month'][-window_size:],
+                 'shop_id': monthly_tensor['shop_id'],
+                 'feature_columns': np.array(monthly_tensor['feature_columns']),
+                 'tensor': monthly_tensor['tensor'][:, -window_size:]}
+
+        np.savez(self.feature_data_path + '/incremental_state.npz', **state)
+
+        return state
+
+    def append_month(self, df):
+        """
+        Creates the lag feature rows of a new month by using the saved incremental state instead of the full history.
+
+        Only the monthly aggregates of the new month are computed, then the rows are created the same way as
+        fill_empty_months_where_sale_not_exist and create_lag_features would create them for that month on the
+        full history. The state is updated with the new month, so months can be appended one after another.
+        Unlike a rerun on the full history, already appended months do not get zero rows for shops which open later.
+
+        Args:
+            df (pd.DataFrame): The input daily sales data of a single new month
+
+        Returns:
+            pd.DataFrame: DataFrame of the new month with lag features added.
+
+        Raises:
+            FileNotFoundError: If the incremental state has not been created yet.
+            ValueError: If the data does not belong to exactly one month after the months in the state.
+        """
+
+        state_path = self.feature_data_path + '/incremental_state.npz'
+        if not os.path.exists(state_path):
+            raise FileNotFoundError("Incremental state is not found. Please run create_incremental_state first.")
+
+        with np.load(state_path, allow_pickle=False) as arrays:
+            state = {key: arrays[key] for key in arrays.files}
+
+        monthly_sales = self.creating_monthly_data(df)
+        new_date_block_num = monthly_sales['date_block_num'].unique()
+        # The lags are read by position in the window, so a skipped month would shift every lag
+        if len(new_date_block_num) != 1 or new_date_block_num[0] != state['date_block_num'][-1] + 1:
+            raise ValueError("The data to append must contain exactly one month after the last month of the state.")
+
+        feature_columns = state['feature_columns'].tolist()
+        window_size = max(self.config["lag_features_list"])
+
+        # Shops seen for the first time get a zero history, like the cross join gives them
+        shop_ids = np.union1d(state['shop_id'], monthly_sales['shop_id'].to_numpy())
+        history = np.zeros((len(shop_ids), state['tensor'].shape[1], len(feature_columns)))
+        history[np.searchsorted(shop_ids, state['shop_id'])] = state['tensor']
+
+        # Shops without any sale in the new month get zero filled values
+        new_month = np.zeros((len(shop_ids), len(feature_columns)))
+        new_month[np.searchsorted(shop_ids, monthly_sales['shop_id'].to_numpy())] = \
+            monthly_sales[feature_columns].to_numpy(dtype=np.float64)
+        window = np.concatenate([history, new_month[:, np.newaxis]], axis=1)
+
+        columns = {'date_block_num': np.full(len(shop_ids), new_date_block_num[0]),
+                   'month': np.full(len(shop_ids), monthly_sales['month'].iloc[0]),
+                   'shop_id': shop_ids.astype(monthly_sales['shop_id'].dtype)}
+
+        for feature_index, col_name in enumerate(feature_columns):
+            columns[col_name] = new_month[:, feature_index]
+
+        for col_name in LAG_FEATURE_COLUMNS:
+            feature_index = feature_columns.index(col_name)
+            for lag_value in self.config["lag_features_list"]:
+                if lag_value < window.shape[1]:
+                    columns[f'{col_name}_lag_{lag_value}'] = window[:, -1 - lag_value, feature_index]
+                else:
+                    columns[f'{col_name}_lag_{lag_value}'] = np.full(len(shop_ids), np.nan)
+
+        lag_df = pd.DataFrame(columns)
+        lag_df = lag_df[lag_df['date_block_num'] >= window_size].reset_index(drop=True)
+
+        # Update the state with the new month
+        state.update({'date_block_num': np.append(state['date_block_num'], new_date_block_num)[-window_size:],
+                      'month': np.append(state['month'], monthly_sales['month'].iloc[0])[-window_size:],
+                      'shop_id': shop_ids,
+                      'tensor': window[:, -window_size:]})
+        np.savez(state_path, **state)
+
+        return lag_df
+
+    def create_next_month_features(self, df):
+        """
+        Creates the feature row of the month after the last month for each shop, which is the input of a forecast.
+
+        The lag features are the same as create_lag_features would create for the next month, where the shop has
+        no sales yet, and the cyclic features are created for the month of the next month.
+        Missing lags are filled with 0 like in process_features.
+
+        Args:
+            df (pd.DataFrame): The input monthly sales dataFrame, with or without the empty months
+
+        Returns:
+            pd.DataFrame: DataFrame with one row for each shop, with date_block_num, shop_id and the features.
+        """
+
+        monthly_tensor = self._create_monthly_tensor(df)
+        tensor = monthly_tensor['tensor']
+        feature_columns = monthly_tensor['feature_columns']
+        n_shops, n_blocks, _ = tensor.shape
+
+        columns = {'date_block_num': np.full(n_shops, monthly_tensor['date_block_num'][-1] + 1),
+                   'month': np.full(n_shops, monthly_tensor['month'][-1] % 12 + 1),
+                   'shop_id': monthly_tensor['shop_id']}
+
+        for col_name in LAG_FEATURE_COLUMNS:
+            feature_index = feature_columns.index(col_name)
+            for lag_value in self.config["lag_features_list"]:
+
+                # Lag 1 of the next month is the last month of the history
+                if lag_value <= n_blocks:
+                    columns[f'{col_name}_lag_{lag_value}'] = tensor[:, n_blocks - lag_value, feature_index]
+                else:
+                    columns[f'{col_name}_lag_{lag_value}'] = np.zeros(n_shops)
+
+        next_month_df = self.create_cyclic_features(pd.DataFrame(columns))
+
+        return next_month_df.drop(columns=['month', 'month_rad'])
+
+    def creating_item_level_monthly_data(self, df):
+        """
+        Groups the daily data by month, shop and item, and keeps only the observed (month, shop, item) cells.
+
+        A dense shop x item x month grid does not fit in memory, so the cells without any sale are not stored,
+        they are the implicit zeros of create_item_level_lag_features.
+
+        Args:
+            df (pd.DataFrame): The input DataFrame, which is daily sales data
+
+        Returns:
+            pd.DataFrame: Monthly item level sales data, sorted by date_block_num, shop_id and item_id.
+        """
+
+        date_block_num = df['date_block_num'].to_numpy(dtype=np.int64)
+        shop_id = df['shop_id'].to_numpy(dtype=np.int64)
+        item_id = df['item_id'].to_numpy(dtype=np.int64)
+
+        # Single integer key of each (date_block_num, shop_id, item_id) cell
+        n_shops = int(shop_id.max()) + 1
+        n_items = int(item_id.max()) + 1
+        cell_key = (date_block_num * n_shops + shop_id) * n_items + item_id
+
+        cells, cell_index = np.unique(cell_key, return_inverse=True)
+        row_count = np.bincount(cell_index)
+        item_price_sum = np.bincount(cell_index, weights=df['item_price'].to_numpy(dtype=np.float64))
+        item_cnt_sum = np.bincount(cell_index, weights=df['item_cnt_day'].to_numpy(dtype=np.float64))
+
+        cell_block = cells // (n_shops * n_items)
+
+        item_monthly_sales = pd.DataFrame({
+            'date_block_num': cell_block.astype(df['date_block_num'].dtype),
+            'month': (cell_block % 12 + 1).astype(np.int32),
+            'shop_id': (cells // n_items % n_shops).astype(df['shop_id'].dtype),
+            'item_id': (cells % n_items).astype(df['item_id'].dtype),
+            'item_price_mean': (item_price_sum / row_count).astype(np.float32),
+            'item_cnt_month': item_cnt_sum.astype(np.float32)
+        })
+
+        return item_monthly_sales
+
+    def create_item_level_lag_features(self, df, include_implicit_zeros=True):
+        """
+        Creates the item level lag features on the sparse monthly data of creating_item_level_monthly_data.
+
+        The observed cells are sorted by a (shop_id, item_id, date_block_num) key, and every lag is looked up
+        with np.searchsorted on that sorted key; a cell which is not found is an implicit zero.
+        The rows are produced in chunks of "item_level_chunk_size" cells to keep the temporary arrays bounded.
+
+        Args:
+            df (pd.DataFrame): The input sparse monthly item level sales data
+            include_implicit_zeros (bool): If True, rows are also created for the unobserved cells whose lag
+                features are not all zero, so the training data contains the months without any sale.
+                Cells where the target and all lags are zero are never created.
+
+        Returns:
+            pd.DataFrame: Item level DataFrame with lag features added, sorted by shop_id, item_id and date_block_num.
+        """
+
+        lag_features_list = self.config["lag_features_list"]
+        drop_threshold = max(lag_features_list)
+        chunk_size = self.config.get("item_level_chunk_size", 1000000)
+        value_columns = ['item_cnt_month', 'item_price_mean']
+
+        date_block_num = df['date_block_num'].to_numpy(dtype=np.int64)
+        max_date_block_num = int(date_block_num.max())
+
+        # The stride leaves room for shifting a key by any lag without reaching the next (shop_id, item_id) pair
+        stride = max_date_block_num + 1 + drop_threshold
+        n_items = int(df['item_id'].max()) + 1
+        pair_key = df['shop_id'].to_numpy(dtype=np.int64) * n_items + df['item_id'].to_numpy(dtype=np.int64)
+        cell_key = pair_key * stride + date_block_num
+
+        order = np.argsort(cell_key, kind='stable')
+        sorted_key = cell_key[order]
+        sorted_values = {col_name: df[col_name].to_numpy()[order] for col_name in value_columns}
+
+        # Cells of the rows are the observed cells, and optionally the cells which are reached by a lag
+        if include_implicit_zeros:
+            row_key = np.unique(np.concatenate([sorted_key] + [sorted_key + lag_value
+                                                               for lag_value in lag_features_list]))
+        else:
+            row_key = sorted_key
+
+        # Since we have created lag features, we need to exclude the initial months and the months after the data
+        row_block = row_key % stride
+        row_key = row_key[(row_block >= drop_threshold) & (row_block <= max_date_block_num)]
+
+        row_pair = row_key // stride
+        row_block = row_key % stride
+        columns = {'date_block_num': row_block.astype(df['date_block_num'].dtype),
+                   'month': (row_block % 12 + 1).astype(np.int32),
+                   'shop_id': (row_pair // n_items).astype(df['shop_id'].dtype),
+                   'item_id': (row_pair % n_items).astype(df['item_id'].dtype)}
+
+        lookups = [(0, col_name, col_name) for col_name in value_columns]
+        lookups += [(lag_value, col_name, f'{col_name}_lag_{lag_value}')
+                    for col_name in value_columns for lag_value in lag_features_list]
+        for _, _, output_name in lookups:
+            columns[output_name] = np.zeros(len(row_key), dtype=np.float32)
+
+        for start in range(0, len(row_key), chunk_size):
+            chunk_key = row_key[start:start + chunk_size]
+
+            for lag_value, col_name, output_name in lookups:
+                lookup_key = chunk_key - lag_value
+                position = np.minimum(np.searchsorted(sorted_key, lookup_key), len(sorted_key) - 1)
+                found = sorted_key[position] == lookup_key
+                columns[output_name][start:start + chunk_size] = np.where(found, sorted_values[col_name][position], 0)
+
+        return pd.DataFrame(columns)
+
+    def _create_shop_shard_features(self, df, date_values):
+        """
+        Runs the gap filling, lag and cyclic feature steps on the monthly data of a shard of shops.
+
+        Args:
+            df (pd.DataFrame): The input monthly sales dataFrame of the shops in the shard
+            date_values (pd.DataFrame): The date_block_num and month values of all shops
+
+        Returns:
+            pd.DataFrame: DataFrame of the shard with lag and cyclic features added.
+        """
+
+        df = self.fill_empty_months_where_sale_not_exist(df, date_values=date_values)
+        df = self.create_lag_features(df)
+        df = self.create_cyclic_features(df)
+
+        return df
+
+    def create_shop_features_in_parallel(self, df, n_jobs=None):
+        """
+        Runs fill_empty_months_where_sale_not_exist, create_lag_features and create_cyclic_features
+        on shards of shops in a process pool, since these steps are independent for each shop_id.
+
+        The shards are consecutive shop_id ranges and their outputs are sorted by shop_id and date_block_num,
+        so the concatenated result is the same as running the steps on the whole data.
+
+        Args:
+            df (pd.DataFrame): The input monthly sales dataFrame
+            n_jobs (int, optional): Number of processes. By default, "feature_n_jobs" in the config,
+                or the number of CPUs if it is not set.
+
+        Returns:
+            pd.DataFrame: DataFrame with lag and cyclic features added.
+        """
+
+        n_jobs = n_jobs or self.config.get("feature_n_jobs") or os.cpu_count()
+
+        # All shops get rows for the same months, so the months are extracted before sharding
+        date_values = df[['date_block_num', 'month']].drop_duplicates()
+
+        shop_shards = np.array_split(np.sort(df['shop_id'].unique()), n_jobs)
+        shards = [df[df['shop_id'].isin(shop_shard)] for shop_shard in shop_shards if len(shop_shard) > 0]
+
+        with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+            shard_dfs = list(executor.map(self._create_shop_shard_features, shards, [date_values] * len(shards)))
+
+        return pd.concat(shard_dfs, ignore_index=True)
+
     def create_cyclic_features(self, df):
         """
          Converts the month into a cyclic feature using sine and cosine transformations.
@@ -199,11 +899,52 @@ class CreateFeatureData:
         # Changing item_cnt_month column name as target
         df.rename(columns={'sales_sum': 'target'}, inplace=True)
 
+        # Downcast the features to compact dtypes if a dtype policy is set in the config
+        df = self.apply_dtype_policy(df)
+
+        return df
+
+    def apply_dtype_policy(self, df):
+        """
+        Downcasts the columns to the compact dtypes of "feature_dtype_policy" in the config and reports the saved memory.
+
+        The policy has a "float" dtype for the float columns, and an "integer" dtype for the integer columns.
+        The "integer" dtype can be "smallest", which picks the smallest signed integer dtype that holds the values.
+        The policy is off by default (null in the config), since float32 features change the feature values slightly.
+
+        Args:
+            df (pd.DataFrame): The input DataFrame, which is not modified.
+
+        Returns:
+            pd.DataFrame: DataFrame with compact dtypes, or the input DataFrame if there is no policy in the config.
+        """
+
+        dtype_policy = self.config.get("feature_dtype_policy")
+        if not dtype_policy:
+            return df
+
+        memory_before = df.memory_usage(deep=True).sum()
+
+        dtypes = {col_name: dtype_policy["float"] for col_name in df.select_dtypes(include='float').columns}
+        for col_name in df.select_dtypes(include='integer').columns:
+            if dtype_policy["integer"] == "smallest":
+                dtypes[col_name] = pd.to_numeric(df[col_name], downcast='integer').dtype
+            else:
+                dtypes[col_name] = dtype_policy["integer"]
+
+        # astype returns a new DataFrame, so the frame of the caller keeps its dtypes
+        df = df.astype(dtypes)
+
+        memory_after = df.memory_usage(deep=True).sum()
+        print(f"Memory usage of the features is reduced from {memory_before / 1024 ** 2:.2f} MB "
+              f"to {memory_after / 1024 ** 2:.2f} MB ({1 - memory_after / memory_before:.0%} saved)")
+
         return df
 
     def create_train_and_test_data(self, df):
         """
         Splits the data into training and testing sets and saves them as CSV files.
+        The returned DataFrames keep the dtypes of the input, the CSV files do not.
 
         Args:
             df (pd.DataFrame): The input DataFrame.
@@ -225,3 +966,110 @@ class CreateFeatureData:
         train_df.to_csv(self.feature_data_path + '/train_df.csv', index=False)
 
         return train_df, test_df
+
+    def create_feature_data_with_duckdb(self):
+        """
+        Runs the feature pipeline from getting_data to process_features as a single DuckDB query.
+
+        The raw CSV files are scanned by DuckDB directly, and the merge, monthly aggregation, cross join,
+        lag and cyclic features are one lazy query plan executed on multiple threads, so the intermediate
+        frames of the pandas pipeline are never materialized. DuckDB is an optional dependency,
+        which is only needed for this backend.
+
+        Returns:
+            pd.DataFrame: Processed DataFrame ready for modeling, same as the output of process_features.
+        """
+        import duckdb
+
+        lag_features_list = self.config["lag_features_list"]
+        sales_train_path = (self.raw_data_path + '/sales_train.csv').replace("'", "''")
+        items_path = (self.raw_data_path + '/items.csv').replace("'", "''")
+
+        lag_columns = ',\n'.join(f'coalesce(lag({col_name}, {lag_value}) OVER shop_window, 0) '
+                                  f'AS {col_name}_lag_{lag_value}'
+                                  for col_name in ['sales_sum', 'sales_item_price_mean']
+                                  for lag_value in lag_features_list)
+
+        query = f"""
+            WITH sales AS (
+                SELECT s.date_block_num, s.shop_id, s.item_price, s.item_cnt_day,
+                       month(strptime(s.date, '%d.%m.%Y')) AS month,
+                       CASE WHEN i.item_category_id = 37 THEN 1 ELSE 0 END AS item_category_id_37
+                FROM read_csv('{sales_train_path}', header = true,
+                              columns = {{'date': 'VARCHAR', 'date_block_num': 'BIGINT', 'shop_id': 'BIGINT',
+                                         'item_id': 'BIGINT', 'item_price': 'DOUBLE', 'item_cnt_day': 'DOUBLE'}}) s
+                LEFT JOIN read_csv('{items_path}', header = true) i ON s.item_id = i.item_id
+            ),
+            monthly_sales AS (
+                SELECT date_block_num, month, shop_id,
+                       avg(item_price) AS sales_item_price_mean,
+                       sum(item_cnt_day) AS sales_sum
+                FROM sales
+                GROUP BY date_block_num, month, shop_id
+            ),
+            whole_sales AS (
+                SELECT d.date_block_num, d.month, s.shop_id,
+                       coalesce(m.sales_item_price_mean, 0) AS sales_item_price_mean,
+                       coalesce(m.sales_sum, 0) AS sales_sum
+                FROM (SELECT DISTINCT date_block_num, month FROM monthly_sales) d
+                CROSS JOIN (SELECT DISTINCT shop_id FROM monthly_sales) s
+                LEFT JOIN monthly_sales m
+                    ON m.date_block_num = d.date_block_num AND m.month = d.month AND m.shop_id = s.shop_id
+            ),
+            feature_sales AS (
+                SELECT date_block_num, shop_id, month, sales_sum,
+                       {lag_columns}
+                FROM whole_sales
+                WINDOW shop_window AS (PARTITION BY shop_id ORDER BY date_block_num)
+            )
+            SELECT * EXCLUDE (date_block_num, shop_id, month) RENAME (sales_sum AS target),
+                   sin(2 * pi() * (month - 1) / 12) AS month_sin,
+                   cos(2 * pi() * (month - 1) / 12) AS month_cos
+            FROM feature_sales
+            WHERE date_block_num >= {max(lag_features_list)}
+            ORDER BY shop_id, date_block_num
+        """
+
+        with duckdb.connect() as connection:
+            threads = self.config.get("duckdb_threads")
+            if threads:
+                connection.execute(f"SET threads TO {int(threads)}")
+
+            feature_df = connection.sql(query).df()
+
+        return feature_df
+
+    def create_feature_data(self):
+        """
+        Runs the whole feature pipeline with the backend set in the config, and creates the train and test data.
+
+        "feature_backend" can be "pandas", which runs the methods of this class one after another,
+        or "duckdb", which runs the same pipeline by create_feature_data_with_duckdb.
+        With the pandas backend, the shop level steps run in parallel if "feature_n_jobs" is more than 1,
+        or null, which uses the number of CPUs like create_shop_features_in_parallel.
+
+        Returns:
+            tuple: Two DataFrames, one for training and one for testing.
+        """
+
+        if self.config.get("feature_backend", "pandas") == "duckdb":
+            feature_df = self.create_feature_data_with_duckdb()
+            feature_df = self.apply_dtype_policy(feature_df)
+        else:
+            sales_df = self.getting_data()
+            monthly_sales = self.creating_monthly_data(sales_df)
+
+            # The shop level steps run in a process pool if more than one job is set in the config,
+            # a missing key keeps the serial steps and null uses all CPUs
+            n_jobs = self.config.get("feature_n_jobs", 1) or os.cpu_count()
+            if n_jobs > 1:
+                feature_df = self.create_shop_features_in_parallel(monthly_sales, n_jobs=n_jobs)
+            else:
+                monthly_sales = self.fill_empty_months_where_sale_not_exist(monthly_sales)
+                feature_df = self.create_lag_features(monthly_sales)
+                feature_df = self.create_cyclic_features(feature_df)
+
+            feature_df = self.drop_irrelevant_features(feature_df)
+            feature_df = self.process_features(feature_df)
+
+        return self.create_train_and_test_data(feature_df)
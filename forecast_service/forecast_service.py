@@ -0,0 +1,305 @@
+import argparse
+import json
+import os
+import queue
+import sys
+import threading
+import time
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+from modelling.model_registry import ModelRegistry
+
+
+class ForecastService:
+    """
+    An in-process forecast API, which answers next month forecasts of shops with a model loaded once.
+
+    The next month feature vector of each shop is precomputed into a float32 matrix, indexed by shop_id,
+    so a request only gathers rows of the matrix and runs the model. Concurrent requests are merged by a
+    batching thread into a single model.predict call, which costs about the same as the call of one request.
+
+    Attributes:
+        model: The trained model, which has a predict method.
+        date_block_num (int): The month which is forecasted.
+        shop_ids (np.ndarray): Sorted shop_id values with a precomputed feature vector.
+        feature_matrix (np.ndarray): Feature vector of each shop, in the column order of the model.
+        feature_columns (list): Feature names of the model.
+        max_batch_size (int): Maximum number of shops predicted in one model call.
+        max_wait_ms (float): Maximum time a request waits for other requests to be batched with.
+    """
+
+    def __init__(self, model, next_month_features, feature_columns, max_batch_size=256, max_wait_ms=2):
+        """
+        Initializes the ForecastService class with the next month features of create_next_month_features.
+
+        Args:
+            model: The trained model, which has a predict method.
+            next_month_features (pd.DataFrame): Next month feature rows with date_block_num and shop_id.
+            feature_columns (list): Feature names of the model, in the order of the training data.
+            max_batch_size (int): Maximum number of shops predicted in one model call.
+            max_wait_ms (float): Maximum time a request waits for other requests to be batched with.
+        """
+        self.model = model
+        self.date_block_num = int(next_month_features['date_block_num'].iloc[0])
+        self.feature_columns = list(feature_columns)
+
+        next_month_features = next_month_features.sort_values(by='shop_id')
+        self.shop_ids = next_month_features['shop_id'].to_numpy()
+        self.feature_matrix = next_month_features[self.feature_columns].to_numpy(dtype=np.float32)
+
+        self.max_batch_size = max_batch_size
+        self.max_wait_ms = max_wait_ms
+        self._requests = queue.Queue()
+        self._batch_thread = None
+
+    @classmethod
+    def from_registry(cls, registry_path, model_name, next_month_features, packed_rf=True, **kwargs):
+        """
+        Creates the service with a model of the model registry.
+
+        Args:
+            registry_path (str): Path to the directory of the model registry.
+            model_name (str): The name of the model in the registry.
+            next_month_features (pd.DataFrame): Next month feature rows with date_block_num and shop_id.
+            packed_rf (bool): Whether a RF model is loaded as a PackedForest, which has a lower latency.
+            **kwargs: Batching arguments of the service.
+
+        Returns:
+            ForecastService: The forecast service of the model.
+        """
+        model_registry = ModelRegistry(registry_path)
+        metadata = model_registry.read_metadata(model_name)
+
+        if packed_rf and metadata["model_type"] == "RandomForestRegressor":
+            model = model_registry.load_packed_forest(model_name)
+        else:
+            model = model_registry.load_model(model_name)
+
+        return cls(model, next_month_features, metadata["feature_names"], **kwargs)
+
+    def _shop_positions(self, shop_ids):
+        """
+        Finds the rows of the shops in the feature matrix.
+
+        Args:
+            shop_ids (list): shop_id values.
+
+        Returns:
+            np.ndarray: Row of each shop in the feature matrix.
+
+        Raises:
+            KeyError: If a shop has no feature vector.
+        """
+        shop_ids = np.asarray(shop_ids, dtype=self.shop_ids.dtype)
+        positions = np.minimum(np.searchsorted(self.shop_ids, shop_ids), len(self.shop_ids) - 1)
+
+        unknown = self.shop_ids[positions] != shop_ids
+        if unknown.any():
+            raise KeyError(f"No features are found for shops {shop_ids[unknown].tolist()}.")
+
+        return positions
+
+    def forecast(self, shop_ids):
+        """
+        Forecasts the next month of the shops with a single model call, without waiting for other requests.
+
+        Args:
+            shop_ids (list): shop_id values.
+
+        Returns:
+            dict: Forecast of each shop.
+        """
+        predictions = self._predict(self.feature_matrix[self._shop_positions(shop_ids)])
+        return dict(zip(np.asarray(shop_ids).tolist(), np.asarray(predictions, dtype=float).ravel().tolist()))
+
+    def _predict(self, features):
+        """
+        Predicts the feature vectors with the model.
+
+        Args:
+            features (np.ndarray): Feature vectors of the shops.
+
+        Returns:
+            np.ndarray: Predictions of the shops.
+        """
+        # Models fitted on a DataFrame warn about the missing feature names of an array on every call
+        if hasattr(self.model, 'feature_names_in_'):
+            features = pd.DataFrame(features, columns=self.feature_columns)
+
+        return self.model.predict(features)
+
+    def submit(self, shop_ids):
+        """
+        Queues a forecast request to be predicted together with the other requests of its batch.
+
+        Args:
+            shop_ids (list): shop_id values.
+
+        Returns:
+            Future: Future of the forecast of each shop, as a dict.
+        """
+        future = Future()
+        try:
+            self._requests.put((self._shop_positions(shop_ids), np.asarray(shop_ids).tolist(), future))
+        except KeyError as error:
+            future.set_exception(error)
+
+        return future
+
+    def start(self):
+        """Starts the batching thread, which predicts the queued requests."""
+        if self._batch_thread is None:
+            self._batch_thread = threading.Thread(target=self._run_batches, daemon=True)
+            self._batch_thread.start()
+
+    def stop(self):
+        """Stops the batching thread after the queued requests."""
+        if self._batch_thread is not None:
+            self._requests.put(None)
+            self._batch_thread.join()
+            self._batch_thread = None
+
+    def _run_batches(self):
+        """Collects queued requests until the batch is full or max_wait_ms passes, and predicts them together."""
+        while True:
+            request = self._requests.get()
+            if request is None:
+                return
+
+            batch = [request]
+            batch_size = len(request[0])
+            deadline = time.perf_counter() + self.max_wait_ms / 1000
+
+            while batch_size < self.max_batch_size:
+                try:
+                    request = self._requests.get(timeout=max(0, deadline - time.perf_counter()))
+                except queue.Empty:
+                    break
+
+                if request is None:
+                    self._requests.put(None)
+                    break
+
+                batch.append(request)
+                batch_size += len(request[0])
+
+            self._predict_batch(batch)
+
+    def _predict_batch(self, batch):
+        """
+        Predicts the shops of all requests of a batch with one model call, and sets the result of each request.
+
+        Args:
+            batch (list): (positions, shop_ids, future) of each request.
+        """
+        try:
+            predictions = np.asarray(self._predict(
+                self.feature_matrix[np.concatenate([positions for positions, _, _ in batch])]), dtype=float).ravel()
+        except Exception as error:
+            for _, _, future in batch:
+                future.set_exception(error)
+            return
+
+        start = 0
+        for positions, shop_ids, future in batch:
+            future.set_result(dict(zip(shop_ids, predictions[start:start + len(positions)].tolist())))
+            start += len(positions)
+
+    def create_server(self, host='127.0.0.1', port=8000):
+        """
+        Creates a HTTP server of the service, which answers through the batching thread.
+
+        Requests:
+            GET /forecast?shop_id=1&shop_id=2, or POST /forecast with a {"shop_ids": [1, 2]} JSON body.
+
+        Responses:
+            {"date_block_num": ..., "forecasts": {"1": ..., "2": ...}} as JSON, or 404 for unknown shops.
+
+        Args:
+            host (str): Host of the server.
+            port (int): Port of the server, 0 picks a free port.
+
+        Returns:
+            ThreadingHTTPServer: The server, which is started with serve_forever.
+        """
+        self.start()
+        service = self
+
+        class ForecastRequestHandler(BaseHTTPRequestHandler):
+            # Keep-alive connections, so a client does not pay the TCP handshake for every request,
+            # and no Nagle delay between the headers and the body of a response
+            protocol_version = 'HTTP/1.1'
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                if url.path != '/forecast':
+                    return self._send_json(404, {"error": "Unknown path."})
+                self._send_forecast(parse_qs(url.query).get('shop_id', []))
+
+            def do_POST(self):
+                if urlparse(self.path).path != '/forecast':
+                    return self._send_json(404, {"error": "Unknown path."})
+                body = self.rfile.read(int(self.headers.get('Content-Length', 0)))
+                self._send_forecast(json.loads(body or b'{}').get('shop_ids', []))
+
+            def _send_forecast(self, shop_ids):
+                try:
+                    forecasts = service.submit([int(shop_id) for shop_id in shop_ids]).result()
+                except (KeyError, ValueError) as error:
+                    return self._send_json(404, {"error": str(error)})
+
+                self._send_json(200, {"date_block_num": service.date_block_num, "forecasts": forecasts})
+
+            def _send_json(self, status, content):
+                body = json.dumps(content).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                # Access logs of every request would dominate the latency
+                pass
+
+        return ThreadingHTTPServer((host, port), ForecastRequestHandler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Serves next month forecasts of a model of the model registry.')
+    parser.add_argument('--model-name', default='RF')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8000)
+    args = parser.parse_args()
+
+    # Next month features are created from the full monthly history
+    create_feature_data = CreateFeatureData()
+    monthly_sales = create_feature_data.creating_monthly_data(create_feature_data.getting_data())
+    next_month_features = create_feature_data.create_next_month_features(monthly_sales)
+
+    config = create_feature_data.config
+    if not config.get("model_registry_path"):
+        raise ValueError("model_registry_path is not set in the config, the service loads its model from the registry.")
+
+    service = ForecastService.from_registry(config["model_registry_path"], args.model_name, next_month_features,
+                                            max_batch_size=config.get("forecast_max_batch_size", 256),
+                                            max_wait_ms=config.get("forecast_max_wait_ms", 2))
+
+    server = service.create_server(args.host, args.port)
+    print(f"Forecasts of month {service.date_block_num} are served on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    finally:
+        service.stop()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import numpy as np
+import pandas as pd
+
+
+class RecursiveForecaster:
+    """
+    Forecasts several months ahead for all shops by feeding the forecasts back into the lag features.
+
+    The monthly values of the last max(lag_features_list) months are kept in a ring buffer shaped
+    [shop, month, monthly feature]. In each horizon step the lag features of all shops are gathered from the buffer
+    with one indexing operation, all shops are predicted with one model call, and the forecasts are written into the
+    slot of the oldest month, which becomes the newest month. The buffer is never shifted.
+
+    The forecast is used as the sales_sum of the new month. The other monthly values, e.g. sales_item_price_mean,
+    are unknown for future months and are carried forward from the last month.
+
+    Attributes:
+        model: The trained model, which has a predict method.
+        shop_ids (np.ndarray): shop_id of each row of the buffer.
+        feature_columns (list): Feature names of the model, in the order of the training data.
+    """
+
+    def __init__(self, model, incremental_state, feature_columns):
+        """
+        Initializes the RecursiveForecaster class with the history of create_incremental_state.
+
+        Args:
+            model: The trained model, which has a predict method.
+            incremental_state (dict): The incremental state of CreateFeatureData, which has the monthly values
+                of the trailing months of each shop.
+            feature_columns (list): Feature names of the model, in the order of the training data.
+
+        Raises:
+            ValueError: If a feature of the model can not be created from the monthly values.
+        """
+        self.model = model
+        self.shop_ids = np.asarray(incremental_state['shop_id'])
+        self.feature_columns = list(feature_columns)
+
+        self._history = np.array(incremental_state['tensor'], dtype=np.float64)
+        self._last_date_block_num = int(incremental_state['date_block_num'][-1])
+        self._last_month = int(incremental_state['month'][-1])
+
+        monthly_columns = [str(col_name) for col_name in incremental_state['feature_columns']]
+        self._sales_sum_index = monthly_columns.index('sales_sum')
+
+        # Position of each lag feature in the model input, with its monthly value and lag
+        self._lag_positions, self._lag_feature_indices, self._lags = [], [], []
+        for position, col_name in enumerate(self.feature_columns):
+            if col_name in ['month_sin', 'month_cos']:
+                continue
+
+            monthly_name, _, lag_value = col_name.rpartition('_lag_')
+            if monthly_name not in monthly_columns or not lag_value.isdigit() \
+                    or not 0 < int(lag_value) <= self._history.shape[1]:
+                raise ValueError(f"Feature {col_name} can not be created from the monthly values of the state.")
+
+            self._lag_positions.append(position)
+            self._lag_feature_indices.append(monthly_columns.index(monthly_name))
+            self._lags.append(int(lag_value))
+
+        self._lags = np.array(self._lags)
+
+    def _predict(self, features):
+        """
+        Predicts the feature vectors with the model.
+
+        Args:
+            features (np.ndarray): Feature vectors of the shops.
+
+        Returns:
+            np.ndarray: Predictions of the shops.
+        """
+        # Models fitted on a DataFrame warn about the missing feature names of an array on every call
+        if hasattr(self.model, 'feature_names_in_'):
+            features = pd.DataFrame(features, columns=self.feature_columns)
+
+        return np.asarray(self.model.predict(features), dtype=np.float64).ravel()
+
+    def forecast_horizons(self, n_horizons):
+        """
+        Forecasts the next n_horizons months of all shops with one model call for each month.
+
+        Args:
+            n_horizons (int): Number of months to forecast.
+
+        Returns:
+            pd.DataFrame: Forecast of each shop and month, with shop_id, date_block_num, month and horizon columns.
+        """
+        ring_buffer = self._history.copy()
+        window_size = ring_buffer.shape[1]
+        newest_slot = window_size - 1
+        date_block_num, month = self._last_date_block_num, self._last_month
+
+        features = np.empty((len(self.shop_ids), len(self.feature_columns)), dtype=np.float32)
+        sin_position = self.feature_columns.index('month_sin') if 'month_sin' in self.feature_columns else None
+        cos_position = self.feature_columns.index('month_cos') if 'month_cos' in self.feature_columns else None
+
+        forecasts = np.empty((len(self.shop_ids), n_horizons))
+        for horizon in range(n_horizons):
+            date_block_num, month = date_block_num + 1, month % 12 + 1
+
+            # Lag 1 is the newest month of the buffer, all lag features are gathered together
+            lag_slots = (newest_slot - self._lags + 1) % window_size
+            features[:, self._lag_positions] = ring_buffer[:, lag_slots, self._lag_feature_indices]
+
+            month_rad = 2 * np.pi * (month - 1) / 12
+            if sin_position is not None:
+                features[:, sin_position] = np.sin(month_rad)
+            if cos_position is not None:
+                features[:, cos_position] = np.cos(month_rad)
+
+            forecasts[:, horizon] = self._predict(features)
+
+            # The forecasted month replaces the oldest month of the buffer
+            previous_slot, newest_slot = newest_slot, (newest_slot + 1) % window_size
+            ring_buffer[:, newest_slot] = ring_buffer[:, previous_slot]
+            ring_buffer[:, newest_slot, self._sales_sum_index] = forecasts[:, horizon]
+
+        return pd.DataFrame({
+            'shop_id': np.repeat(self.shop_ids, n_horizons),
+            'date_block_num': np.tile(np.arange(1, n_horizons + 1) + self._last_date_block_num, len(self.shop_ids)),
+            'month': np.tile((np.arange(n_horizons) + self._last_month) % 12 + 1, len(self.shop_ids)),
+            'horizon': np.tile(np.arange(1, n_horizons + 1), len(self.shop_ids)),
+            'forecast': forecasts.ravel()
+        })
@@ -1,11 +1,21 @@
 
-from sklearn.metrics import mean_absolute_error, mean_squared_error
-from utility_functions.mean_absolute_percentage_error import mean_absolute_percentage_error
+from utility_functions.regression_metrics import regression_metrics, create_group_index, grouped_regression_metrics, \
+    bootstrap_regression_metrics
+from utility_functions.feature_contributions import feature_contributions, CONTRIBUTION_CHUNK_ROWS
+import weakref
 import numpy as np
 import pandas as pd
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.inspection import partial_dependence
+from joblib import Parallel, delayed
+from scipy.stats.mstats import mquantiles
+
+# Number of test rows predicted in one model call
+PREDICTION_CHUNK_ROWS = 100000
+# Percentiles of the feature values between which the PDP grid is created, like in sklearn's partial_dependence
+PDP_PERCENTILES = (0.05, 0.95)
+# Maximum number of rows predicted in one model call of a brute force PDP
+PDP_BATCH_ROWS = 262144
 
 
 class EvaluateModels:
@@ -16,53 +26,146 @@ class EvaluateModels:
         test_x (pd.DataFrame): Features of the test dataset.
         test_y (pd.Series): Target values of the test dataset.
         model_list (list): List of tuples containing models and their corresponding names.
+        model_registry (ModelRegistry): Registry of the models, where the test metrics are saved.
+        partial_dependence_cache (weakref.WeakKeyDictionary): Computed partial dependence of each feature and grid,
+            for each model object.
     """
 
-    def __init__(self, test_df, model_list):
+    def __init__(self, test_df, model_list, model_registry=None):
         """
         Initializes the EvaluateModels class with test data and a list of models.
 
         Args:
             test_df (pd.DataFrame): DataFrame containing features and target column.
-            model_list (list): List of tuples (model, model_name).
+            model_list (list): List of tuples (model, model_name), e.g. the lazy models of ModelRegistry.
+            model_registry (ModelRegistry, optional): Registry of the models. If it is given,
+                the test metrics are added to the metadata of each model.
         """
 
         self.test_y = test_df[["target"]]
         self.test_x = test_df.drop(columns=["target"])
         self.model_list = model_list
+        self.model_registry = model_registry
+        # Keyed by the model object, so models sharing a name are cached separately, and the results
+        # of a model are dropped with the model
+        self.partial_dependence_cache = weakref.WeakKeyDictionary()
+
+    def _predict_in_chunks(self, model, chunk_size):
+        """
+        Predicts the test set with a model in chunks of rows, which bounds the memory of the model's predict.
+
+        Args:
+            model: The machine learning model.
+            chunk_size (int): Number of rows predicted in one model call.
+
+        Returns:
+            np.ndarray: Predictions of the test rows.
+        """
+        return np.concatenate([np.asarray(model.predict(self.test_x.iloc[start:start + chunk_size])).ravel()
+                               for start in range(0, len(self.test_x), chunk_size)])
+
+    def predict_models(self, n_jobs=None, chunk_size=PREDICTION_CHUNK_ROWS):
+        """
+        Predicts the test set with all models concurrently, each model in chunks of rows.
+
+        Args:
+            n_jobs (int, optional): Number of threads, each predicting one model at a time.
+                By default, there is one thread for each model.
+            chunk_size (int): Number of rows predicted in one model call.
 
-    def compare_models_with_test_set(self):
+        Returns:
+            list: Predictions of each model, in the order of the model list.
+        """
+        if n_jobs is None:
+            n_jobs = max(1, len(self.model_list))
+
+        return Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self._predict_in_chunks)(model, chunk_size) for model, _ in self.model_list)
+
+    def compare_models_with_test_set(self, n_resamples=None, confidence_level=0.95, n_jobs=None):
         """
-        Compares models using the test set and calculates performance metrics.
+        Compares models using the test set and calculates performance metrics, optionally with bootstrap
+        confidence intervals.
+
+        All models are scored on the same bootstrap resamples, so their intervals are comparable.
+
+        Args:
+            n_resamples (int, optional): Number of bootstrap resamples. By default, the confidence intervals
+                are not calculated.
+            confidence_level (float): Confidence level of the intervals.
+            n_jobs (int, optional): Number of threads predicting the models. By default, one thread for each model.
 
         Returns:
-            pd.DataFrame: A DataFrame containing MAPE, MAE, and RMSE for each model.
+            pd.DataFrame: A DataFrame containing MAPE, MAE, RMSE and bias for each model, and the lower and upper
+                bounds of MAPE, MAE and RMSE if n_resamples is set.
         """
         # Initialize an empty list to store the results
         results = []
 
-        for model, model_name in self.model_list:
-            # Predict on the test set
-            predictions = model.predict(self.test_x).ravel()
+        for (model, model_name), predictions in zip(self.model_list, self.predict_models(n_jobs=n_jobs)):
+            # Calculate all metrics together
+            metrics = regression_metrics(self.test_y.values, predictions)
+
+            result = {
+                "Model": model_name,
+                "MAPE (%)": metrics["mape"],
+                "MAE": metrics["mae"],
+                "RMSE": metrics["rmse"],
+                "Bias": metrics["bias"]
+            }
 
-            # Calculate various metrics
-            mape = mean_absolute_percentage_error(self.test_y.values.ravel(), predictions)
-            mae = mean_absolute_error(self.test_y.values.ravel(), predictions)
-            rmse = np.sqrt(mean_squared_error(self.test_y.values.ravel(), predictions))
+            if n_resamples is not None:
+                intervals = bootstrap_regression_metrics(self.test_y.values, predictions, n_resamples=n_resamples,
+                                                         confidence_level=confidence_level)
+                for metric_name, column_name in [("mape", "MAPE (%)"), ("mae", "MAE"), ("rmse", "RMSE")]:
+                    result[column_name + " CI Low"], result[column_name + " CI High"] = intervals[metric_name]
+                    metrics[metric_name + "_ci_low"], metrics[metric_name + "_ci_high"] = intervals[metric_name]
 
             # Append the results to the list
-            results.append({
-                "Model": model_name,
-                "MAPE (%)": mape,
-                "MAE": mae,
-                "RMSE": rmse
-            })
+            results.append(result)
+
+            if self.model_registry is not None:
+                self.model_registry.update_metrics(model_name, {"test_" + key: value for key, value in metrics.items()})
 
         # Convert the list of results to a DataFrame and sort the dataFrame by MAPE
         results_df = pd.DataFrame(results).sort_values(by="MAPE (%)")
 
         return results_df
 
+    def compare_models_by_group(self, group_values, group_name="group", n_jobs=None):
+        """
+        Calculates the performance metrics of each model for each group of the test set, e.g. for each shop.
+
+        The group index is created once and reused for all models, and the metrics of all groups
+        are calculated together, so the breakdown costs about the same as the overall metrics.
+
+        Args:
+            group_values (array-like): Group of each test row, e.g. shop_id or date_block_num,
+                since they are not kept in the features.
+            group_name (str): Name of the group column in the result.
+            n_jobs (int, optional): Number of threads predicting the models. By default, one thread for each model.
+
+        Returns:
+            pd.DataFrame: A DataFrame containing MAPE, MAE, RMSE, bias and row count for each model and group.
+        """
+        group_labels, group_index = create_group_index(group_values)
+
+        results = []
+        for (model, model_name), predictions in zip(self.model_list, self.predict_models(n_jobs=n_jobs)):
+            metrics = grouped_regression_metrics(self.test_y.values, predictions, group_index, len(group_labels))
+
+            results.append(pd.DataFrame({
+                "Model": model_name,
+                group_name: group_labels,
+                "MAPE (%)": metrics["mape"],
+                "MAE": metrics["mae"],
+                "RMSE": metrics["rmse"],
+                "Bias": metrics["bias"],
+                "Count": metrics["count"]
+            }))
+
+        return pd.concat(results, ignore_index=True)
+
     def plot_feature_importance(self, model, model_name):
         """
         Plots the feature importance for a given model.
@@ -87,6 +190,68 @@ class EvaluateModels:
         else:
             print(f"{model_name} does not have the `feature_importances_` attribute.")
 
+    def explain_model(self, model, group_values=None, group_name="group", chunk_size=CONTRIBUTION_CHUNK_ROWS):
+        """
+        Calculates the feature importance of a model from the per-row feature contributions of the test set,
+        for the whole test set and for each group, e.g. for each shop or month.
+
+        The contributions are calculated with the native tree paths of the model in chunks of rows, and only
+        the sums of the chunks are kept, so the memory does not grow with the test set.
+
+        Args:
+            model: A trained XGBoost, LightGBM or sklearn forest model.
+            group_values (array-like, optional): Group of each test row, e.g. shop_id or date_block_num.
+            group_name (str): Name of the group column in the result.
+            chunk_size (int): Number of rows explained together.
+
+        Returns:
+            pd.DataFrame: Mean absolute and mean contribution of each feature, sorted by the mean absolute contribution.
+            pd.DataFrame: Mean absolute and mean contribution of each group and feature, None without group_values.
+        """
+        feature_names = list(self.test_x.columns)
+        n_features = len(feature_names)
+
+        if group_values is not None:
+            group_labels, group_index = create_group_index(group_values)
+        else:
+            group_labels, group_index = np.array([0]), np.zeros(len(self.test_x), dtype=np.intp)
+
+        n_groups = len(group_labels)
+        absolute_sums = np.zeros((n_groups, n_features))
+        sums = np.zeros((n_groups, n_features))
+
+        start = 0
+        for contributions in feature_contributions(model, self.test_x, chunk_size=chunk_size):
+            chunk_group_index = group_index[start:start + len(contributions)]
+            start += len(contributions)
+
+            # The bias in the last column is not a feature
+            for feature_index in range(n_features):
+                sums[:, feature_index] += np.bincount(chunk_group_index, weights=contributions[:, feature_index],
+                                                      minlength=n_groups)
+                absolute_sums[:, feature_index] += np.bincount(
+                    chunk_group_index, weights=np.abs(contributions[:, feature_index]), minlength=n_groups)
+
+        counts = np.bincount(group_index, minlength=n_groups)[:, None]
+
+        importance_df = pd.DataFrame({
+            "Feature": feature_names,
+            "Mean |Contribution|": absolute_sums.sum(axis=0) / len(self.test_x),
+            "Mean Contribution": sums.sum(axis=0) / len(self.test_x)
+        }).sort_values(by="Mean |Contribution|", ascending=False)
+
+        if group_values is None:
+            return importance_df, None
+
+        group_importance_df = pd.DataFrame({
+            group_name: np.repeat(group_labels, n_features),
+            "Feature": np.tile(feature_names, n_groups),
+            "Mean |Contribution|": (absolute_sums / counts).ravel(),
+            "Mean Contribution": (sums / counts).ravel()
+        })
+
+        return importance_df, group_importance_df
+
     def finding_best_model(self, model_name_string):
         """
         Finds and returns the best model by name from the model list.
@@ -105,13 +270,133 @@ class EvaluateModels:
         print(f"Model '{model_name_string}' not found.")
         return None
 
-    def plot_partial_dependence_plots_for_each_feature(self, model, model_name):
+    def _create_pdp_grid(self, feature_values, grid_resolution):
+        """
+        Creates the grid of a feature like sklearn's partial_dependence: the unique values of a feature with fewer
+        unique values than grid_resolution, or evenly spaced values between the PDP_PERCENTILES of the feature.
+
+        Args:
+            feature_values (pd.Series): Values of the feature in the test set.
+            grid_resolution (int): Maximum number of grid values.
+
+        Returns:
+            np.ndarray: Grid values of the feature.
+        """
+        unique_values = np.unique(feature_values.to_numpy())
+        if len(unique_values) < grid_resolution:
+            return unique_values
+
+        low, high = mquantiles(feature_values.to_numpy(), prob=PDP_PERCENTILES)
+        return np.linspace(low, high, num=grid_resolution)
+
+    def _partial_dependence_of_feature(self, model, feature, grid, sample_x, method):
+        """
+        Computes the partial dependence of a feature on its grid.
+
+        The recursion method walks the trees once per grid value with the training weights of the nodes,
+        so it does not use the test rows. The brute method predicts the sample rows with the feature set to
+        each grid value, and many grid values are predicted together in one model call.
+
+        Args:
+            model: The machine learning model.
+            feature (str): The feature name.
+            grid (np.ndarray): Grid values of the feature.
+            sample_x (pd.DataFrame): Test rows of the brute method.
+            method (str): 'recursion' or 'brute'.
+
+        Returns:
+            np.ndarray: Average prediction on each grid value.
+        """
+        if method == 'recursion':
+            feature_names = list(getattr(model, 'feature_names_in_', sample_x.columns))
+            return model._compute_partial_dependence_recursion(grid.reshape(-1, 1), [feature_names.index(feature)])
+
+        n_rows = len(sample_x)
+        feature_index = sample_x.columns.get_loc(feature)
+        grid_values_per_call = max(1, PDP_BATCH_ROWS // n_rows)
+
+        averages = []
+        for start in range(0, len(grid), grid_values_per_call):
+            grid_batch = grid[start:start + grid_values_per_call]
+
+            # Copies of the sample rows, where the feature is set to one grid value in each copy
+            batch_x = pd.DataFrame(np.tile(sample_x.to_numpy(), (len(grid_batch), 1)), columns=sample_x.columns)
+            batch_x.iloc[:, feature_index] = np.repeat(grid_batch, n_rows)
+
+            predictions = np.asarray(model.predict(batch_x), dtype=np.float64).ravel()
+            averages.append(predictions.reshape(len(grid_batch), n_rows).mean(axis=1))
+
+        return np.concatenate(averages)
+
+    def compute_partial_dependence(self, model, features=None, sample_size=2000, grid_resolution=100,
+                                   method='auto', n_jobs=None, random_state=0):
+        """
+        Computes the partial dependence of the features of a model, in parallel for the features.
+
+        The grid is created from the full test set, the brute method only predicts a random subsample of the
+        test rows. The results are cached by the model object, the feature and the grid, so plotting
+        the same model again does not compute anything.
+
+        Args:
+            model: The machine learning model.
+            features (list, optional): Feature names. Defaults to all features of the test set.
+            sample_size (int, optional): Number of test rows of the brute method. None uses all test rows.
+            grid_resolution (int): Maximum number of grid values of a feature.
+            method (str): 'recursion', 'brute' or 'auto', which uses recursion if the model supports it.
+            n_jobs (int, optional): Number of threads computing the features. By default, one thread for each
+                feature, 1 computes the features one at a time.
+            random_state (int): Seed of the row subsample.
+
+        Returns:
+            dict: (grid values, average predictions) of each feature.
+        """
+        if features is None:
+            features = list(self.test_x.columns)
+
+        if method == 'auto':
+            method = 'recursion' if hasattr(model, '_compute_partial_dependence_recursion') else 'brute'
+
+        if sample_size is not None and sample_size < len(self.test_x):
+            sample_x = self.test_x.sample(n=sample_size, random_state=random_state)
+        else:
+            sample_x = self.test_x
+            sample_size = None
+
+        model_cache = self.partial_dependence_cache.setdefault(model, {})
+
+        results, missing = {}, []
+        for feature in features:
+            grid = self._create_pdp_grid(self.test_x[feature], grid_resolution)
+            cache_key = (feature, method, sample_size, random_state, grid.tobytes())
+
+            if cache_key in model_cache:
+                results[feature] = (grid, model_cache[cache_key])
+            else:
+                missing.append((feature, grid, cache_key))
+
+        if n_jobs is None:
+            n_jobs = max(1, len(missing))
+
+        averages = Parallel(n_jobs=n_jobs, prefer='threads')(
+            delayed(self._partial_dependence_of_feature)(model, feature, grid, sample_x, method)
+            for feature, grid, _ in missing)
+
+        for (feature, grid, cache_key), average in zip(missing, averages):
+            model_cache[cache_key] = average
+            results[feature] = (grid, average)
+
+        return {feature: results[feature] for feature in features}
+
+    def plot_partial_dependence_plots_for_each_feature(self, model, model_name, sample_size=2000, n_jobs=None):
         """
-        Plots partial dependence plots (PDP) for a given model.
+        Plots partial dependence plots (PDP) for a given model on the grid values of each feature.
 
         Args:
             model: The machine learning model to evaluate.
             model_name (str): The name of the model which is used for title of the plot.
+            sample_size (int, optional): Number of test rows of the brute method. None uses all test rows.
+            n_jobs (int, optional): Number of threads computing the features. By default, one thread for each
+                feature, 1 computes the features one at a time.
         """
         feature_names = self.test_x.columns
         n_features = len(feature_names)
@@ -125,10 +410,10 @@ class EvaluateModels:
 
         # Plot partial dependence
         if hasattr(model, 'predict'):
+            partial_dependence = self.compute_partial_dependence(model, sample_size=sample_size, n_jobs=n_jobs)
+
             for i, feature in enumerate(feature_names):
-                pdp = partial_dependence(model, self.test_x, features=[feature])
-                pdp_values = pdp['average'][0]
-                values = np.linspace(self.test_x[feature].min(), self.test_x[feature].max(), len(pdp_values))
+                values, pdp_values = partial_dependence[feature]
 
                 # Plot PDP on the corresponding axis
                 axes[i].plot(values, pdp_values, marker='o')
@@ -0,0 +1,351 @@
+import xgboost as xgb
+import lightgbm as lgb
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.tree import DecisionTreeRegressor
+from sklearn.tree._tree import Tree, NODE_DTYPE
+from modelling.packed_forest import PackedForest
+import numpy as np
+import json
+import os
+import time
+
+# Fields of the sklearn tree nodes, and the compact dtype each field is stored with in the RF artifact
+RF_NODE_FIELDS = {
+    "left_child": np.int32,
+    "right_child": np.int32,
+    "feature": np.int32,
+    "threshold": np.float64,
+    "impurity": np.float64,
+    "n_node_samples": np.int32,
+    "weighted_n_node_samples": np.float64,
+    "missing_go_to_left": np.uint8
+}
+
+
+class LazyModel:
+    """
+    A trained model of the registry, which is loaded from its artifact on first use.
+
+    Attribute access is delegated to the loaded model, so the lazy model can be used in place of the model,
+    e.g. in EvaluateModels, and a scoring process only pays the loading time of the models it uses.
+
+    Attributes:
+        model_registry (ModelRegistry): The registry of the model.
+        model_name (str): The name of the model in the registry.
+        metadata (dict): Metadata of the model, which is read without loading the model.
+    """
+
+    def __init__(self, model_registry, model_name):
+        """
+        Initializes the LazyModel class and reads the metadata of the model.
+
+        Args:
+            model_registry (ModelRegistry): The registry of the model.
+            model_name (str): The name of the model in the registry.
+        """
+        self.model_registry = model_registry
+        self.model_name = model_name
+        self.metadata = model_registry.read_metadata(model_name)
+        self._model = None
+
+    def load(self):
+        """
+        Loads the model from the registry, if it is not loaded before.
+
+        Returns:
+            The trained model.
+        """
+        if self._model is None:
+            self._model = self.model_registry.load_model(self.model_name)
+
+        return self._model
+
+    def __sklearn_is_fitted__(self):
+        return True
+
+    def __getattr__(self, name):
+        # Only called for the attributes which are not defined on the lazy model itself
+        if name.startswith('__'):
+            raise AttributeError(name)
+
+        return getattr(self.load(), name)
+
+
+class ModelRegistry:
+    """
+    A registry of trained models, which stores each model in the fastest native format of its library.
+
+    Each model has its own directory in the registry with the model artifact and a metadata.json file:
+        - XGBoost models are saved as UBJSON.
+        - LightGBM models are saved as model text.
+        - RF models are saved as a compact dump of the node arrays of all trees, with one .npy file for each
+          node field. The arrays are memory-mapped when the model is loaded, so no pickle is read.
+
+    Attributes:
+        registry_path (str): Path to the directory of the registry.
+    """
+
+    def __init__(self, registry_path):
+        """
+        Initializes the ModelRegistry class.
+
+        Args:
+            registry_path (str): Path to the directory of the registry, which is created if it does not exist.
+        """
+        self.registry_path = registry_path
+        os.makedirs(self.registry_path, exist_ok=True)
+
+    def save_model(self, model, model_name, data_fingerprint=None, metrics=None):
+        """
+        Saves a trained model and its metadata to the registry, replacing the model with the same name.
+
+        Args:
+            model: The trained XGBoost, LightGBM or RF model.
+            model_name (str): The name of the model in the registry.
+            data_fingerprint (str, optional): Fingerprint of the training data of the model.
+            metrics (dict, optional): Metrics of the model.
+
+        Raises:
+            ValueError: If the type of the model is not supported.
+        """
+        model_path = self.registry_path + '/' + model_name
+        os.makedirs(model_path, exist_ok=True)
+
+        if isinstance(model, xgb.XGBRegressor):
+            artifact = 'model.ubj'
+            model.save_model(model_path + '/' + artifact)
+            feature_names = model.get_booster().feature_names
+        elif isinstance(model, lgb.LGBMRegressor):
+            artifact = 'model.txt'
+            model.booster_.save_model(model_path + '/' + artifact)
+            feature_names = model.booster_.feature_name()
+        elif isinstance(model, RandomForestRegressor):
+            artifact = 'rf_arrays'
+            self._save_rf_arrays(model, model_path + '/' + artifact)
+            feature_names = getattr(model, 'feature_names_in_', None)
+        else:
+            raise ValueError(f"Model type {type(model).__name__} is not supported by the model registry.")
+
+        metadata = {
+            "model_name": model_name,
+            "model_type": type(model).__name__,
+            "artifact": artifact,
+            "params": model.get_params(),
+            "feature_names": None if feature_names is None else list(feature_names),
+            "n_features": int(model.n_features_in_),
+            "data_fingerprint": data_fingerprint,
+            "metrics": metrics or {},
+            "saved_at": time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+        # Parameters which are not JSON serializable are stored as their string representation
+        with open(model_path + '/metadata.json', 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+
+    def save_model_list(self, model_list, data_fingerprint=None):
+        """
+        Saves the trained models of train_model_with_best_params to the registry.
+
+        Args:
+            model_list (list): A list of [model, model_name] pairs.
+            data_fingerprint (str, optional): Fingerprint of the training data of the models.
+        """
+        for model, model_name in model_list:
+            self.save_model(model, model_name, data_fingerprint)
+
+    def read_metadata(self, model_name):
+        """
+        Reads the metadata of a model without loading the model.
+
+        Args:
+            model_name (str): The name of the model in the registry.
+
+        Returns:
+            dict: Metadata of the model.
+        """
+        with open(self.registry_path + '/' + model_name + '/metadata.json', 'r') as f:
+            return json.load(f)
+
+    def update_metrics(self, model_name, metrics):
+        """
+        Adds metrics to the metadata of a model, e.g. the test set metrics of EvaluateModels.
+
+        Args:
+            model_name (str): The name of the model in the registry.
+            metrics (dict): Metrics of the model.
+        """
+        metadata = self.read_metadata(model_name)
+        metadata["metrics"].update({key: float(value) for key, value in metrics.items()})
+
+        with open(self.registry_path + '/' + model_name + '/metadata.json', 'w') as f:
+            json.dump(metadata, f, indent=2, default=str)
+
+    def list_models(self):
+        """
+        Lists the names of the models in the registry.
+
+        Returns:
+            list: Sorted names of the models.
+        """
+        return sorted(model_name for model_name in os.listdir(self.registry_path)
+                      if os.path.exists(self.registry_path + '/' + model_name + '/metadata.json'))
+
+    def load_model(self, model_name):
+        """
+        Loads a model from its native artifact in the registry.
+
+        Args:
+            model_name (str): The name of the model in the registry.
+
+        Returns:
+            The trained model.
+        """
+        metadata = self.read_metadata(model_name)
+        artifact_path = self.registry_path + '/' + model_name + '/' + metadata["artifact"]
+
+        if metadata["model_type"] == "XGBRegressor":
+            model = xgb.XGBRegressor()
+            model.load_model(artifact_path)
+        elif metadata["model_type"] == "LGBMRegressor":
+            model = self._load_lgb_model(artifact_path, metadata)
+        else:
+            model = self._load_rf_arrays(artifact_path, metadata)
+
+        return model
+
+    def load_packed_forest(self, model_name, batch_size=1024):
+        """
+        Loads a RF model of the registry directly into the compact PackedForest inference representation,
+        without building the sklearn trees.
+
+        Args:
+            model_name (str): The name of the RF model in the registry.
+            batch_size (int): Number of rows predicted at once.
+
+        Returns:
+            PackedForest: The packed forest of the model.
+        """
+        metadata = self.read_metadata(model_name)
+        artifact_path = self.registry_path + '/' + model_name + '/' + metadata["artifact"]
+        node_arrays = {array_name: np.load(artifact_path + '/' + array_name + '.npy', mmap_mode='r')
+                       for array_name in ["feature", "threshold", "left_child", "right_child", "missing_go_to_left",
+                                          "value", "tree_offsets"]}
+
+        return PackedForest(feature=node_arrays["feature"],
+                            threshold=node_arrays["threshold"],
+                            children_left=node_arrays["left_child"],
+                            children_right=node_arrays["right_child"],
+                            missing_go_to_left=node_arrays["missing_go_to_left"],
+                            value=node_arrays["value"],
+                            tree_offsets=node_arrays["tree_offsets"],
+                            feature_names=metadata["feature_names"],
+                            batch_size=batch_size)
+
+    def load_model_list(self, model_names=None):
+        """
+        Creates lazy models of the registry, which can be used as the model list of EvaluateModels.
+
+        Args:
+            model_names (list, optional): Names of the models. By default, all models in the registry are used.
+
+        Returns:
+            list: A list of [LazyModel, model_name] pairs.
+        """
+        model_names = model_names or self.list_models()
+        return [[LazyModel(self, model_name), model_name] for model_name in model_names]
+
+    @staticmethod
+    def _save_rf_arrays(model, artifact_path):
+        """
+        Saves the node arrays of all trees of a RF model, concatenated into one array for each node field.
+
+        Args:
+            model (RandomForestRegressor): The trained RF model.
+            artifact_path (str): Directory of the arrays.
+        """
+        os.makedirs(artifact_path, exist_ok=True)
+        tree_states = [tree.tree_.__getstate__() for tree in model.estimators_]
+
+        for field_name, field_dtype in RF_NODE_FIELDS.items():
+            np.save(artifact_path + '/' + field_name + '.npy',
+                    np.concatenate([tree_state["nodes"][field_name] for tree_state in tree_states]).astype(field_dtype))
+
+        # Leaf values are saved for all nodes, since sklearn uses the values of the internal nodes as well
+        np.save(artifact_path + '/value.npy', np.concatenate([tree_state["values"][:, 0, 0]
+                                                              for tree_state in tree_states]))
+        np.save(artifact_path + '/tree_offsets.npy',
+                np.cumsum([0] + [tree_state["node_count"] for tree_state in tree_states]).astype(np.int64))
+        np.save(artifact_path + '/max_depth.npy', np.array([tree_state["max_depth"] for tree_state in tree_states],
+                                                           dtype=np.int32))
+
+    @staticmethod
+    def _load_rf_arrays(artifact_path, metadata):
+        """
+        Rebuilds a RF model from the memory-mapped node arrays of its trees.
+
+        Args:
+            artifact_path (str): Directory of the arrays.
+            metadata (dict): Metadata of the model.
+
+        Returns:
+            RandomForestRegressor: The trained RF model.
+        """
+        node_arrays = {field_name: np.load(artifact_path + '/' + field_name + '.npy', mmap_mode='r')
+                       for field_name in list(RF_NODE_FIELDS) + ["value"]}
+        tree_offsets = np.load(artifact_path + '/tree_offsets.npy')
+        max_depths = np.load(artifact_path + '/max_depth.npy')
+
+        params = {key: value for key, value in metadata["params"].items()
+                  if key in RandomForestRegressor().get_params()}
+        model = RandomForestRegressor(**params)
+        tree_params = {key: value for key, value in params.items() if key in DecisionTreeRegressor().get_params()}
+
+        model.estimators_ = []
+        for tree_number, (start, end) in enumerate(zip(tree_offsets[:-1], tree_offsets[1:])):
+            nodes = np.empty(end - start, dtype=NODE_DTYPE)
+            for field_name in RF_NODE_FIELDS:
+                nodes[field_name] = node_arrays[field_name][start:end]
+
+            tree = Tree(metadata["n_features"], np.array([1], dtype=np.intp), 1)
+            tree.__setstate__({"max_depth": int(max_depths[tree_number]), "node_count": int(end - start),
+                               "nodes": nodes, "values": np.array(node_arrays["value"][start:end]).reshape(-1, 1, 1)})
+
+            estimator = DecisionTreeRegressor(**tree_params)
+            estimator.tree_ = tree
+            estimator.n_outputs_ = 1
+            estimator.n_features_in_ = metadata["n_features"]
+            estimator.max_features_ = metadata["n_features"]
+            model.estimators_.append(estimator)
+
+        model.estimator_ = DecisionTreeRegressor(**tree_params)
+        model.n_outputs_ = 1
+        model.n_features_in_ = metadata["n_features"]
+        if metadata["feature_names"] is not None:
+            model.feature_names_in_ = np.array(metadata["feature_names"], dtype=object)
+
+        return model
+
+    @staticmethod
+    def _load_lgb_model(artifact_path, metadata):
+        """
+        Loads a LightGBM model text into a LGBMRegressor, so it has the same interface as a trained model.
+
+        Args:
+            artifact_path (str): Path to the model text.
+            metadata (dict): Metadata of the model.
+
+        Returns:
+            lgb.LGBMRegressor: The trained LightGBM model.
+        """
+        params = {key: value for key, value in metadata["params"].items()
+                  if key in lgb.LGBMRegressor().get_params()}
+        model = lgb.LGBMRegressor(**params)
+
+        # The same attributes are set by LGBMRegressor.fit after the booster is trained
+        model._Booster = lgb.Booster(model_file=artifact_path)
+        model._n_features = model._Booster.num_feature()
+        model._n_features_in = model._n_features
+        model._objective = model._Booster.params.get("objective", params.get("objective") or "regression")
+        model.fitted_ = True
+
+        return model
@@ -0,0 +1,182 @@
+import numpy as np
+import pandas as pd
+
+
+class PackedForest:
+    """
+    A compact inference representation of a trained RandomForestRegressor.
+
+    The nodes of all trees are packed into contiguous int32/float32 arrays with global node indices,
+    which take 17 bytes per node instead of the 72 bytes of the sklearn trees. The nodes are stored level by level
+    over all trees, so the nodes visited in a step of the traversal are close to each other in memory,
+    and the two children of a node are next to each other, so only the index of the left child is stored.
+
+    Prediction traverses all trees for a batch of rows at the same time with vectorized numpy code,
+    and drops the (row, tree) pairs which reached a leaf, so the deep levels of the trees are cheaper.
+
+    Thresholds are rounded down to float32, which gives the same split decisions as sklearn,
+    since sklearn compares float32 feature values as well.
+
+    Attributes:
+        feature (np.ndarray): Split feature of each node, 0 for leaves.
+        threshold (np.ndarray): Split threshold of each node, inf for leaves.
+        left_child (np.ndarray): Global index of the left child of each node, the right child is the next node.
+            Leaves are their own left child, so a traversal stays at a leaf once it reaches it.
+        missing_go_to_left (np.ndarray): Whether missing values go to the left child of each node.
+        value (np.ndarray): Prediction of each node.
+        roots (np.ndarray): Global index of the root node of each tree.
+        max_depth (int): Maximum depth of the trees.
+        feature_names (list): Feature names of the model, used to order the columns of a DataFrame.
+        batch_size (int): Number of rows predicted at once.
+    """
+
+    def __init__(self, feature, threshold, children_left, children_right, missing_go_to_left, value, tree_offsets,
+                 feature_names=None, batch_size=1024):
+        """
+        Initializes the PackedForest class from the concatenated node arrays of the sklearn trees.
+
+        Args:
+            feature (np.ndarray): Split feature of each node, negative for leaves.
+            threshold (np.ndarray): Split threshold of each node.
+            children_left (np.ndarray): Index of the left child of each node within its tree.
+            children_right (np.ndarray): Index of the right child of each node within its tree.
+            missing_go_to_left (np.ndarray): Whether missing values go to the left child of each node.
+            value (np.ndarray): Prediction of each node.
+            tree_offsets (np.ndarray): Index of the first node of each tree, followed by the total node count.
+            feature_names (list, optional): Feature names of the model.
+            batch_size (int): Number of rows predicted at once.
+
+        Raises:
+            ValueError: If the node count of the forest does not fit into int32 indices.
+        """
+        if tree_offsets[-1] > np.iinfo(np.int32).max:
+            raise ValueError(f"The forest has {tree_offsets[-1]} nodes, which do not fit into int32 indices.")
+
+        tree_offsets = np.asarray(tree_offsets, dtype=np.int64)
+        node_offsets = np.repeat(tree_offsets[:-1], np.diff(tree_offsets))
+        feature = np.asarray(feature)
+        children_left = np.asarray(children_left) + node_offsets
+        children_right = np.asarray(children_right) + node_offsets
+
+        # Level order of the nodes over all trees, where the children of a node are next to each other
+        level_nodes = tree_offsets[:-1]
+        node_order = []
+        while len(level_nodes):
+            node_order.append(level_nodes)
+            split_nodes = level_nodes[feature[level_nodes] >= 0]
+            level_nodes = np.column_stack([children_left[split_nodes], children_right[split_nodes]]).ravel()
+
+        self.max_depth = len(node_order) - 1
+        node_order = np.concatenate(node_order)
+        new_index = np.empty(len(node_order), dtype=np.int64)
+        new_index[node_order] = np.arange(len(node_order))
+
+        is_leaf = feature[node_order] < 0
+        self.feature = np.where(is_leaf, 0, feature[node_order]).astype(np.int32)
+        self.left_child = np.where(is_leaf, np.arange(len(node_order)),
+                                   new_index[np.where(is_leaf, 0, children_left[node_order])]).astype(np.int32)
+        self.missing_go_to_left = np.asarray(missing_go_to_left, dtype=bool)[node_order] | is_leaf
+        self.value = np.asarray(value, dtype=np.float32)[node_order]
+        self.roots = new_index[tree_offsets[:-1]].astype(np.int32)
+
+        # float32(x) <= threshold is the same as float32(x) <= the largest float32 which is not above threshold
+        threshold = np.asarray(threshold, dtype=np.float64)[node_order]
+        self.threshold = threshold.astype(np.float32)
+        rounded_up = self.threshold > threshold
+        self.threshold[rounded_up] = np.nextafter(self.threshold[rounded_up], np.float32(-np.inf))
+        self.threshold[is_leaf] = np.inf
+
+        self.feature_names = None if feature_names is None else list(feature_names)
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_model(cls, model, batch_size=1024):
+        """
+        Packs the trees of a trained RandomForestRegressor.
+
+        Args:
+            model (RandomForestRegressor): The trained RF model.
+            batch_size (int): Number of rows predicted at once.
+
+        Returns:
+            PackedForest: The packed forest of the model.
+        """
+        trees = [estimator.tree_ for estimator in model.estimators_]
+
+        return cls(feature=np.concatenate([tree.feature for tree in trees]),
+                   threshold=np.concatenate([tree.threshold for tree in trees]),
+                   children_left=np.concatenate([tree.children_left for tree in trees]),
+                   children_right=np.concatenate([tree.children_right for tree in trees]),
+                   missing_go_to_left=np.concatenate([tree.missing_go_to_left for tree in trees]),
+                   value=np.concatenate([tree.value[:, 0, 0] for tree in trees]),
+                   tree_offsets=np.cumsum([0] + [tree.node_count for tree in trees]),
+                   feature_names=getattr(model, 'feature_names_in_', None),
+                   batch_size=batch_size)
+
+    @property
+    def nbytes(self):
+        """Memory used by the packed node arrays in bytes."""
+        return sum(array.nbytes for array in [self.feature, self.threshold, self.left_child, self.missing_go_to_left,
+                                              self.value, self.roots])
+
+    def predict(self, x):
+        """
+        Predicts the target with the mean of the tree predictions, like RandomForestRegressor.predict.
+
+        Args:
+            x (pd.DataFrame or np.ndarray): Features of the rows.
+
+        Returns:
+            np.ndarray: Predictions of the rows.
+        """
+        if isinstance(x, pd.DataFrame) and self.feature_names is not None:
+            x = x[self.feature_names]
+        x = np.ascontiguousarray(x, dtype=np.float32)
+
+        predictions = np.empty(len(x))
+        for start in range(0, len(x), self.batch_size):
+            predictions[start:start + self.batch_size] = self._predict_batch(x[start:start + self.batch_size])
+
+        return predictions
+
+    def _predict_batch(self, x):
+        """
+        Traverses all trees for a batch of rows, one tree level at a time.
+
+        Args:
+            x (np.ndarray): C-contiguous float32 features of the rows.
+
+        Returns:
+            np.ndarray: Predictions of the rows.
+        """
+        n_rows, n_features = x.shape
+        n_trees = len(self.roots)
+        x_flat = x.ravel()
+        has_missing = np.isnan(x_flat).any()
+
+        # Each (row, tree) pair starts at the root of the tree, and the pairs of a tree are next to each other
+        node = np.repeat(self.roots, n_rows)
+        row = np.tile(np.arange(n_rows, dtype=np.int32), n_trees)
+        row_offset = row * np.int32(n_features)
+        leaf_sum = np.zeros(n_rows)
+
+        for depth in range(1, self.max_depth + 1):
+            feature_values = np.take(x_flat, row_offset + np.take(self.feature, node))
+            go_right = feature_values > np.take(self.threshold, node)
+            if has_missing:
+                go_right = np.where(np.isnan(feature_values), ~np.take(self.missing_go_to_left, node), go_right)
+
+            node = np.take(self.left_child, node) + go_right
+
+            # Pairs which reached a leaf are dropped, once there are enough of them to pay for the filtering
+            if depth % 3 == 0:
+                is_leaf = np.take(self.left_child, node) == node
+                if 5 * is_leaf.sum() > len(node):
+                    leaf_sum += np.bincount(row[is_leaf], weights=np.take(self.value, node[is_leaf]),
+                                            minlength=n_rows)
+                    is_split = ~is_leaf
+                    node, row, row_offset = node[is_split], row[is_split], row_offset[is_split]
+
+        leaf_sum += np.bincount(row, weights=np.take(self.value, node), minlength=n_rows)
+
+        return leaf_sum / n_trees
@@ -2,17 +2,111 @@
 import xgboost as xgb
 import lightgbm as lgb
 from sklearn.ensemble import RandomForestRegressor
-from sklearn.model_selection import RandomizedSearchCV
+from sklearn.model_selection import RandomizedSearchCV, ParameterSampler, KFold
 from utility_functions.mean_absolute_percentage_error import mean_absolute_percentage_error
+from utility_functions.data_fingerprint import data_fingerprint
+from modelling.trial_journal import TrialJournal
+from modelling.model_registry import ModelRegistry
 from sklearn.metrics import make_scorer
+from sklearn.base import clone
+from joblib import Parallel, delayed, parallel_backend
+import numpy as np
+import pandas as pd
 import json
+import os
+import sys
+import shutil
+import tempfile
+import time
 import warnings
 
+try:
+    import resource
+except ImportError:  # resource module is only available on Unix
+    resource = None
+
 warnings.filterwarnings('ignore', category=UserWarning)
 
 # Define MAPE scorer for use in model evaluation
 mape_scorer = make_scorer(mean_absolute_percentage_error, greater_is_better=False)
 
+
+def worker_pid_scorer(estimator, x, y):
+    """Scorer which returns the process id of the worker that fits the model."""
+    return os.getpid()
+
+
+def worker_peak_rss_scorer(estimator, x, y):
+    """Scorer which returns the peak resident memory of the worker in MB."""
+    # ru_maxrss is in kilobytes on Linux, but in bytes on macOS
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 ** 2 if sys.platform == 'darwin' else 1024)
+
+
+def _shared_matrix_random_search(matrix_dir, model, model_param_space, model_name, config, search_n_jobs=None):
+    """
+    Runs RandomizedSearchCV on the memory-mapped training matrix of _create_shared_training_matrix
+    and reports the peak memory of its worker processes.
+
+    Only the path of the matrix is passed, so the function can be sent to another process without the training
+    DataFrames. The cross-validation fits run in loky worker processes, also when the search itself runs in
+    a worker of the concurrent scheduler. joblib sends the np.memmap matrix to them as a reference to its file,
+    so every worker maps the same pages of the page cache instead of receiving a pickled copy of the matrix,
+    and only the rows of its fold are copied into its memory by the cross-validation split.
+
+    The peak resident memory and the process id of the worker are recorded as extra scores of each fit,
+    so they are collected from the worker processes in cv_results_ without any extra communication.
+
+    Args:
+        matrix_dir (str): Directory of the memory-mapped files.
+        model: The machine learning model, whose interaction constraints refer to the columns by index.
+        model_param_space (dict): Parameter space of the model.
+        model_name (str): The name of the model.
+        config (dict): Configuration dictionary of TrainModel.
+        search_n_jobs (int, optional): Number of worker processes of the cross-validation fits.
+            Defaults to "search_core_budget" in the config, or the number of CPUs if it is not set.
+
+    Returns:
+        dict: The best parameters of the model.
+        float: Duration of the search in seconds.
+    """
+    start_time = time.perf_counter()
+    search_n_jobs = search_n_jobs or config.get("search_core_budget") or os.cpu_count()
+
+    train_x = np.load(matrix_dir + '/train_x.npy', mmap_mode='r')
+    train_y = np.load(matrix_dir + '/train_y.npy', mmap_mode='r')
+
+    scoring = {"mape": mape_scorer}
+    if resource is not None:
+        scoring.update({"worker_pid": worker_pid_scorer, "worker_peak_rss": worker_peak_rss_scorer})
+
+    random_search = RandomizedSearchCV(
+        model,
+        param_distributions=model_param_space,
+        n_iter=config["random_search_iter_size"],
+        scoring=scoring,
+        refit="mape",
+        cv=config["cross_validation_fold_size"],
+        n_jobs=search_n_jobs,
+        random_state=42
+    )
+
+    # Inside a worker process joblib runs nested searches on threads, so the process backend is set explicitly
+    with parallel_backend('loky'):
+        random_search.fit(train_x, train_y)
+
+    if resource is not None:
+        # The peak memory only grows, so the last value of each worker is its peak during the search
+        worker_peak_rss = {}
+        for fold_number in range(config["cross_validation_fold_size"]):
+            for pid, peak_rss in zip(random_search.cv_results_[f"split{fold_number}_test_worker_pid"],
+                                     random_search.cv_results_[f"split{fold_number}_test_worker_peak_rss"]):
+                worker_peak_rss[int(pid)] = max(worker_peak_rss.get(int(pid), 0), peak_rss)
+
+        for pid, peak_rss in worker_peak_rss.items():
+            print(f"Peak RSS of {model_name} search worker {pid} is {peak_rss:.0f} MB")
+
+    return random_search.best_params_, time.perf_counter() - start_time
+
 class TrainModel:
     """
     A class for training machine learning models with hyperparameter tuning.
@@ -37,42 +131,585 @@ class TrainModel:
         with open('config.json', 'r') as f:
             self.config = json.load(f)
 
-    def random_search_hyper_parameter_tuning(self):
+        # Journal of the completed search trials, which is loaded when a search starts
+        self.trial_journal = None
+
+        # Directory of the memory-mapped training matrix, which is shared by the search workers when it is enabled
+        self.shared_matrix_dir = None
+
+    def _create_model_list(self):
         """
-        Performs randomized search for hyperparameter tuning on multiple models.
+        Creates the models to be tuned with their parameter spaces from the config.
 
         Returns:
-            list: A list containing the best parameters, model, and model name.
-            pd.DataFrame: Features used for training.
-            pd.Series: Target variable used for training.
+            list: A list containing the model, its parameter space and model name.
         """
         # Two columns were generated from the month information, and it would be more logical to use them together.
         # Therefore, interaction_constraints were defined for the XGBoost model.
         # However, since this feature is not available in other models, it could not be used
         interaction_constraints = [['month_sin', 'month_cos']]
-        model_list = [[xgb.XGBRegressor(verbose=0,  interaction_constraints=interaction_constraints),
+        model_list = [[xgb.XGBRegressor(verbose=0,  interaction_constraints=interaction_constraints, random_state=42),
                        self.config["xgb_param_dist"], "XGB"],
-                      [lgb.LGBMRegressor(verbose=-1), self.config["lgb_param_dist"],  "LGB"],
-                      [RandomForestRegressor(verbose=0), self.config["rf_param_dist"], "RF"]
+                      [lgb.LGBMRegressor(verbose=-1, random_state=42), self.config["lgb_param_dist"],  "LGB"],
+                      [RandomForestRegressor(verbose=0, random_state=42), self.config["rf_param_dist"], "RF"]
                       ]
 
+        return model_list
+
+    def _search_best_params(self, model, model_param_space, model_name, search_n_jobs=None, model_n_jobs=None):
+        """
+        Runs the hyperparameter search of a single model and measures its duration.
+
+        Args:
+            model: The machine learning model.
+            model_param_space (dict): Parameter space of the model.
+            model_name (str): The name of the model.
+            search_n_jobs (int, optional): Number of cross-validation fits running in parallel.
+            model_n_jobs (int, optional): Number of threads used by each fit of the model.
+
+        Returns:
+            dict: The best parameters of the model.
+            float: Duration of the search in seconds.
+        """
+        start_time = time.perf_counter()
+
+        if model_n_jobs is not None:
+            model = clone(model).set_params(n_jobs=model_n_jobs)
+
+        if self.config.get("search_mode", "random") == "halving":
+            best_params = self._successive_halving_search(model, model_param_space, search_n_jobs)
+            return best_params, time.perf_counter() - start_time
+
+        if self.config.get("search_mode", "random") == "shared_n_estimators":
+            best_params = self._shared_n_estimators_search(model, model_param_space, search_n_jobs)
+            return best_params, time.perf_counter() - start_time
+
+        # RandomizedSearchCV can not skip completed trials, so the same candidates and folds are evaluated one by one
+        if self.trial_journal is not None:
+            best_params = self._journaled_random_search(model, model_param_space, search_n_jobs)
+            return best_params, time.perf_counter() - start_time
+
+        if self.shared_matrix_dir is not None:
+            return _shared_matrix_random_search(self.shared_matrix_dir, self._index_interaction_constraints(model),
+                                                model_param_space, model_name, self.config, search_n_jobs)
+
+        random_search = RandomizedSearchCV(
+            model,
+            param_distributions=model_param_space,
+            n_iter=self.config["random_search_iter_size"],  # Number of random combinations to try
+            scoring=mape_scorer,
+            cv=self.config["cross_validation_fold_size"],  # Number of cross-validation folds
+            n_jobs=search_n_jobs,
+            random_state=42  # For reproducibility
+        )
+
+        random_search.fit(self.train_x, self.train_y)
+
+        return random_search.best_params_, time.perf_counter() - start_time
+
+    def _create_shared_training_matrix(self, matrix_dir):
+        """
+        Writes the training data to memory-mapped .npy files, the features as a float32 matrix.
+
+        joblib passes np.memmap arrays to its worker processes as a reference to the file instead of pickling
+        the data, so all cross-validation workers of _shared_matrix_random_search map the same pages of
+        the page cache, and only the rows of their folds are copied into their memory.
+
+        Args:
+            matrix_dir (str): Directory of the memory-mapped files.
+
+        Returns:
+            np.memmap: Read-only float32 feature matrix.
+            np.memmap: Read-only target vector.
+        """
+        os.makedirs(matrix_dir, exist_ok=True)
+
+        # The matrix is filled column by column, so a float32 copy of the whole DataFrame is not created in memory
+        train_x = np.lib.format.open_memmap(matrix_dir + '/train_x.npy', mode='w+', dtype=np.float32,
+                                            shape=self.train_x.shape)
+        for column_index, column_name in enumerate(self.train_x.columns):
+            train_x[:, column_index] = self.train_x[column_name].to_numpy(dtype=np.float32)
+        train_x.flush()
+        del train_x
+
+        np.save(matrix_dir + '/train_y.npy', self.train_y.to_numpy(dtype=np.float64).ravel())
+
+        return np.load(matrix_dir + '/train_x.npy', mmap_mode='r'), np.load(matrix_dir + '/train_y.npy', mmap_mode='r')
+
+    def _index_interaction_constraints(self, model):
+        """
+        Converts the interaction constraints of an XGBoost model from column names to column indices,
+        since the shared training matrix has no column names.
+
+        Args:
+            model: The machine learning model.
+
+        Returns:
+            The model with the constraints by index, or the same model if it has no interaction constraints.
+        """
+        # XGBoost only accepts the constraints by index in their string form
+        if isinstance(model, xgb.XGBRegressor) and model.interaction_constraints is not None:
+            model = clone(model).set_params(interaction_constraints=json.dumps([
+                [self.train_x.columns.get_loc(column_name) for column_name in constraint]
+                for constraint in model.interaction_constraints]))
+
+        return model
+
+    def _cross_validate_mape(self, model, params, n_rows=None):
+        """
+        Computes the cross-validation MAPE of a model with the given parameters.
+
+        Args:
+            model: The machine learning model.
+            params (dict): Parameters of the model.
+            n_rows (int, optional): Number of randomly selected training rows to use. By default, all rows are used.
+
+        Returns:
+            float: Mean MAPE over the cross-validation folds.
+        """
+        train_x = self.train_x
+        train_y = self.train_y.values.ravel()
+
+        if n_rows is not None and n_rows < len(train_x):
+            row_index = np.random.RandomState(42).permutation(len(train_x))[:n_rows]
+            train_x, train_y = train_x.iloc[row_index], train_y[row_index]
+
+        else:
+            n_rows = None
+
+        def score_fold(fit_index, valid_index):
+            fold_model = clone(model).set_params(**params)
+            fold_model.fit(train_x.iloc[fit_index], train_y[fit_index])
+            predictions = fold_model.predict(train_x.iloc[valid_index])
+            return float(mean_absolute_percentage_error(train_y[valid_index], predictions))
+
+        fold_scores = []
+        folds = KFold(n_splits=self.config["cross_validation_fold_size"]).split(train_x)
+        for fold_number, (fit_index, valid_index) in enumerate(folds):
+            trial = {"params": params, "n_rows": n_rows, "fold": fold_number}
+            fold_scores.append(self._journaled_scores(model, trial, lambda: score_fold(fit_index, valid_index)))
+
+        return np.mean(fold_scores)
+
+    def _journaled_random_search(self, model, model_param_space, search_n_jobs=None):
+        """
+        Evaluates the same candidates and folds as RandomizedSearchCV one trial at a time,
+        so the completed trials are kept in the trial journal and skipped after a restart.
+
+        Args:
+            model: The machine learning model.
+            model_param_space (dict): Parameter space of the model.
+            search_n_jobs (int, optional): Number of candidates evaluated in parallel.
+
+        Returns:
+            dict: The best parameters of the model.
+        """
+        candidates = list(ParameterSampler(model_param_space, n_iter=self.config["random_search_iter_size"],
+                                           random_state=42))
+
+        candidate_scores = Parallel(n_jobs=search_n_jobs, prefer='threads')(
+            delayed(self._cross_validate_mape)(model, params) for params in candidates)
+
+        return candidates[int(np.argmin(candidate_scores))]
+
+    def _journaled_scores(self, model, trial, score_function):
+        """
+        Returns the scores of a trial from the trial journal if the trial is completed before,
+        otherwise computes them with score_function and adds them to the journal.
+
+        Args:
+            model: The machine learning model of the trial.
+            trial (dict): The params, fold and resource of the trial.
+            score_function (callable): Function that computes the scores of the trial.
+
+        Returns:
+            The scores of the trial.
+        """
+        if self.trial_journal is None:
+            return score_function()
+
+        trial = {"model": type(model).__name__, "n_folds": self.config["cross_validation_fold_size"], **trial}
+        scores = self.trial_journal.get_scores(trial)
+        if scores is None:
+            scores = score_function()
+            self.trial_journal.add_trial(trial, scores)
+
+        return scores
+
+    def _successive_halving_search(self, model, model_param_space, search_n_jobs=None):
+        """
+        Finds the best parameters of a model with successive halving.
+
+        All sampled candidates are evaluated with a small resource, then only the best 1 / "halving_factor"
+        of them are evaluated again with "halving_factor" times more resource, until the full resource is reached.
+        The resource ("halving_resource" in the config) is either the number of training rows ("n_samples")
+        or the number of boosting rounds / trees ("n_estimators").
+
+        The search stops when the fit count or the wall-clock budget ("search_budget" in the config) is exhausted,
+        and the best candidate of the last evaluated rung is returned.
+
+        Args:
+            model: The machine learning model.
+            model_param_space (dict): Parameter space of the model.
+            search_n_jobs (int, optional): Number of candidates evaluated in parallel.
+
+        Returns:
+            dict: The best parameters of the model.
+
+        Raises:
+            RuntimeError: If the budget is too small to evaluate any candidate.
+        """
+        halving_factor = self.config.get("halving_factor", 3)
+        halving_resource = self.config.get("halving_resource", "n_samples")
+        search_budget = self.config.get("search_budget") or {}
+        max_fits = search_budget.get("max_fits")
+        max_seconds = search_budget.get("max_seconds")
+        n_folds = self.config["cross_validation_fold_size"]
+
+        # When n_estimators is the resource, it is not sampled but increased in every rung
+        model_param_space = dict(model_param_space)
+        if halving_resource == "n_estimators":
+            max_resource = max(model_param_space.pop("n_estimators"))
+            min_resource_limit = 1
+        else:
+            max_resource = len(self.train_x)
+            min_resource_limit = 2 * n_folds
+
+        candidates = list(ParameterSampler(model_param_space, n_iter=self.config["random_search_iter_size"],
+                                           random_state=42))
+        n_rungs = 1 + int(np.log(len(candidates)) / np.log(halving_factor))
+        min_resource = max(max_resource // halving_factor ** (n_rungs - 1), min_resource_limit)
+
+        start_time = time.perf_counter()
+        n_fits = 0
+        best_params = None
+
+        for rung in range(n_rungs):
+            # The minimum resource is rounded down, so the last rung is set to the full resource
+            rung_resource = min(max_resource, min_resource * halving_factor ** rung)
+            if rung == n_rungs - 1:
+                rung_resource = max_resource
+            rung_scores = []
+
+            # Candidates are evaluated in batches, so the budget is checked between the batches
+            batch_size = search_n_jobs or 1
+            while len(rung_scores) < len(candidates):
+                n_batch = min(batch_size, len(candidates) - len(rung_scores))
+                if max_fits is not None:
+                    n_batch = min(n_batch, (max_fits - n_fits) // n_folds)
+                if n_batch <= 0 or (max_seconds is not None and time.perf_counter() - start_time >= max_seconds):
+                    break
+
+                batch = candidates[len(rung_scores):len(rung_scores) + n_batch]
+                if halving_resource == "n_estimators":
+                    batch_scores = Parallel(n_jobs=search_n_jobs, prefer='threads')(
+                        delayed(self._cross_validate_mape)(model, {**params, "n_estimators": rung_resource})
+                        for params in batch)
+                else:
+                    batch_scores = Parallel(n_jobs=search_n_jobs, prefer='threads')(
+                        delayed(self._cross_validate_mape)(model, params, rung_resource) for params in batch)
+
+                rung_scores.extend(batch_scores)
+                n_fits += n_batch * n_folds
+
+            if not rung_scores:
+                break
+
+            # Candidates are kept in the order of their scores, so a partially evaluated rung contains the best ones
+            ranking = np.argsort(rung_scores)
+            best_params = dict(candidates[ranking[0]])
+            if halving_resource == "n_estimators":
+                best_params["n_estimators"] = int(rung_resource)
+
+            if len(rung_scores) < len(candidates):
+                print(f"Search budget is exhausted after {n_fits} fits in rung {rung + 1} of {n_rungs}")
+                break
+
+            n_kept_candidates = max(1, int(np.ceil(len(candidates) / halving_factor)))
+            candidates = [candidates[candidate_index] for candidate_index in ranking[:n_kept_candidates]]
+
+        if best_params is None:
+            raise RuntimeError("Search budget is too small to evaluate any candidate.")
+
+        return best_params
+
+    def _score_n_estimators_on_fold(self, model, params, n_estimators_values, fold_number, fit_index, valid_index):
+        """
+        Scores several n_estimators values of the same parameters on a cross-validation fold with a single fit.
+
+        Boosting models are fitted once with the largest value and the smaller values are scored with
+        the first trees of the booster (iteration_range for XGBoost, num_iteration for LightGBM).
+        RF is grown with warm_start from the smallest to the largest value, and scored after each size.
+
+        Args:
+            model: The machine learning model.
+            params (dict): Parameters of the model except n_estimators.
+            n_estimators_values (list): Sorted n_estimators values to score.
+            fold_number (int): Number of the fold, which identifies the trial in the trial journal.
+            fit_index (np.ndarray): Row indices of the training part of the fold.
+            valid_index (np.ndarray): Row indices of the validation part of the fold.
+
+        Returns:
+            list: MAPE of each n_estimators value on the validation part of the fold.
+        """
+        trial = {"params": params, "n_estimators_values": n_estimators_values, "fold": fold_number}
+        return self._journaled_scores(model, trial, lambda: self._fit_and_score_n_estimators(
+            model, params, n_estimators_values, fit_index, valid_index))
+
+    def _fit_and_score_n_estimators(self, model, params, n_estimators_values, fit_index, valid_index):
+        """Fits and scores the n_estimators values of _score_n_estimators_on_fold."""
+        train_y = self.train_y.values.ravel()
+        fit_x, valid_x = self.train_x.iloc[fit_index], self.train_x.iloc[valid_index]
+        fit_y, valid_y = train_y[fit_index], train_y[valid_index]
+
+        fold_model = clone(model).set_params(**params)
+
+        if isinstance(fold_model, RandomForestRegressor):
+            fold_model.set_params(warm_start=True)
+            predictions = []
+            for n_estimators in n_estimators_values:
+                fold_model.set_params(n_estimators=n_estimators).fit(fit_x, fit_y)
+                predictions.append(fold_model.predict(valid_x))
+        else:
+            fold_model.set_params(n_estimators=n_estimators_values[-1]).fit(fit_x, fit_y)
+            if isinstance(fold_model, xgb.XGBRegressor):
+                predictions = [fold_model.predict(valid_x, iteration_range=(0, n_estimators))
+                               for n_estimators in n_estimators_values]
+            else:
+                predictions = [fold_model.predict(valid_x, num_iteration=n_estimators)
+                               for n_estimators in n_estimators_values]
+
+        return [float(mean_absolute_percentage_error(valid_y, fold_predictions)) for fold_predictions in predictions]
+
+    def _score_samples_on_native_fold(self, model, shared_params_list, n_estimators_values, fold_number,
+                                      fit_index, valid_index):
+        """
+        Scores all candidates of the shared n_estimators search on a cross-validation fold
+        with a native dataset of the boosting library, which is built only once for the fold.
+
+        The training part of the fold is binned once into a QuantileDMatrix for XGBoost, or a constructed
+        lgb.Dataset with free_raw_data=False for LightGBM, and every candidate is trained on it with the native
+        training API, so the data is not validated and binned again for every candidate.
+
+        It is only used by _shared_n_estimators_search, i.e. when "search_mode" is "shared_n_estimators" and
+        "native_dataset_cache" is enabled in the config. The other search modes ignore "native_dataset_cache".
+
+        Args:
+            model: The XGBoost or LightGBM model.
+            shared_params_list (list): Parameters of the candidates except n_estimators.
+            n_estimators_values (list): Sorted n_estimators values to score for each candidate.
+            fold_number (int): Number of the fold, which identifies the trials in the trial journal.
+            fit_index (np.ndarray): Row indices of the training part of the fold.
+            valid_index (np.ndarray): Row indices of the validation part of the fold.
+
+        Returns:
+            list: MAPE of each n_estimators value for each candidate on the validation part of the fold.
+        """
+        train_y = self.train_y.values.ravel()
+        fit_x, valid_x = self.train_x.iloc[fit_index], self.train_x.iloc[valid_index]
+        fit_y, valid_y = train_y[fit_index], train_y[valid_index]
+        native_datasets = {}
+
+        def score_sample(shared_params):
+            # The datasets are built for the first candidate which is not in the trial journal
+            if not native_datasets:
+                if isinstance(model, xgb.XGBRegressor):
+                    native_datasets["fit"] = xgb.QuantileDMatrix(fit_x, fit_y)
+                    native_datasets["valid"] = xgb.QuantileDMatrix(valid_x, ref=native_datasets["fit"])
+                else:
+                    native_datasets["fit"] = lgb.Dataset(fit_x, fit_y, free_raw_data=False,
+                                                         params={"feature_pre_filter": False, "verbose": -1}
+                                                         ).construct()
+
+            sample_model = clone(model).set_params(**shared_params)
+
+            if isinstance(model, xgb.XGBRegressor):
+                booster = xgb.train(sample_model.get_xgb_params(), native_datasets["fit"],
+                                    num_boost_round=n_estimators_values[-1])
+                predictions = [booster.predict(native_datasets["valid"], iteration_range=(0, n_estimators))
+                               for n_estimators in n_estimators_values]
+            else:
+                # Parameter names of the sklearn API are aliases of the native LightGBM parameters
+                lgb_params = {key: value for key, value in sample_model.get_params().items()
+                              if value is not None and key not in ["n_estimators", "importance_type", "class_weight",
+                                                                   "n_jobs", "random_state", "objective"]}
+                lgb_params.update({"objective": sample_model.objective or "regression",
+                                   "seed": sample_model.random_state,
+                                   "num_threads": sample_model.n_jobs or 0,
+                                   "feature_pre_filter": False})
+                booster = lgb.train(lgb_params, native_datasets["fit"], num_boost_round=n_estimators_values[-1])
+                predictions = [booster.predict(valid_x, num_iteration=n_estimators)
+                               for n_estimators in n_estimators_values]
+
+            return [float(mean_absolute_percentage_error(valid_y, sample_predictions))
+                    for sample_predictions in predictions]
+
+        sample_scores = []
+        for shared_params in shared_params_list:
+            # Trials are the same as the trials of _score_n_estimators_on_fold, since their scores are equal
+            trial = {"params": shared_params, "n_estimators_values": n_estimators_values, "fold": fold_number}
+            sample_scores.append(self._journaled_scores(model, trial, lambda: score_sample(shared_params)))
+
+        return sample_scores
+
+    def _shared_n_estimators_search(self, model, model_param_space, search_n_jobs=None):
+        """
+        Finds the best parameters of a model where the candidates that differ only in n_estimators share one fit.
+
+        The parameters except n_estimators are sampled, and each sample is crossed with every n_estimators value
+        in the parameter space, so the number of candidates stays about "random_search_iter_size".
+        The largest model of a sample contains the smaller ones as its first trees, so all n_estimators values
+        of the sample are scored with a single fit per fold by _score_n_estimators_on_fold.
+        If "native_dataset_cache" is enabled in the config, boosting models are scored by
+        _score_samples_on_native_fold, which bins each fold only once for all samples.
+
+        Args:
+            model: The machine learning model.
+            model_param_space (dict): Parameter space of the model.
+            search_n_jobs (int, optional): Number of fits running in parallel.
+
+        Returns:
+            dict: The best parameters of the model.
+        """
+        model_param_space = dict(model_param_space)
+        n_estimators_values = sorted(model_param_space.pop("n_estimators"))
+
+        n_samples = int(np.ceil(self.config["random_search_iter_size"] / len(n_estimators_values)))
+        shared_params_list = list(ParameterSampler(model_param_space, n_iter=n_samples, random_state=42))
+        folds = list(enumerate(KFold(n_splits=self.config["cross_validation_fold_size"]).split(self.train_x)))
+
+        if self.config.get("native_dataset_cache", False) and not isinstance(model, RandomForestRegressor):
+            # A native dataset is used by one thread only, so the folds run in parallel
+            fold_scores = Parallel(n_jobs=search_n_jobs, prefer='threads')(
+                delayed(self._score_samples_on_native_fold)(model, shared_params_list, n_estimators_values,
+                                                            fold_number, fit_index, valid_index)
+                for fold_number, (fit_index, valid_index) in folds)
+            fold_scores = np.array(fold_scores).transpose(1, 0, 2)
+        else:
+            fold_scores = Parallel(n_jobs=search_n_jobs, prefer='threads')(
+                delayed(self._score_n_estimators_on_fold)(model, shared_params, n_estimators_values,
+                                                          fold_number, fit_index, valid_index)
+                for shared_params in shared_params_list for fold_number, (fit_index, valid_index) in folds)
+            fold_scores = np.array(fold_scores).reshape(len(shared_params_list), len(folds), len(n_estimators_values))
+
+        # Average the fold scores of each candidate, the scores are shaped [sample, fold, n_estimators]
+        mean_scores = fold_scores.mean(axis=1)
+        best_sample, best_n_estimators = np.unravel_index(np.argmin(mean_scores), mean_scores.shape)
+        best_params = {**shared_params_list[best_sample], "n_estimators": n_estimators_values[best_n_estimators]}
+
+        print(f"{len(shared_params_list) * len(n_estimators_values)} candidates are scored "
+              f"with {len(shared_params_list) * len(folds)} fits")
+
+        return best_params
+
+    def _split_core_budget(self, model_list):
+        """
+        Splits the core budget between the models, and for each model between the cross-validation fits
+        and the threads of each fit.
+
+        The budget is "search_core_budget" in the config, or the number of CPUs if it is not set.
+        Each model gets an equal share and the remaining cores go to RF, which has the slowest fits.
+        The searches run at the same time, so each model gets at least one core even if the budget is smaller
+        than the number of models.
+        Boosting models run at most one fit per fold at a time and use the rest of their share as threads.
+        RF fits are single threaded, because the threads of a fit inside a parallel search are not used by joblib.
+
+        Args:
+            model_list (list): A list containing the model, its parameter space and model name.
+
+        Returns:
+            list: A list of (search_n_jobs, model_n_jobs) tuples, one for each model.
+        """
+        core_budget = self.config.get("search_core_budget") or os.cpu_count()
+        model_shares = [max(1, core_budget // len(model_list))] * len(model_list)
+        model_shares[-1] += max(0, core_budget - sum(model_shares))
+
+        core_split = []
+        for (_, _, model_name), model_share in zip(model_list, model_shares):
+            if model_name == "RF":
+                core_split.append((model_share, 1))
+            else:
+                search_n_jobs = min(model_share, self.config["cross_validation_fold_size"])
+                core_split.append((search_n_jobs, max(1, model_share // search_n_jobs)))
+
+        return core_split
+
+    def random_search_hyper_parameter_tuning(self):
+        """
+        Performs randomized search for hyperparameter tuning on multiple models.
+
+        If "search_scheduler" is "concurrent" in the config, the searches of all models run at the same time
+        in separate processes, and the core budget is split between them by _split_core_budget.
+        Otherwise, the models are tuned one after another.
+
+        If "trial_journal_path" is set in the config, the result of each (model, params, fold) trial is appended
+        to a JSONL trial journal, so a restarted search skips the trials completed before for the same data.
+
+        If "shared_training_matrix" is true in the config, the cross-validation fits of the random search run
+        in worker processes, which map a float32 memory-mapped copy of the training data in "shared_matrix_dir",
+        or in a temporary directory which is removed after the search, instead of receiving a pickled copy
+        of the data each. The concurrent scheduler only sends the path of the matrix to the search processes.
+        The trial journal takes precedence, so the shared matrix is not created if "trial_journal_path" is also set.
+        It is not created for the other search modes either, which do not use RandomizedSearchCV.
+
+        Returns:
+            list: A list containing the best parameters, model, and model name.
+            pd.DataFrame: Features used for training.
+            pd.Series: Target variable used for training.
+        """
+        model_list = self._create_model_list()
+
+        # Completed trials of the same training data are loaded from the journal, and skipped by the search
+        if self.config.get("trial_journal_path"):
+            training_data_fingerprint = data_fingerprint(pd.concat([self.train_x, self.train_y], axis=1))
+            self.trial_journal = TrialJournal(self.config["trial_journal_path"], training_data_fingerprint)
+            print(f"{len(self.trial_journal.trials)} completed trials are loaded from the trial journal")
+
+        matrix_dir = None
+        if self.config.get("shared_training_matrix", False):
+            if self.trial_journal is not None:
+                # The journaled search evaluates the trials one by one, without the RandomizedSearchCV workers
+                print("Shared training matrix is not created, since the trial journal takes precedence over it")
+            elif self.config.get("search_mode", "random") != "random":
+                print("Shared training matrix is not created, since it is only used by the random search mode")
+            else:
+                matrix_dir = self.config.get("shared_matrix_dir") or tempfile.mkdtemp(prefix='train_matrix_')
+                self._create_shared_training_matrix(matrix_dir)
+                self.shared_matrix_dir = matrix_dir
+
+        try:
+            if self.config.get("search_scheduler", "sequential") == "concurrent":
+                core_split = self._split_core_budget(model_list)
+                if self.shared_matrix_dir is not None:
+                    # Only the path of the matrix is sent to the search processes, not the training DataFrames
+                    search_tasks = [delayed(_shared_matrix_random_search)(
+                        self.shared_matrix_dir,
+                        self._index_interaction_constraints(clone(model).set_params(n_jobs=model_n_jobs)),
+                        model_param_space, model_name, self.config, search_n_jobs)
+                        for (model, model_param_space, model_name), (search_n_jobs, model_n_jobs)
+                        in zip(model_list, core_split)]
+                else:
+                    search_tasks = [delayed(self._search_best_params)(model, model_param_space, model_name,
+                                                                      search_n_jobs, model_n_jobs)
+                                    for (model, model_param_space, model_name), (search_n_jobs, model_n_jobs)
+                                    in zip(model_list, core_split)]
+
+                search_results = Parallel(n_jobs=len(model_list), backend='loky')(search_tasks)
+            else:
+                search_results = [self._search_best_params(model, model_param_space, model_name)
+                                  for model, model_param_space, model_name in model_list]
+        finally:
+            self.shared_matrix_dir = None
+            # A temporary matrix directory is removed, a configured one is kept to be reused
+            if matrix_dir is not None and not self.config.get("shared_matrix_dir"):
+                shutil.rmtree(matrix_dir, ignore_errors=True)
+
         model_best_param_list = []
-        # Perform random search for each model
-        for model, model_param_space, model_name in model_list:
-            random_search = RandomizedSearchCV(
-                model,
-                param_distributions=model_param_space,
-                n_iter=self.config["random_search_iter_size"],  # Number of random combinations to try
-                scoring=mape_scorer,
-                cv=self.config["cross_validation_fold_size"],  # Number of cross-validation folds
-                random_state=42  # For reproducibility
-            )
-
-            random_search.fit(self.train_x, self.train_y)
-
-            model_best_param_list.append([random_search.best_params_, model, model_name])
-            print(f"Best parameters are found for {model_name}")
-            print(f"Best parameters are {random_search.best_params_}")
+        # Collect the results of the search for each model
+        for (model, _, model_name), (best_params, search_time) in zip(model_list, search_results):
+            model_best_param_list.append([best_params, model, model_name])
+            print(f"Best parameters are found for {model_name} in {search_time:.1f} seconds")
+            print(f"Best parameters are {best_params}")
 
         return model_best_param_list, self.train_x, self.train_y
 
@@ -80,6 +717,9 @@ class TrainModel:
         """
         Trains each model using its best hyperparameters.
 
+        If "model_registry_path" is set in the config, the trained models are saved to the model registry
+        with the fingerprint of the training data, so a new session can load them instead of training again.
+
         Args:
             model_best_param_list (list): List containing the best parameters, model, and model name.
 
@@ -95,4 +735,10 @@ class TrainModel:
             print(f"{model_name} model trained successfully with the best parameters.")
             trained_model_list.append([model, model_name])
 
+        if self.config.get("model_registry_path"):
+            model_registry = ModelRegistry(self.config["model_registry_path"])
+            model_registry.save_model_list(trained_model_list,
+                                           data_fingerprint(pd.concat([self.train_x, self.train_y], axis=1)))
+            print(f"Trained models are saved to the model registry in {self.config['model_registry_path']}")
+
         return trained_model_list
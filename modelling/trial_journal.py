@@ -0,0 +1,91 @@
+import json
+import os
+import pandas as pd
+
+
+class TrialJournal:
+    """
+    An append-only JSONL journal of the hyperparameter search trials.
+
+    Each line holds the scores of one trial, which is a (model, params, fold) evaluation, together with the
+    fingerprint of the training data. Only the trials of the same data fingerprint are loaded, so a restarted
+    search skips its completed trials, and later searches on the same data reuse the results of earlier runs.
+
+    Attributes:
+        journal_path (str): Path to the JSONL journal file.
+        data_fingerprint (str): Fingerprint of the training data.
+        trials (dict): Scores of the completed trials, keyed by the JSON representation of the trial.
+    """
+
+    def __init__(self, journal_path, data_fingerprint):
+        """
+        Initializes the TrialJournal class and loads the completed trials of the data fingerprint.
+
+        Args:
+            journal_path (str): Path to the JSONL journal file, which is created if it does not exist.
+            data_fingerprint (str): Fingerprint of the training data.
+        """
+        self.journal_path = journal_path
+        self.data_fingerprint = data_fingerprint
+        self.trials = {}
+        self._line_is_open = False
+
+        if os.path.exists(self.journal_path):
+            with open(self.journal_path, 'r') as f:
+                for line in f:
+                    self._line_is_open = not line.endswith('\n')
+
+                    # A line can be incomplete if the process was killed while writing it
+                    try:
+                        record = json.loads(line)
+                    except json.JSONDecodeError:
+                        continue
+
+                    if record["data_fingerprint"] == self.data_fingerprint:
+                        self.trials[self._trial_key(record["trial"])] = record["scores"]
+
+    @staticmethod
+    def _trial_key(trial):
+        """Returns the key of a trial, which does not depend on the order of the parameters."""
+        return json.dumps(trial, sort_keys=True)
+
+    def get_scores(self, trial):
+        """
+        Returns the scores of a completed trial.
+
+        Args:
+            trial (dict): The model, params and fold of the trial.
+
+        Returns:
+            The scores of the trial, or None if the trial is not completed.
+        """
+        return self.trials.get(self._trial_key(trial))
+
+    def add_trial(self, trial, scores):
+        """
+        Appends a completed trial to the journal.
+
+        The line is written with a single call in append mode,
+        so the parallel searches can write to the same journal.
+
+        Args:
+            trial (dict): The model, params and fold of the trial.
+            scores: The scores of the trial, a float or a list of floats.
+        """
+        self.trials[self._trial_key(trial)] = scores
+
+        # The incomplete last line of a killed process is closed, so the new line is not appended to it
+        record = {"data_fingerprint": self.data_fingerprint, "trial": trial, "scores": scores}
+        with open(self.journal_path, 'a') as f:
+            f.write(('\n' if self._line_is_open else '') + json.dumps(record) + '\n')
+
+        self._line_is_open = False
+
+    def to_frame(self):
+        """
+        Returns the completed trials of the data fingerprint as a DataFrame, e.g. to warm-start a new search.
+
+        Returns:
+            pd.DataFrame: One row for each completed trial, with the trial fields and its scores.
+        """
+        return pd.DataFrame([{**json.loads(trial_key), "scores": scores} for trial_key, scores in self.trials.items()])
@@ -1,11 +1,85 @@
 
 import os
+import sys
+import json
 import zipfile
+import importlib.util
+from concurrent.futures import ProcessPoolExecutor
+import numpy as np
+import pandas as pd
 from dotenv import load_dotenv
 
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import SALES_TRAIN_DTYPES
+
 # Load environment variables from .env file
 load_dotenv()
 
+# Dtypes of the csv members of the competition archive, the dtypes of the other members are inferred
+MEMBER_DTYPES = {'sales_train.csv': SALES_TRAIN_DTYPES,
+                 'items.csv': {'item_name': 'str', 'item_id': 'int16', 'item_category_id': 'int16'},
+                 'test.csv': {'ID': 'int32', 'shop_id': 'int16', 'item_id': 'int16'}}
+
+# Number of rows of a csv member decompressed and parsed at a time
+COLUMNAR_CHUNK_ROWS = 500000
+
+
+def _extract_member_to_columnar(zip_file_path, member_name, output_file, chunk_size):
+    """
+    Streams a csv member of a zip file into a columnar file, without writing the csv to disk.
+
+    The member is decompressed and parsed chunk by chunk. The chunks are written to a Parquet file as row groups,
+    so only one chunk is in memory at a time. When pyarrow is not installed, the chunks are concatenated and written
+    to a NumPy .npz file instead, which holds the whole parsed member in memory.
+
+    Args:
+        zip_file_path (str): Path to the zip file.
+        member_name (str): Name of the csv member in the zip file.
+        output_file (str): Path of the columnar file, without the extension.
+        chunk_size (int): Number of rows parsed at a time.
+
+    Returns:
+        str: Path of the written columnar file.
+    """
+    dtypes = MEMBER_DTYPES.get(os.path.basename(member_name))
+    use_parquet = importlib.util.find_spec('pyarrow') is not None
+    output_path = output_file + ('.parquet' if use_parquet else '.npz')
+
+    # The file of the other format would be read instead of the new file
+    stale_path = output_file + ('.npz' if use_parquet else '.parquet')
+    if os.path.exists(stale_path):
+        os.remove(stale_path)
+
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+
+    with zipfile.ZipFile(zip_file_path, 'r') as zip_ref, zip_ref.open(member_name) as member_file:
+        chunks = pd.read_csv(member_file, dtype=dtypes, chunksize=chunk_size)
+
+        if use_parquet:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            writer = None
+            try:
+                for chunk in chunks:
+                    table = pa.Table.from_pandas(chunk, preserve_index=False)
+                    if writer is None:
+                        writer = pq.ParquetWriter(output_path, table.schema)
+                    elif table.schema != writer.schema:
+                        # Inferred dtypes of a later chunk can differ from the first chunk
+                        table = table.cast(writer.schema)
+                    writer.write_table(table)
+            finally:
+                if writer is not None:
+                    writer.close()
+        else:
+            df = pd.concat(chunks, ignore_index=True)
+            np.savez(output_path, **{column: df[column].to_numpy(dtype=str) if df[column].dtype == object
+                                     else df[column].to_numpy() for column in df.columns})
+
+    return output_path
+
 class GettingDataFromKaggle:
     """
     A class to download and extract data files from Kaggle.
@@ -87,9 +161,103 @@ class GettingDataFromKaggle:
 
             print(f"Extracted {filename} to {self.target_directory}")
 
-    def run(self):
+    def extract_zip_files_to_columnar(self, n_jobs=None, chunk_size=COLUMNAR_CHUNK_ROWS):
+        """
+        Extracts the csv members of all zip files in the target directory into columnar files
+        in the columnar folder, which getting_data reads when "raw_data_format" is "columnar" in the config.
+
+        The CRC and size of each member are kept in a manifest, so the members which did not change since
+        the last extraction are skipped. The changed members are streamed into their columnar files in
+        a process pool, without writing the csv files to disk. The file of a member is at
+        columnar/<zip name>/<member path>, so members with the same name in different zips or folders
+        do not overwrite each other.
+
+        Args:
+            n_jobs (int, optional): Number of processes. Defaults to the number of CPUs.
+            chunk_size (int): Number of rows of a member parsed at a time.
+
+        Returns:
+            list: Names of the extracted members, the unchanged members are not included.
+
+        Raises:
+            FileNotFoundError: If no zip files are found in the directory.
+            ValueError: If a member path is absolute or leaves its folder with '..', since its columnar file
+                would be written outside the columnar folder.
+        """
+        zip_files = sorted(f for f in os.listdir(self.target_directory) if f.endswith(".zip"))
+
+        if not zip_files:
+            raise FileNotFoundError("No zip files found to extract.")
+
+        columnar_path = self.target_directory + '/columnar'
+        manifest_path = columnar_path + '/manifest.json'
+        os.makedirs(columnar_path, exist_ok=True)
+
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+
+        changed_members = []
+        for filename in zip_files:
+            zip_file_path = os.path.join(self.target_directory, filename)
+
+            # Only the central directory is read here, the members are not decompressed
+            with zipfile.ZipFile(zip_file_path, 'r') as zip_ref:
+                for member in zip_ref.infolist():
+                    if not member.filename.endswith('.csv'):
+                        continue
+
+                    member_key = filename + '/' + member.filename
+                    previous = manifest.get(member_key, {})
+                    if previous.get('crc') == member.CRC and previous.get('file_size') == member.file_size \
+                            and os.path.exists(previous.get('output', '')):
+                        continue
+
+                    output_file = '/'.join([columnar_path, os.path.splitext(filename)[0],
+                                            os.path.splitext(member.filename)[0]])
+
+                    # Unlike extractall, the member path is not sanitized by zipfile, so hostile paths are rejected
+                    member_parts = member.filename.replace('\\', '/').split('/')
+                    is_absolute = member.filename.startswith(('/', '\\')) or os.path.splitdrive(member.filename)[0]
+                    real_columnar_path = os.path.realpath(columnar_path)
+                    is_outside = os.path.commonpath([os.path.realpath(output_file), real_columnar_path]) \
+                        != real_columnar_path
+                    if is_absolute or '..' in member_parts or is_outside:
+                        raise ValueError(f"Member {member.filename} of {filename} would be extracted outside "
+                                         f"{columnar_path}.")
+
+                    changed_members.append((member_key, zip_file_path, member.filename, output_file,
+                                            {'crc': member.CRC, 'file_size': member.file_size}))
+
+        if changed_members:
+            n_jobs = min(n_jobs or os.cpu_count(), len(changed_members))
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                output_paths = list(executor.map(_extract_member_to_columnar,
+                                                 [member[1] for member in changed_members],
+                                                 [member[2] for member in changed_members],
+                                                 [member[3] for member in changed_members],
+                                                 [chunk_size] * len(changed_members)))
+
+            for (member_key, _, _, _, member_info), output_path in zip(changed_members, output_paths):
+                manifest[member_key] = dict(member_info, output=output_path)
+
+            with open(manifest_path, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+        print(f"Extracted {len(changed_members)} changed members of {', '.join(zip_files)} to {columnar_path}")
+
+        return [member[2] for member in changed_members]
+
+    def run(self, columnar=False):
         """
         Orchestrates the process of downloading and extracting Kaggle data.
+
+        Args:
+            columnar (bool): Whether the csv files are extracted into columnar files instead of csv files.
         """
         self.download_data_from_kaggle()
-        self.open_zip_file()
+        if columnar:
+            self.extract_zip_files_to_columnar()
+        else:
+            self.open_zip_file()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_append_month(self):
+        # Sample daily data, shop 2 has no sale in the month 2 and shop 3 opens in the month 3
+        input_df = pd.DataFrame({
+            'date': ['01.01.2013', '02.01.2013', '03.02.2013', '04.02.2013', '05.03.2013',
+                     '06.04.2013', '07.04.2013', '08.04.2013'],
+            'date_block_num': [0, 0, 1, 1, 2, 3, 3, 3],
+            'shop_id': [1, 2, 1, 2, 1, 1, 2, 3],
+            'item_price': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0, 800.0],
+            'item_cnt_day': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0, 7.0, 8.0],
+            'item_category_id_37': [1, 0, 1, 1, 0, 1, 0, 1]
+        })
+
+        with tempfile.TemporaryDirectory() as feature_data_path:
+            # Instantiate the class
+            feature_data = CreateFeatureData(feature_data_path=feature_data_path)
+
+            # Manually set the config attribute
+            feature_data.config = {'lag_features_list': [1, 2]}
+
+            # Expected output is the last month of the pipeline which runs over the full history
+            monthly_sales = feature_data.creating_monthly_data(input_df.copy())
+            monthly_sales = feature_data.fill_empty_months_where_sale_not_exist(monthly_sales)
+            expected_df = feature_data.create_lag_features(monthly_sales)
+
+            # Create the state from the first months and append the following months one by one
+            history_df = input_df[input_df['date_block_num'] <= 1].copy()
+            feature_data.create_incremental_state(feature_data.creating_monthly_data(history_df))
+
+            result_df_2 = feature_data.append_month(input_df[input_df['date_block_num'] == 2].copy())
+            result_df_3 = feature_data.append_month(input_df[input_df['date_block_num'] == 3].copy())
+
+            # Appending an already appended month is not allowed
+            with self.assertRaises(ValueError):
+                feature_data.append_month(input_df[input_df['date_block_num'] == 3].copy())
+
+            # Skipping a month is not allowed, the lags would be read from the wrong months
+            skipped_month_df = input_df[input_df['date_block_num'] == 3].copy()
+            skipped_month_df['date_block_num'] = 5
+            with self.assertRaises(ValueError):
+                feature_data.append_month(skipped_month_df)
+
+        # Shop 3 did not exist in the month 2, so it has no row in the appended month 2
+        expected_df_2 = expected_df[(expected_df['date_block_num'] == 2) &
+                                    (expected_df['shop_id'] != 3)].reset_index(drop=True)
+        expected_df_3 = expected_df[expected_df['date_block_num'] == 3].reset_index(drop=True)
+
+        # Assert that the resulting DataFrames match the expected DataFrames
+        pd.testing.assert_frame_equal(result_df_2, expected_df_2, check_dtype=False)
+        pd.testing.assert_frame_equal(result_df_3, expected_df_3, check_dtype=False)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+import os
+import sys
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_apply_dtype_policy(self):
+        # Sample input data
+        input_df = pd.DataFrame({
+            'shop_id': [1, 2, 59, 3],
+            'target': [10.0, 20.0, 30.0, 40.0],
+            'sales_sum_lag_1': [0.0, 10.0, 20.0, 30.0],
+            'month_sin': [0.0, 0.5, 0.8660254, 1.0]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Without a policy the DataFrame is not changed
+        feature_data.config = {'feature_dtype_policy': None}
+        self.assertIs(feature_data.apply_dtype_policy(input_df), input_df)
+
+        # Manually set the config attribute
+        feature_data.config = {'feature_dtype_policy': {'float': 'float32', 'integer': 'smallest'}}
+
+        # Call the method
+        result_df = feature_data.apply_dtype_policy(input_df)
+
+        # Assert that the resulting DataFrame has the compact dtypes with the same values
+        self.assertEqual(result_df.dtypes.astype(str).tolist(), ['int8', 'float32', 'float32', 'float32'])
+        pd.testing.assert_frame_equal(result_df, input_df, check_dtype=False)
+
+        # The input DataFrame keeps its dtypes
+        self.assertEqual(input_df.dtypes.astype(str).tolist(), ['int64', 'float64', 'float64', 'float64'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LinearRegression
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from utility_functions import regression_metrics as regression_metrics_module
+from utility_functions.regression_metrics import bootstrap_regression_metrics, regression_metrics
+from model_evaluation.evaluate_models import EvaluateModels
+
+class TestBootstrapRegressionMetrics(unittest.TestCase):
+
+    def test_bootstrap_regression_metrics(self):
+        # Sample predictions with zero targets
+        rng = np.random.default_rng(0)
+        y_true = np.round(rng.uniform(0, 5, 300))
+        y_pred = y_true + rng.normal(0, 1, 300)
+
+        intervals = bootstrap_regression_metrics(y_true, y_pred, n_resamples=200, confidence_level=0.9, random_state=1)
+
+        # The intervals match the metrics of each resample, calculated one by one
+        resample_index = np.random.default_rng(1).integers(0, 300, size=(200, 300))
+        resample_metrics = [regression_metrics(y_true[index], y_pred[index]) for index in resample_index]
+        for metric_name in ["mape", "mae", "rmse"]:
+            expected = np.quantile([metrics[metric_name] for metrics in resample_metrics], [0.05, 0.95])
+            np.testing.assert_allclose(intervals[metric_name], expected)
+
+        # Batches of resamples give the same intervals
+        batch_indices = regression_metrics_module.BOOTSTRAP_BATCH_INDICES
+        try:
+            regression_metrics_module.BOOTSTRAP_BATCH_INDICES = 7 * 300
+            batched_intervals = bootstrap_regression_metrics(y_true, y_pred, n_resamples=200, confidence_level=0.9,
+                                                             random_state=1)
+        finally:
+            regression_metrics_module.BOOTSTRAP_BATCH_INDICES = batch_indices
+
+        for metric_name in ["mape", "mae", "rmse"]:
+            np.testing.assert_allclose(batched_intervals[metric_name], intervals[metric_name])
+
+        # The model comparison has the intervals around the point estimates
+        test_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 300)})
+        test_df['target'] = test_df['sales_sum_lag_1'] * 2 + rng.normal(0, 5, 300) + 10
+        model = LinearRegression().fit(test_df[['sales_sum_lag_1']], test_df['target'])
+        evaluate_models = EvaluateModels(test_df, [(model, 'Linear'), (LinearRegression().fit(
+            test_df[['sales_sum_lag_1']] * 0, test_df['target']), 'Mean')])
+
+        # Chunked predictions match the predictions of the full test set
+        np.testing.assert_allclose(evaluate_models.predict_models(n_jobs=2, chunk_size=70)[0],
+                                   model.predict(test_df[['sales_sum_lag_1']]))
+
+        results_df = evaluate_models.compare_models_with_test_set(n_resamples=100, n_jobs=2).set_index("Model")
+        self.assertEqual(results_df.index.tolist(), ['Linear', 'Mean'])
+        for column_name in ["MAPE (%)", "MAE", "RMSE"]:
+            self.assertTrue((results_df[column_name + " CI Low"] <= results_df[column_name]).all())
+            self.assertTrue((results_df[column_name] <= results_df[column_name + " CI High"]).all())
+
+        # The intervals are opt-in
+        self.assertNotIn("MAE CI Low", evaluate_models.compare_models_with_test_set().columns)
+
+        # An empty set has no intervals
+        intervals = bootstrap_regression_metrics(np.array([]), np.array([]), n_resamples=10)
+        for metric_name in ["mape", "mae", "rmse"]:
+            self.assertTrue(np.isnan(intervals[metric_name]).all())
+
+if __name__ == '__main__':
+    unittest.main()
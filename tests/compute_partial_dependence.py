@@ -0,0 +1,66 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import LinearRegression
+from sklearn.inspection import partial_dependence
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from model_evaluation.evaluate_models import EvaluateModels
+
+class TestEvaluateModels(unittest.TestCase):
+
+    def test_compute_partial_dependence(self):
+        # Sample test set with a low resolution feature
+        rng = np.random.default_rng(0)
+        test_df = pd.DataFrame({
+            'sales_sum_lag_1': rng.uniform(0, 100, 500),
+            'sales_sum_lag_3': rng.uniform(0, 100, 500),
+            'month_cos': np.cos(2 * np.pi * rng.integers(0, 12, 500) / 12)
+        })
+        test_df['target'] = test_df['sales_sum_lag_1'] * 2 + test_df['month_cos'] + rng.normal(0, 1, 500)
+        test_x = test_df.drop(columns=['target'])
+
+        linear_model = LinearRegression().fit(test_x, test_df['target'])
+        rf_model = RandomForestRegressor(n_estimators=10, max_depth=5, random_state=0).fit(test_x, test_df['target'])
+        evaluate_models = EvaluateModels(test_df, [(linear_model, 'Linear'), (rf_model, 'RF')])
+
+        # Brute force on all rows and recursion give the grid and averages of sklearn
+        for model, method in [(linear_model, 'brute'), (rf_model, 'recursion')]:
+            result = evaluate_models.compute_partial_dependence(model, sample_size=None, n_jobs=2)
+            self.assertEqual(list(result), list(test_x.columns))
+
+            for feature in test_x.columns:
+                expected = partial_dependence(model, test_x, features=[feature], method=method)
+                np.testing.assert_allclose(result[feature][0], expected['grid_values'][0])
+                np.testing.assert_allclose(result[feature][1], expected['average'][0], rtol=1e-6)
+
+        # The low resolution feature is evaluated on its actual values
+        np.testing.assert_array_equal(result['month_cos'][0], np.unique(test_x['month_cos']))
+
+        # The results are cached, and a subsample only changes the brute force results
+        self.assertEqual(len(evaluate_models.partial_dependence_cache[rf_model]), 3)
+        cached = evaluate_models.compute_partial_dependence(rf_model, sample_size=None, n_jobs=1)
+        self.assertIs(cached['sales_sum_lag_1'][1], result['sales_sum_lag_1'][1])
+
+        sampled = evaluate_models.compute_partial_dependence(linear_model, features=['sales_sum_lag_1'],
+                                                             sample_size=100, method='brute')
+        self.assertEqual(len(evaluate_models.partial_dependence_cache[linear_model]), 4)
+        np.testing.assert_allclose(np.diff(sampled['sales_sum_lag_1'][1]),
+                                   np.diff(sampled['sales_sum_lag_1'][0]) * linear_model.coef_[0])
+
+        # Two models sharing a name, e.g. two RF runs, do not share their cached results
+        other_rf_model = RandomForestRegressor(n_estimators=10, max_depth=2, random_state=1).fit(
+            test_x, test_df['target'])
+        evaluate_models.model_list.append((other_rf_model, 'RF'))
+        other_result = evaluate_models.compute_partial_dependence(other_rf_model, sample_size=None)
+        expected = partial_dependence(other_rf_model, test_x, features=['sales_sum_lag_1'], method='recursion')
+        np.testing.assert_allclose(other_result['sales_sum_lag_1'][1], expected['average'][0], rtol=1e-6)
+        self.assertFalse(np.allclose(other_result['sales_sum_lag_1'][1], result['sales_sum_lag_1'][1]))
+        self.assertEqual(len(evaluate_models.partial_dependence_cache), 3)
+
+if __name__ == '__main__':
+    unittest.main()
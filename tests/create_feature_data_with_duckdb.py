@@ -0,0 +1,64 @@
+import unittest
+import importlib.util
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    @unittest.skipUnless(importlib.util.find_spec('duckdb'), "duckdb is not installed")
+    def test_create_feature_data_with_duckdb(self):
+        rng = np.random.default_rng(42)
+        n_rows = 2000
+
+        with tempfile.TemporaryDirectory() as raw_data_path:
+            # Sample raw data of 4 shops in 8 months, shop 3 has no sale in the even months
+            date_block_num = rng.integers(0, 8, n_rows)
+            shop_id = rng.integers(0, 4, n_rows)
+            sales_train_df = pd.DataFrame({
+                'date': [f'{day:02d}.{block + 1:02d}.2013' for day, block in
+                         zip(rng.integers(1, 29, n_rows), date_block_num)],
+                'date_block_num': date_block_num,
+                'shop_id': shop_id,
+                'item_id': rng.integers(0, 20, n_rows),
+                'item_price': rng.gamma(2, 100, n_rows).round(2),
+                'item_cnt_day': rng.integers(-1, 5, n_rows).astype(float)
+            })
+            sales_train_df = sales_train_df[(shop_id != 3) | (date_block_num % 2 == 1)]
+            sales_train_df.to_csv(raw_data_path + '/sales_train.csv', index=False)
+
+            pd.DataFrame({
+                'item_name': [f'Item{item_id}' for item_id in range(20)],
+                'item_id': range(20),
+                'item_category_id': rng.choice([37, 40], 20)
+            }).to_csv(raw_data_path + '/items.csv', index=False)
+
+            # Instantiate the class
+            feature_data = CreateFeatureData(raw_data_path=raw_data_path)
+
+            # Manually set the config attribute
+            feature_data.config = {'lag_features_list': [1, 3], 'duckdb_threads': 2}
+
+            # Expected output is created by the pandas backend
+            sales_df = feature_data.getting_data()
+            monthly_sales = feature_data.creating_monthly_data(sales_df)
+            monthly_sales = feature_data.fill_empty_months_where_sale_not_exist(monthly_sales)
+            expected_df = feature_data.create_lag_features(monthly_sales)
+            expected_df = feature_data.create_cyclic_features(expected_df)
+            expected_df = feature_data.drop_irrelevant_features(expected_df)
+            expected_df = feature_data.process_features(expected_df)
+
+            # Call the method
+            result_df = feature_data.create_feature_data_with_duckdb()
+
+        # Assert that the resulting DataFrame matches the expected DataFrame
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+import pandas as pd
+import os
+import sys
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_create_item_level_lag_features(self):
+        # Sample daily data of two items in one shop
+        input_df = pd.DataFrame({
+            'date': ['01.01.2013', '02.01.2013', '03.02.2013', '04.03.2013', '05.03.2013'],
+            'date_block_num': [0, 0, 1, 2, 2],
+            'shop_id': [1, 1, 1, 1, 1],
+            'item_id': [5, 5, 7, 5, 7],
+            'item_price': [100.0, 200.0, 50.0, 300.0, 60.0],
+            'item_cnt_day': [1.0, 2.0, 3.0, 4.0, 5.0],
+            'item_category_id_37': [1, 1, 0, 1, 0]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Manually set the config attribute, a small chunk size makes the lookups run in several chunks
+        feature_data.config = {'lag_features_list': [1], 'item_level_chunk_size': 2}
+
+        # Call the methods
+        item_monthly_sales = feature_data.creating_item_level_monthly_data(input_df)
+        result_df = feature_data.create_item_level_lag_features(item_monthly_sales)
+
+        # Item 5 has no sale in date_block_num 1, so that row is an implicit zero with a non zero lag,
+        # and its date_block_num 2 row has a zero lag
+        expected_df = pd.DataFrame({
+            'date_block_num': [1, 2, 1, 2],
+            'month': [2, 3, 2, 3],
+            'shop_id': [1, 1, 1, 1],
+            'item_id': [5, 5, 7, 7],
+            'item_cnt_month': [0.0, 4.0, 3.0, 5.0],
+            'item_price_mean': [0.0, 300.0, 50.0, 60.0],
+            'item_cnt_month_lag_1': [3.0, 0.0, 0.0, 3.0],
+            'item_price_mean_lag_1': [150.0, 0.0, 0.0, 50.0]
+        })
+
+        # Assert that the resulting DataFrame matches the expected DataFrame
+        pd.testing.assert_frame_equal(result_df, expected_df, check_dtype=False)
+
+        # Without the implicit zeros only the observed cells are returned
+        result_df = feature_data.create_item_level_lag_features(item_monthly_sales, include_implicit_zeros=False)
+        self.assertEqual(result_df['item_id'].tolist(), [5, 7, 7])
+        self.assertEqual(result_df['item_cnt_month_lag_1'].tolist(), [0.0, 0.0, 3.0])
+
+if __name__ == '__main__':
+    unittest.main()
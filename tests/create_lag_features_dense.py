@@ -0,0 +1,90 @@
+import unittest
+import pandas as pd
+import os
+import sys
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_create_lag_features_dense(self):
+        # Sample monthly data, shop 2 has no sale in the month 1 and shop 3 opens in the month 2
+        input_df = pd.DataFrame({
+            'date_block_num': [0, 0, 1, 2, 2, 2, 3, 3, 3],
+            'month': [1, 1, 2, 3, 3, 3, 4, 4, 4],
+            'shop_id': [1, 2, 1, 1, 2, 3, 1, 2, 3],
+            'sales_item_price_mean': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0, 800.0, 900.0],
+            'sales_sum': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0],
+            'item_category_id_37_ratio': [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2, 0.3]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Manually set the config attribute
+        feature_data.config = {'lag_features_list': [1, 2]}
+
+        # Expected output is created by the existing pandas path
+        expected_df = feature_data.create_lag_features(
+            feature_data.fill_empty_months_where_sale_not_exist(input_df.copy()))
+
+        # Call the method
+        result_df = feature_data.create_lag_features_dense(input_df)
+
+        # Assert that the resulting DataFrame matches the expected DataFrame
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+        # The same output is returned by create_lag_features with the tensor engine
+        feature_data.config['lag_feature_engine'] = 'tensor'
+        pd.testing.assert_frame_equal(feature_data.create_lag_features(input_df), expected_df)
+
+        # The dtypes of the source columns are kept, like in the pandas path
+        feature_data.config['lag_feature_engine'] = 'pandas'
+        input_df = input_df.astype({'sales_item_price_mean': 'float32', 'sales_sum': 'int64'})
+        expected_df = feature_data.create_lag_features(
+            feature_data.fill_empty_months_where_sale_not_exist(input_df.copy()))
+        result_df = feature_data.create_lag_features_dense(input_df)
+        self.assertEqual(result_df['sales_item_price_mean_lag_1'].dtype, 'float32')
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+        # Without empty months the integer columns stay integer
+        feature_data.config['lag_features_list'] = [1]
+        full_df = input_df[input_df['date_block_num'] >= 2]
+        expected_df = feature_data.create_lag_features(full_df.copy())
+        result_df = feature_data.create_lag_features_dense(full_df)
+        self.assertEqual(len(result_df), 6)
+        self.assertEqual(result_df['sales_sum'].dtype, 'int64')
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_create_lag_features_dense_with_lag_longer_than_history(self):
+        # Sample monthly data of the months 10 to 12, the lag of 4 months has no history
+        input_df = pd.DataFrame({
+            'date_block_num': [10, 10, 11, 11, 12, 12],
+            'month': [11, 11, 12, 12, 1, 1],
+            'shop_id': [1, 2, 1, 2, 1, 2],
+            'sales_item_price_mean': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0],
+            'sales_sum': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0],
+            'item_category_id_37_ratio': [0.5, 0.6, 0.7, 0.8, 0.9, 1.0]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Manually set the config attribute
+        feature_data.config = {'lag_features_list': [1, 4]}
+
+        # Expected output is created by the existing pandas path
+        expected_df = feature_data.create_lag_features(
+            feature_data.fill_empty_months_where_sale_not_exist(input_df.copy()))
+
+        # Call the method
+        result_df = feature_data.create_lag_features_dense(input_df)
+
+        # Assert that the lag columns of 4 months are empty, like in the pandas path
+        self.assertEqual(len(result_df), 6)
+        self.assertTrue(result_df['sales_sum_lag_4'].isna().all())
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+if __name__ == '__main__':
+    unittest.main()
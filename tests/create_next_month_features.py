@@ -0,0 +1,45 @@
+import unittest
+import numpy as np
+import pandas as pd
+import os
+import sys
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_create_next_month_features(self):
+        # Sample monthly data of December, shop 2 has no sale in the month 10
+        input_df = pd.DataFrame({
+            'date_block_num': [9, 9, 10, 11, 11],
+            'month': [10, 10, 11, 12, 12],
+            'shop_id': [1, 2, 1, 1, 2],
+            'sales_item_price_mean': [100.0, 200.0, 300.0, 400.0, 500.0],
+            'sales_sum': [10.0, 20.0, 30.0, 40.0, 50.0],
+            'item_category_id_37_ratio': [0.5, 0.6, 0.7, 0.8, 0.9]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Manually set the config attribute
+        feature_data.config = {'lag_features_list': [1, 2, 6]}
+
+        # Call the method
+        result_df = feature_data.create_next_month_features(input_df)
+
+        # The next month is January of date_block_num 12
+        self.assertEqual(result_df['date_block_num'].tolist(), [12, 12])
+        self.assertEqual(result_df['shop_id'].tolist(), [1, 2])
+        np.testing.assert_allclose(result_df['month_sin'], [0.0, 0.0], atol=1e-12)
+        np.testing.assert_allclose(result_df['month_cos'], [1.0, 1.0])
+
+        # Lags are the values of the previous months, an empty month is zero and a month without history is 0
+        self.assertEqual(result_df['sales_sum_lag_1'].tolist(), [40.0, 50.0])
+        self.assertEqual(result_df['sales_sum_lag_2'].tolist(), [30.0, 0.0])
+        self.assertEqual(result_df['sales_sum_lag_6'].tolist(), [0.0, 0.0])
+        self.assertEqual(result_df['sales_item_price_mean_lag_1'].tolist(), [400.0, 500.0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,43 @@
+import unittest
+from unittest.mock import patch, mock_open
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel
+
+class TestTrainModel(unittest.TestCase):
+
+    def test_create_shared_training_matrix(self):
+        # Sample training data with mixed dtypes
+        train_df = pd.DataFrame({
+            'shop_id': np.array([1, 2, 3], dtype='int8'),
+            'lag_1': [1.5, 0.0, 2.25],
+            'month_sin': [0.5, -0.5, 0.0],
+            'target': [2.0, 1.0, 3.0]
+        })
+
+        # Instantiate the class without reading the config file
+        with patch('builtins.open', mock_open(read_data='{}')):
+            train_model = TrainModel(train_df)
+
+        with tempfile.TemporaryDirectory() as matrix_dir:
+            train_x, train_y = train_model._create_shared_training_matrix(matrix_dir)
+
+            # The features are a read-only float32 memory-mapped matrix
+            self.assertIsInstance(train_x, np.memmap)
+            self.assertEqual(train_x.dtype, np.float32)
+            self.assertFalse(train_x.flags.writeable)
+
+            # Assert that the values match the training data
+            np.testing.assert_array_equal(train_x, train_df.drop(columns=['target']).to_numpy(dtype=np.float32))
+            np.testing.assert_array_equal(train_y, [2.0, 1.0, 3.0])
+
+            del train_x, train_y
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import pandas as pd
+import os
+import sys
+import tempfile
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_create_shop_features_in_parallel(self):
+        # Sample monthly data, shop 2 has no sale in the month 1 and shop 4 has no sale in the month 3
+        input_df = pd.DataFrame({
+            'date_block_num': [0, 0, 0, 1, 1, 2, 2, 2, 3, 3, 3],
+            'month': [1, 1, 1, 2, 2, 3, 3, 3, 4, 4, 4],
+            'shop_id': [1, 2, 4, 1, 4, 1, 2, 3, 1, 2, 3],
+            'sales_item_price_mean': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0, 700.0, 800.0, 900.0, 950.0, 990.0],
+            'sales_sum': [10.0, 20.0, 30.0, 40.0, 50.0, 60.0, 70.0, 80.0, 90.0, 95.0, 99.0],
+            'item_category_id_37_ratio': [0.5, 0.6, 0.7, 0.8, 0.9, 1.0, 0.1, 0.2, 0.3, 0.4, 0.5]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Manually set the config attribute
+        feature_data.config = {'lag_features_list': [1, 2]}
+
+        # Expected output is created by running the steps on the whole data
+        expected_df = feature_data.fill_empty_months_where_sale_not_exist(input_df.copy())
+        expected_df = feature_data.create_lag_features(expected_df)
+        expected_df = feature_data.create_cyclic_features(expected_df)
+
+        # Call the method, each shop is in a different shard
+        result_df = feature_data.create_shop_features_in_parallel(input_df, n_jobs=4)
+
+        # Assert that the resulting DataFrame matches the expected DataFrame
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_create_feature_data_with_null_n_jobs(self):
+        # Sample raw data of 2 shops for 3 months
+        sales_train_df = pd.DataFrame({
+            'date': ['02.01.2013', '03.01.2013', '05.02.2013', '06.02.2013', '07.03.2013', '08.03.2013'],
+            'date_block_num': [0, 0, 1, 1, 2, 2],
+            'shop_id': [1, 2, 1, 2, 1, 2],
+            'item_id': [1, 2, 1, 2, 1, 2],
+            'item_price': [100.0, 200.0, 300.0, 400.0, 500.0, 600.0],
+            'item_cnt_day': [1.0, 2.0, 3.0, 4.0, 5.0, 6.0]
+        })
+        items_df = pd.DataFrame({'item_name': ['Item1', 'Item2'], 'item_id': [1, 2], 'item_category_id': [37, 40]})
+
+        with tempfile.TemporaryDirectory() as raw_data_path, tempfile.TemporaryDirectory() as feature_data_path:
+            sales_train_df.to_csv(raw_data_path + '/sales_train.csv', index=False)
+            items_df.to_csv(raw_data_path + '/items.csv', index=False)
+
+            feature_data = CreateFeatureData(raw_data_path=raw_data_path, feature_data_path=feature_data_path)
+
+            # A null number of jobs uses all CPUs and gives the same features as the serial steps
+            feature_data.config = {'lag_features_list': [1], 'test_train_split_ratio': 0.5, 'feature_n_jobs': None}
+            train_df, test_df = feature_data.create_feature_data()
+
+            feature_data.config['feature_n_jobs'] = 1
+            serial_train_df, serial_test_df = feature_data.create_feature_data()
+
+        pd.testing.assert_frame_equal(pd.concat([train_df, test_df]).sort_values(list(train_df.columns))
+                                      .reset_index(drop=True),
+                                      pd.concat([serial_train_df, serial_test_df]).sort_values(list(train_df.columns))
+                                      .reset_index(drop=True))
+
+if __name__ == '__main__':
+    unittest.main()
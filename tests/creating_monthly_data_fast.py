@@ -0,0 +1,57 @@
+import unittest
+import pandas as pd
+import os
+import sys
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_creating_monthly_data_fast(self):
+        # Sample input data, date_block_num 0 is January 2013
+        input_df = pd.DataFrame({
+            'date': ['01.01.2013', '15.01.2013', '22.02.2013', '05.02.2013', '09.01.2014', '30.12.2013'],
+            'date_block_num': [0, 0, 1, 1, 12, 11],
+            'shop_id': [1, 1, 1, 2, 2, 1],
+            'item_price': [100.0, 150.0, 200.0, 250.0, 99.5, 10.0],
+            'item_cnt_day': [1.0, 2.0, 3.0, 4.0, -1.0, 1.0],
+            'item_category_id_37': [1, 0, 1, 1, 0, 1]
+        })
+
+        # Instantiate the class
+        feature_data = CreateFeatureData()
+
+        # Call both methods, creating_monthly_data modifies its input, so it gets a copy
+        expected_df = feature_data.creating_monthly_data(input_df.copy())
+        result_df = feature_data.creating_monthly_data_fast(input_df)
+
+        # Assert that the fast engine gives the same DataFrame as the existing function
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+    def test_creating_monthly_data_engine_config(self):
+        # Sample input data
+        input_df = pd.DataFrame({
+            'date': ['01.01.2013', '15.01.2013', '22.02.2013'],
+            'date_block_num': [0, 0, 1],
+            'shop_id': [1, 2, 1],
+            'item_price': [100.0, 150.0, 200.0],
+            'item_cnt_day': [1.0, 2.0, 3.0],
+            'item_category_id_37': [1, 0, 1]
+        })
+
+        # Instantiate the class and select the numpy engine
+        feature_data = CreateFeatureData()
+        expected_df = feature_data.creating_monthly_data_fast(input_df)
+        feature_data.config = {'monthly_aggregation_engine': 'numpy'}
+
+        # Call the method
+        result_df = feature_data.creating_monthly_data(input_df)
+
+        # The input is not modified by the numpy engine
+        self.assertNotIn('month', input_df.columns)
+        pd.testing.assert_frame_equal(result_df, expected_df)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,100 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import BaggingRegressor, GradientBoostingRegressor, RandomForestRegressor
+from xgboost import XGBRegressor
+from lightgbm import LGBMRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from model_evaluation.evaluate_models import EvaluateModels
+from utility_functions.feature_contributions import feature_contributions
+from modelling.model_registry import ModelRegistry
+
+class TestEvaluateModels(unittest.TestCase):
+
+    def test_explain_model(self):
+        # Sample test set of 4 shops
+        rng = np.random.default_rng(0)
+        test_df = pd.DataFrame({
+            'sales_sum_lag_1': rng.uniform(0, 100, 400),
+            'sales_sum_lag_3': rng.uniform(0, 100, 400),
+            'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 400) / 12)
+        })
+        test_df['target'] = test_df['sales_sum_lag_1'] * 2 - test_df['month_sin'] * 10 + rng.normal(0, 1, 400)
+        test_x = test_df.drop(columns=['target'])
+        shop_id = rng.integers(1, 5, 400)
+
+        models = [RandomForestRegressor(n_estimators=5, max_depth=4, random_state=0),
+                  XGBRegressor(n_estimators=20, max_depth=3), LGBMRegressor(n_estimators=20, verbose=-1)]
+        evaluate_models = EvaluateModels(test_df, [])
+
+        for model in models:
+            model.fit(test_x, test_df['target'])
+
+            # The contributions and the bias add up to the predictions, and do not depend on the chunks
+            contributions = np.vstack(list(feature_contributions(model, test_x, chunk_size=150)))
+            self.assertEqual(contributions.shape, (400, 4))
+            np.testing.assert_allclose(contributions.sum(axis=1), model.predict(test_x), rtol=1e-4, atol=1e-3)
+            np.testing.assert_allclose(np.vstack(list(feature_contributions(model, test_x))), contributions)
+
+            importance_df, group_importance_df = evaluate_models.explain_model(model, shop_id, "shop_id",
+                                                                               chunk_size=150)
+
+            # The tables are the means of the contributions over all rows and over the rows of each shop
+            importance_df = importance_df.set_index("Feature")
+            np.testing.assert_allclose(importance_df.loc[test_x.columns, "Mean |Contribution|"],
+                                       np.abs(contributions[:, :3]).mean(axis=0))
+            self.assertEqual(importance_df.index[0], 'sales_sum_lag_1')
+
+            group_importance_df = group_importance_df.set_index(["shop_id", "Feature"])
+            for shop in [1, 4]:
+                np.testing.assert_allclose(group_importance_df.loc[shop].loc[test_x.columns, "Mean Contribution"],
+                                           contributions[shop_id == shop, :3].mean(axis=0))
+
+        # The lazy models of the registry are explained like the models they load
+        with tempfile.TemporaryDirectory() as registry_path:
+            model_registry = ModelRegistry(registry_path)
+            model_registry.save_model_list([[model, model_name]
+                                            for model, model_name in zip(models, ['RF', 'XGB', 'LGB'])])
+
+            for (lazy_model, _), model in zip(model_registry.load_model_list(['RF', 'XGB', 'LGB']), models):
+                np.testing.assert_allclose(np.vstack(list(feature_contributions(lazy_model, test_x))),
+                                           np.vstack(list(feature_contributions(model, test_x))), rtol=1e-5, atol=1e-6)
+
+        # The RF contribution of a feature is the value change of its splits along the path of the row
+        tree = models[0].estimators_[0].tree_
+        row = test_x.to_numpy(dtype=np.float32)[0]
+        expected, node = np.zeros(3), 0
+        while tree.children_left[node] != -1:
+            child = tree.children_left[node] if row[tree.feature[node]] <= tree.threshold[node] \
+                else tree.children_right[node]
+            expected[tree.feature[node]] += tree.value[child, 0, 0] - tree.value[node, 0, 0]
+            node = child
+
+        single_tree = RandomForestRegressor()
+        single_tree.estimators_ = models[0].estimators_[:1]
+        np.testing.assert_allclose(next(feature_contributions(single_tree, test_x))[0, :3], expected)
+
+        # The contributions follow the missing values of a forest trained with them
+        nan_x = test_x.copy()
+        nan_x.loc[rng.random(400) < 0.3, 'sales_sum_lag_1'] = np.nan
+        nan_model = RandomForestRegressor(n_estimators=5, random_state=0).fit(nan_x, test_df['target'])
+        nan_contributions = np.vstack(list(feature_contributions(nan_model, nan_x, chunk_size=150)))
+        np.testing.assert_allclose(nan_contributions.sum(axis=1), nan_model.predict(nan_x), rtol=1e-6, atol=1e-6)
+
+        # A model without a native contribution path is not explained
+        with self.assertRaises(ValueError):
+            next(feature_contributions(object(), test_x))
+
+        # Other sklearn ensembles with estimators_ are not explained as forests
+        for model in [GradientBoostingRegressor(n_estimators=5), BaggingRegressor(n_estimators=2)]:
+            model.fit(test_x, test_df['target'])
+            with self.assertRaises(ValueError):
+                next(feature_contributions(model, test_x))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+import os
+import sys
+import tempfile
+import zipfile
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from raw_data.get_files_from_kaggle import GettingDataFromKaggle
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestGettingDataFromKaggle(unittest.TestCase):
+
+    def test_extract_zip_files_to_columnar(self):
+        # Sample raw data
+        sales_train_df = pd.DataFrame({
+            'date': ['02.01.2013', '03.01.2013', '05.02.2013', '06.02.2013'],
+            'date_block_num': [0, 0, 1, 1],
+            'shop_id': [1, 2, 1, 59],
+            'item_id': [1, 2, 3, 4],
+            'item_price': [99.5, 150.0, 200.25, 10.0],
+            'item_cnt_day': [1.0, 2.0, -1.0, 1.0]
+        })
+        items_df = pd.DataFrame({
+            'item_name': ['Item1', 'Item2', 'Item3'],
+            'item_id': [1, 2, 3],
+            'item_category_id': [37, 40, 37]
+        })
+
+        with tempfile.TemporaryDirectory() as raw_data_path:
+            # A locally built archive, like the one downloaded from Kaggle
+            zip_file_path = raw_data_path + '/competitive-data-science-predict-future-sales.zip'
+            with zipfile.ZipFile(zip_file_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+                zip_ref.writestr('sales_train.csv', sales_train_df.to_csv(index=False))
+                zip_ref.writestr('items.csv', items_df.to_csv(index=False))
+
+            getting_data = GettingDataFromKaggle(target_directory=raw_data_path)
+            extracted = getting_data.extract_zip_files_to_columnar(n_jobs=2, chunk_size=3)
+            self.assertEqual(sorted(extracted), ['items.csv', 'sales_train.csv'])
+
+            # No csv file is written to disk
+            self.assertFalse([f for f in os.listdir(raw_data_path) if f.endswith('.csv')])
+
+            # getting_data reads the columnar files with the same result as the chunked ingest of the csv files
+            feature_data = CreateFeatureData(raw_data_path=raw_data_path)
+            feature_data.config = {'raw_data_format': 'columnar'}
+            result_df = feature_data.getting_data()
+
+            with tempfile.TemporaryDirectory() as csv_path:
+                sales_train_df.to_csv(csv_path + '/sales_train.csv', index=False)
+                items_df.to_csv(csv_path + '/items.csv', index=False)
+                expected_df = CreateFeatureData(raw_data_path=csv_path).getting_data_in_chunks(chunk_size=2)
+
+            pd.testing.assert_frame_equal(result_df, expected_df)
+            self.assertEqual(result_df['item_category_id_37'].tolist(), [1, 0, 1, 0])
+
+            # Unchanged members are skipped
+            self.assertEqual(getting_data.extract_zip_files_to_columnar(n_jobs=2), [])
+
+            # Only the changed member is extracted again
+            items_df['item_category_id'] = [40, 40, 40]
+            with zipfile.ZipFile(zip_file_path, 'w', compression=zipfile.ZIP_DEFLATED) as zip_ref:
+                zip_ref.writestr('sales_train.csv', sales_train_df.to_csv(index=False))
+                zip_ref.writestr('items.csv', items_df.to_csv(index=False))
+
+            self.assertEqual(getting_data.extract_zip_files_to_columnar(n_jobs=2), ['items.csv'])
+            self.assertEqual(feature_data.getting_data()['item_category_id_37'].tolist(), [0, 0, 0, 0])
+
+            # A member with the same name in another zip and folder gets its own file
+            with zipfile.ZipFile(raw_data_path + '/other.zip', 'w') as zip_ref:
+                zip_ref.writestr('backup/items.csv', items_df.to_csv(index=False))
+
+            self.assertEqual(getting_data.extract_zip_files_to_columnar(n_jobs=2), ['backup/items.csv'])
+            self.assertEqual(len(os.listdir(raw_data_path + '/columnar/other/backup')), 1)
+            self.assertEqual(len(os.listdir(raw_data_path + '/columnar/competitive-data-science-predict-future-sales')),
+                             2)
+
+            # The reader does not pick one of the two items files
+            with self.assertRaises(ValueError):
+                feature_data.getting_data()
+
+    def test_extract_zip_files_to_columnar_with_hostile_member(self):
+        with tempfile.TemporaryDirectory() as parent_path:
+            raw_data_path = parent_path + '/raw'
+            os.makedirs(raw_data_path)
+
+            # A member which leaves the columnar folder with '..'
+            with zipfile.ZipFile(raw_data_path + '/hostile.zip', 'w') as zip_ref:
+                zip_ref.writestr('items.csv', 'item_id\n1\n')
+                zip_ref.writestr('../../../escaped.csv', 'item_id\n1\n')
+
+            getting_data = GettingDataFromKaggle(target_directory=raw_data_path)
+            with self.assertRaises(ValueError):
+                getting_data.extract_zip_files_to_columnar(n_jobs=1)
+
+            # Nothing is written, neither outside nor inside the columnar folder
+            self.assertEqual(sorted(os.listdir(parent_path)), ['raw'])
+            self.assertEqual(os.listdir(raw_data_path + '/columnar'), [])
+
+            # An absolute member path is rejected as well
+            with zipfile.ZipFile(raw_data_path + '/hostile.zip', 'w') as zip_ref:
+                zip_ref.writestr('/tmp/escaped.csv', 'item_id\n1\n')
+
+            with self.assertRaises(ValueError):
+                getting_data.extract_zip_files_to_columnar(n_jobs=1)
+
+if __name__ == '__main__':
+    unittest.main()
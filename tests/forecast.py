@@ -0,0 +1,64 @@
+import unittest
+import json
+import os
+import sys
+import threading
+import urllib.request
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from forecast_service.forecast_service import ForecastService
+
+class TestForecastService(unittest.TestCase):
+
+    def test_forecast(self):
+        # Sample next month features and a model trained on the same columns
+        feature_columns = ['sales_sum_lag_1', 'month_sin', 'month_cos']
+        next_month_features = pd.DataFrame({
+            'date_block_num': [34, 34, 34],
+            'shop_id': [5, 2, 9],
+            'sales_sum_lag_1': [10.0, 20.0, 30.0],
+            'month_sin': [0.5, 0.5, 0.5],
+            'month_cos': [0.8, 0.8, 0.8]
+        })
+
+        random_state = np.random.RandomState(0)
+        train_x = pd.DataFrame(random_state.rand(100, 3) * [40, 1, 1], columns=feature_columns)
+        model = RandomForestRegressor(n_estimators=10, random_state=42).fit(train_x, train_x['sales_sum_lag_1'] * 2)
+        expected = dict(zip([5, 2, 9], model.predict(next_month_features[feature_columns])))
+
+        service = ForecastService(model, next_month_features, feature_columns)
+
+        # Single and batched requests in process
+        self.assertAlmostEqual(service.forecast([2])[2], expected[2])
+        forecasts = service.forecast([9, 5])
+        self.assertAlmostEqual(forecasts[9], expected[9])
+        self.assertAlmostEqual(forecasts[5], expected[5])
+        with self.assertRaises(KeyError):
+            service.forecast([3])
+
+        # Requests of a local server are batched together
+        server = service.create_server(port=0)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        try:
+            url = f'http://127.0.0.1:{server.server_port}/forecast'
+            with urllib.request.urlopen(url + '?shop_id=5&shop_id=2') as response:
+                content = json.loads(response.read())
+
+            request = urllib.request.Request(url, data=json.dumps({"shop_ids": [9]}).encode(), method='POST')
+            with urllib.request.urlopen(request) as response:
+                post_content = json.loads(response.read())
+        finally:
+            server.shutdown()
+            service.stop()
+
+        self.assertEqual(content['date_block_num'], 34)
+        self.assertAlmostEqual(content['forecasts']['5'], expected[5])
+        self.assertAlmostEqual(content['forecasts']['2'], expected[2])
+        self.assertAlmostEqual(post_content['forecasts']['9'], expected[9])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+import numpy as np
+import pandas as pd
+import os
+import sys
+from sklearn.linear_model import LinearRegression
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+from forecast_service.recursive_forecaster import RecursiveForecaster
+
+class CountingModel:
+    """Predicts sales_sum_lag_1 + 1 and counts the model calls."""
+
+    def __init__(self):
+        self.n_calls = 0
+
+    def predict(self, features):
+        self.n_calls += 1
+        return features[:, 0] + 1
+
+class TestRecursiveForecaster(unittest.TestCase):
+
+    def test_forecast_horizons(self):
+        # Sample monthly data of 3 shops for 14 months, shop 3 has no sale in the last month
+        rng = np.random.default_rng(0)
+        rows = [(block, block % 12 + 1, shop) for block in range(14) for shop in [1, 2, 3] if (block, shop) != (13, 3)]
+        input_df = pd.DataFrame(rows, columns=['date_block_num', 'month', 'shop_id'])
+        input_df['sales_item_price_mean'] = rng.uniform(100, 500, len(input_df))
+        input_df['sales_sum'] = rng.uniform(10, 50, len(input_df))
+        input_df['item_category_id_37_ratio'] = rng.uniform(0, 1, len(input_df))
+
+        feature_data = CreateFeatureData()
+        feature_data.config = {'lag_features_list': [1, 3, 12]}
+
+        monthly_tensor = feature_data._create_monthly_tensor(input_df)
+        incremental_state = {'date_block_num': monthly_tensor['date_block_num'][-12:],
+                             'month': monthly_tensor['month'][-12:],
+                             'shop_id': monthly_tensor['shop_id'],
+                             'feature_columns': np.array(monthly_tensor['feature_columns']),
+                             'tensor': monthly_tensor['tensor'][:, -12:]}
+
+        feature_columns = ['sales_sum_lag_1', 'sales_sum_lag_3', 'sales_sum_lag_12', 'sales_item_price_mean_lag_1',
+                           'sales_item_price_mean_lag_3', 'sales_item_price_mean_lag_12', 'month_sin', 'month_cos']
+
+        # A fitted model on random features
+        model = LinearRegression().fit(rng.uniform(0, 500, (50, len(feature_columns))), rng.uniform(0, 50, 50))
+        forecaster = RecursiveForecaster(model, incremental_state, feature_columns)
+        result_df = forecaster.forecast_horizons(3)
+
+        self.assertEqual(result_df['shop_id'].tolist(), [1, 1, 1, 2, 2, 2, 3, 3, 3])
+        self.assertEqual(result_df['date_block_num'].tolist(), [14, 15, 16] * 3)
+        self.assertEqual(result_df['month'].tolist(), [3, 4, 5] * 3)
+
+        # Each horizon matches the next month features of the history extended with the previous forecasts,
+        # where the forecast is the sales_sum and the other values are carried forward from the last month
+        history_df = input_df
+        for horizon in [1, 2, 3]:
+            next_month_df = feature_data.create_next_month_features(history_df)
+            expected = model.predict(next_month_df[feature_columns].to_numpy())
+            forecast = result_df.loc[result_df['horizon'] == horizon, 'forecast'].to_numpy()
+            np.testing.assert_allclose(forecast, expected, rtol=1e-5)
+
+            last_block = history_df['date_block_num'].max()
+            last_month_df = history_df[history_df['date_block_num'] == last_block].set_index('shop_id')
+            new_month_df = pd.DataFrame({'date_block_num': last_block + 1,
+                                         'month': (last_block + 1) % 12 + 1,
+                                         'shop_id': next_month_df['shop_id'].to_numpy()})
+            for col_name in ['sales_item_price_mean', 'item_category_id_37_ratio']:
+                new_month_df[col_name] = last_month_df[col_name].reindex(new_month_df['shop_id']).fillna(0).to_numpy()
+            new_month_df['sales_sum'] = forecast
+            history_df = pd.concat([history_df, new_month_df], ignore_index=True)
+
+        # One model call for each horizon, and the forecasts are shifted into the lag 1 slot
+        counting_model = CountingModel()
+        result_df = RecursiveForecaster(counting_model, incremental_state, feature_columns).forecast_horizons(6)
+        self.assertEqual(counting_model.n_calls, 6)
+
+        last_sales = monthly_tensor['tensor'][:, -1, monthly_tensor['feature_columns'].index('sales_sum')]
+        np.testing.assert_allclose(result_df['forecast'].to_numpy().reshape(3, 6),
+                                   last_sales[:, None] + np.arange(1, 7), rtol=1e-5)
+
+        # A feature which is not a lag of the monthly values can not be forecasted
+        with self.assertRaises(ValueError):
+            RecursiveForecaster(model, incremental_state, feature_columns + ['shop_id'])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_getting_data_in_chunks(self):
+        with tempfile.TemporaryDirectory() as raw_data_path:
+            # Sample raw data, item 9 does not exist in items.csv
+            pd.DataFrame({
+                'date': ['02.01.2013', '03.01.2013', '05.02.2013', '06.02.2013', '07.03.2013'],
+                'date_block_num': [0, 0, 1, 1, 2],
+                'shop_id': [1, 2, 1, 59, 2],
+                'item_id': [1, 2, 3, 9, 1],
+                'item_price': [99.5, 150.0, 200.25, 250.0, 99.5],
+                'item_cnt_day': [1.0, 2.0, -1.0, 4.0, 1.0]
+            }).to_csv(raw_data_path + '/sales_train.csv', index=False)
+
+            pd.DataFrame({
+                'item_name': ['Item1', 'Item2', 'Item3'],
+                'item_id': [1, 2, 3],
+                'item_category_id': [37, 40, 37]
+            }).to_csv(raw_data_path + '/items.csv', index=False)
+
+            # Instantiate the class
+            feature_data = CreateFeatureData(raw_data_path=raw_data_path)
+
+            # Call both methods, chunk size is smaller than the data to read it in several chunks
+            expected_df = feature_data.getting_data()
+            result_df = feature_data.getting_data_in_chunks(chunk_size=2)
+
+        # Compact dtypes are used in streaming mode
+        self.assertEqual(result_df['shop_id'].dtype, 'int16')
+        self.assertEqual(result_df['item_id'].dtype, 'int16')
+        self.assertEqual(result_df['item_price'].dtype, 'float32')
+        self.assertEqual(result_df['item_cnt_day'].dtype, 'float32')
+
+        # Assert that the values match the ones from getting_data
+        pd.testing.assert_frame_equal(result_df, expected_df, check_dtype=False)
+
+if __name__ == '__main__':
+    unittest.main()
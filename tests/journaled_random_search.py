@@ -0,0 +1,69 @@
+import unittest
+from unittest.mock import patch, mock_open
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel
+from modelling.trial_journal import TrialJournal
+
+class TestTrainModel(unittest.TestCase):
+
+    def test_journaled_random_search(self):
+        # Sample training data of 120 rows
+        rng = np.random.default_rng(0)
+        train_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 120),
+                                 'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 120) / 12),
+                                 'month_cos': np.cos(2 * np.pi * rng.integers(0, 12, 120) / 12)})
+        train_df['target'] = train_df['sales_sum_lag_1'] * 2 + 10 + rng.normal(0, 5, 120)
+
+        with tempfile.TemporaryDirectory() as journal_dir:
+            journal_path = journal_dir + '/journal.jsonl'
+            config = {
+                'cross_validation_fold_size': 2,
+                'random_search_iter_size': 3,
+                'trial_journal_path': journal_path,
+                'shared_training_matrix': True,
+                'xgb_param_dist': {'n_estimators': [5, 10], 'max_depth': [2, 3]},
+                'lgb_param_dist': {'n_estimators': [5, 10], 'num_leaves': [4, 8]},
+                'rf_param_dist': {'n_estimators': [5, 10], 'max_depth': [2, 3]}
+            }
+
+            def run_search():
+                # Instantiate the class without reading the config file
+                with patch('builtins.open', mock_open(read_data='{}')):
+                    train_model = TrainModel(train_df)
+                train_model.config = config
+
+                # The trial journal takes precedence over the shared training matrix
+                with patch.object(TrainModel, '_create_shared_training_matrix') as create_shared_training_matrix, \
+                        patch.object(TrialJournal, 'add_trial', autospec=True,
+                                     side_effect=TrialJournal.add_trial) as add_trial:
+                    model_best_param_list, _, _ = train_model.random_search_hyper_parameter_tuning()
+                create_shared_training_matrix.assert_not_called()
+
+                return [best_params for best_params, _, _ in model_best_param_list], add_trial.call_count
+
+            # 3 models with 3 candidates of 2 folds are 18 trials
+            best_params, n_new_trials = run_search()
+            self.assertEqual(n_new_trials, 18)
+
+            # A search killed after 10 trials only evaluates the other 8 trials after the restart
+            with open(journal_path, 'r') as f:
+                journal_lines = f.readlines()
+            with open(journal_path, 'w') as f:
+                f.writelines(journal_lines[:10])
+
+            restarted_best_params, n_new_trials = run_search()
+            self.assertEqual(n_new_trials, 8)
+            self.assertEqual(restarted_best_params, best_params)
+
+            # A completed search does not evaluate any trial again
+            self.assertEqual(run_search(), (best_params, 0))
+
+if __name__ == '__main__':
+    unittest.main()
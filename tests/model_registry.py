@@ -0,0 +1,51 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import lightgbm as lgb
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.model_registry import ModelRegistry, LazyModel
+
+class TestModelRegistry(unittest.TestCase):
+
+    def test_model_registry(self):
+        # Sample training data
+        random_state = np.random.RandomState(0)
+        train_x = pd.DataFrame(random_state.rand(200, 3), columns=['lag_1', 'month_sin', 'month_cos'])
+        train_y = train_x['lag_1'] * 10 + random_state.rand(200)
+
+        model_list = [
+            [xgb.XGBRegressor(n_estimators=10).fit(train_x, train_y), "XGB"],
+            [lgb.LGBMRegressor(n_estimators=10, min_child_samples=5, verbose=-1).fit(train_x, train_y), "LGB"],
+            [RandomForestRegressor(n_estimators=10, random_state=42).fit(train_x, train_y), "RF"]
+        ]
+
+        with tempfile.TemporaryDirectory() as registry_path:
+            model_registry = ModelRegistry(registry_path)
+            model_registry.save_model_list(model_list, data_fingerprint='abc')
+            model_registry.update_metrics("RF", {"test_mape": 12.5})
+
+            loaded_model_list = model_registry.load_model_list()
+            self.assertEqual([model_name for _, model_name in loaded_model_list], ["LGB", "RF", "XGB"])
+
+            for (model, model_name), (loaded_model, _) in zip(sorted(model_list, key=lambda pair: pair[1]),
+                                                              loaded_model_list):
+                # Models are not loaded until they are used
+                self.assertIsInstance(loaded_model, LazyModel)
+                self.assertIsNone(loaded_model._model)
+                self.assertEqual(loaded_model.metadata["data_fingerprint"], 'abc')
+
+                # Assert that the loaded models predict the same values
+                np.testing.assert_allclose(loaded_model.predict(train_x), model.predict(train_x), rtol=1e-6)
+                np.testing.assert_allclose(loaded_model.feature_importances_, model.feature_importances_)
+
+            self.assertEqual(model_registry.read_metadata("RF")["metrics"], {"test_mape": 12.5})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.packed_forest import PackedForest
+from modelling.model_registry import ModelRegistry
+
+class TestPackedForest(unittest.TestCase):
+
+    def test_packed_forest(self):
+        # Sample training data with missing values
+        random_state = np.random.RandomState(0)
+        train_x = pd.DataFrame(random_state.rand(300, 3), columns=['lag_1', 'month_sin', 'month_cos'])
+        train_y = np.sin(train_x['lag_1'] * 9) + train_x['month_cos']
+        train_x.loc[::10, 'month_sin'] = np.nan
+
+        test_x = pd.DataFrame(random_state.rand(50, 3), columns=['lag_1', 'month_sin', 'month_cos'])
+        test_x.loc[::5, 'month_sin'] = np.nan
+
+        model = RandomForestRegressor(n_estimators=20, random_state=42).fit(train_x, train_y)
+        expected_predictions = model.predict(test_x)
+
+        # Batch size is smaller than the data to predict it in several batches
+        packed_forest = PackedForest.from_model(model, batch_size=16)
+        np.testing.assert_allclose(packed_forest.predict(test_x), expected_predictions, rtol=1e-6)
+
+        # Columns of a DataFrame are ordered by the feature names of the model
+        np.testing.assert_allclose(packed_forest.predict(test_x[['month_cos', 'lag_1', 'month_sin']]),
+                                   expected_predictions, rtol=1e-6)
+
+        # The packed forest can be loaded from the model registry as well
+        with tempfile.TemporaryDirectory() as registry_path:
+            model_registry = ModelRegistry(registry_path)
+            model_registry.save_model(model, "RF")
+            np.testing.assert_allclose(model_registry.load_packed_forest("RF").predict(test_x),
+                                       expected_predictions, rtol=1e-6)
+
+        self.assertLess(packed_forest.nbytes, sum(estimator.tree_.__getstate__()["nodes"].nbytes
+                                                  for estimator in model.estimators_))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,55 @@
+import unittest
+from unittest.mock import patch
+import os
+import sys
+import tempfile
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from feature_data.create_feature_data import CreateFeatureData
+
+class TestCreateFeatureData(unittest.TestCase):
+
+    def test_raw_data_cache(self):
+        with tempfile.TemporaryDirectory() as raw_data_path:
+            # Sample raw data
+            pd.DataFrame({
+                'date': ['02.01.2013', '03.01.2013', '05.02.2013'],
+                'date_block_num': [0, 0, 1],
+                'shop_id': [1, 2, 1],
+                'item_id': [1, 2, 3],
+                'item_price': [99.5, 150.0, 200.25],
+                'item_cnt_day': [1.0, 2.0, -1.0]
+            }).to_csv(raw_data_path + '/sales_train.csv', index=False)
+
+            items_df = pd.DataFrame({
+                'item_name': ['Item1', 'Item2', 'Item3'],
+                'item_id': [1, 2, 3],
+                'item_category_id': [37, 40, 37]
+            })
+            items_df.to_csv(raw_data_path + '/items.csv', index=False)
+
+            # Instantiate the class and enable the cache
+            feature_data = CreateFeatureData(raw_data_path=raw_data_path)
+            feature_data.config = {'raw_data_cache': True}
+
+            # The first call parses the CSV files and fills the cache
+            expected_df = feature_data.getting_data()
+
+            # The second call must not parse the CSV files again
+            with patch('feature_data.create_feature_data.pd.read_csv') as mock_read_csv:
+                result_df = feature_data.getting_data()
+                mock_read_csv.assert_not_called()
+
+            pd.testing.assert_frame_equal(result_df, expected_df)
+
+            # Changing a raw file invalidates the cache
+            items_df['item_category_id'] = [40, 40, 400]
+            items_df.to_csv(raw_data_path + '/items.csv', index=False)
+
+            result_df = feature_data.getting_data()
+            self.assertEqual(result_df['item_category_id_37'].tolist(), [0, 0, 0])
+
+if __name__ == '__main__':
+    unittest.main()
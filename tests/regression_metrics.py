@@ -0,0 +1,48 @@
+import unittest
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.metrics import mean_absolute_error, mean_squared_error
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from utility_functions.regression_metrics import regression_metrics, create_group_index, grouped_regression_metrics
+from utility_functions.mean_absolute_percentage_error import mean_absolute_percentage_error
+
+class TestRegressionMetrics(unittest.TestCase):
+
+    def test_regression_metrics(self):
+        # Sample predictions with zero targets
+        y_true = np.array([10.0, 0.0, 5.0, -4.0, 8.0, 0.0])
+        y_pred = np.array([12.0, 1.0, 4.0, -5.0, 8.0, 2.0])
+        shop_id = np.array([3, 3, 1, 1, 7, 7])
+
+        metrics = regression_metrics(y_true, y_pred)
+
+        # Assert that the metrics match the separate metric functions
+        self.assertAlmostEqual(metrics["mape"], mean_absolute_percentage_error(y_true, y_pred))
+        self.assertAlmostEqual(metrics["mae"], mean_absolute_error(y_true, y_pred))
+        self.assertAlmostEqual(metrics["rmse"], np.sqrt(mean_squared_error(y_true, y_pred)))
+        self.assertAlmostEqual(metrics["bias"], np.mean(y_pred - y_true))
+
+        group_labels, group_index = create_group_index(shop_id)
+        grouped_metrics = grouped_regression_metrics(y_true, y_pred, group_index, len(group_labels))
+
+        self.assertEqual(group_labels.tolist(), [1, 3, 7])
+        self.assertEqual(grouped_metrics["count"].tolist(), [2, 2, 2])
+
+        # Assert that the metrics of each group match the metrics of its rows
+        for position, shop in enumerate(group_labels):
+            shop_metrics = regression_metrics(y_true[shop_id == shop], y_pred[shop_id == shop])
+            for metric_name in ["mape", "mae", "rmse", "bias"]:
+                self.assertAlmostEqual(grouped_metrics[metric_name][position], shop_metrics[metric_name])
+
+        # Only zero targets in a group give NaN MAPE
+        grouped_metrics = grouped_regression_metrics(pd.Series([0.0, 0.0, 2.0]), [1.0, 2.0, 3.0],
+                                                     np.array([0, 0, 1]), 2)
+        self.assertTrue(np.isnan(grouped_metrics["mape"][0]))
+        self.assertAlmostEqual(grouped_metrics["mape"][1], 50.0)
+
+if __name__ == '__main__':
+    unittest.main()
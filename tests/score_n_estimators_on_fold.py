@@ -0,0 +1,56 @@
+import unittest
+from unittest.mock import patch, mock_open
+import os
+import sys
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import lightgbm as lgb
+from sklearn.base import clone
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.model_selection import KFold
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel
+from utility_functions.mean_absolute_percentage_error import mean_absolute_percentage_error
+
+class TestTrainModel(unittest.TestCase):
+
+    def test_score_n_estimators_on_fold(self):
+        # Sample training data of 150 rows
+        rng = np.random.default_rng(0)
+        train_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 150),
+                                 'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 150) / 12)})
+        train_df['target'] = train_df['sales_sum_lag_1'] * 2 + 10 + rng.normal(0, 5, 150)
+
+        # Instantiate the class without reading the config file
+        with patch('builtins.open', mock_open(read_data='{}')):
+            train_model = TrainModel(train_df)
+        train_model.config = {'cross_validation_fold_size': 3}
+
+        fit_index, valid_index = next(KFold(n_splits=3).split(train_model.train_x))
+        fit_x, valid_x = train_model.train_x.iloc[fit_index], train_model.train_x.iloc[valid_index]
+        train_y = train_df['target'].to_numpy()
+        n_estimators_values = [3, 7, 12]
+
+        models = [(RandomForestRegressor(random_state=42), {'max_depth': 4, 'max_features': 1.0}),
+                  (xgb.XGBRegressor(random_state=42), {'max_depth': 3, 'learning_rate': 0.3}),
+                  (lgb.LGBMRegressor(verbose=-1, random_state=42), {'num_leaves': 8, 'learning_rate': 0.3})]
+
+        for model, params in models:
+            fold_scores = train_model._score_n_estimators_on_fold(model, params, n_estimators_values, 0,
+                                                                  fit_index, valid_index)
+
+            # The warm started or staged scores are the scores of an independent fit of each n_estimators value
+            expected_scores = []
+            for n_estimators in n_estimators_values:
+                independent_model = clone(model).set_params(**params, n_estimators=n_estimators)
+                independent_model.fit(fit_x, train_y[fit_index])
+                expected_scores.append(mean_absolute_percentage_error(train_y[valid_index],
+                                                                      independent_model.predict(valid_x)))
+
+            np.testing.assert_allclose(fold_scores, expected_scores, rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,49 @@
+import unittest
+from unittest.mock import patch, mock_open
+import os
+import sys
+import numpy as np
+import pandas as pd
+import xgboost as xgb
+import lightgbm as lgb
+from sklearn.model_selection import KFold
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel
+
+class TestTrainModel(unittest.TestCase):
+
+    def test_score_samples_on_native_fold(self):
+        # Sample training data of 150 rows
+        rng = np.random.default_rng(0)
+        train_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 150),
+                                 'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 150) / 12)})
+        train_df['target'] = train_df['sales_sum_lag_1'] * 2 + 10 + rng.normal(0, 5, 150)
+
+        # Instantiate the class without reading the config file
+        with patch('builtins.open', mock_open(read_data='{}')):
+            train_model = TrainModel(train_df)
+        train_model.config = {'cross_validation_fold_size': 3}
+
+        fit_index, valid_index = next(KFold(n_splits=3).split(train_model.train_x))
+        n_estimators_values = [3, 7, 12]
+
+        models = [(xgb.XGBRegressor(random_state=42), [{'max_depth': 3, 'learning_rate': 0.3},
+                                                       {'max_depth': 5, 'subsample': 0.8}]),
+                  (lgb.LGBMRegressor(verbose=-1, random_state=42), [{'num_leaves': 8, 'learning_rate': 0.3},
+                                                                    {'num_leaves': 4, 'min_child_samples': 5}])]
+
+        for model, shared_params_list in models:
+            native_scores = train_model._score_samples_on_native_fold(model, shared_params_list, n_estimators_values,
+                                                                      0, fit_index, valid_index)
+
+            # The native datasets give the scores of the sklearn wrapper of the model
+            wrapper_scores = [train_model._score_n_estimators_on_fold(model, shared_params, n_estimators_values, 0,
+                                                                      fit_index, valid_index)
+                              for shared_params in shared_params_list]
+
+            np.testing.assert_allclose(native_scores, wrapper_scores, rtol=1e-6)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import unittest
+from unittest.mock import patch, mock_open
+import contextlib
+import io
+import os
+import re
+import sys
+import tempfile
+import numpy as np
+import pandas as pd
+from joblib import Parallel, delayed
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel, _shared_matrix_random_search
+
+class TestTrainModel(unittest.TestCase):
+
+    def test_shared_matrix_random_search(self):
+        # Sample training data of 120 rows
+        rng = np.random.default_rng(0)
+        train_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 120),
+                                 'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 120) / 12),
+                                 'month_cos': np.cos(2 * np.pi * rng.integers(0, 12, 120) / 12)})
+        train_df['target'] = train_df['sales_sum_lag_1'] * 2 + 10 + rng.normal(0, 5, 120)
+
+        # Instantiate the class without reading the config file
+        with patch('builtins.open', mock_open(read_data='{}')):
+            train_model = TrainModel(train_df)
+
+        train_model.config = {
+            'cross_validation_fold_size': 2,
+            'random_search_iter_size': 2,
+            'xgb_param_dist': {'n_estimators': [5, 10], 'max_depth': [2, 3]},
+            'lgb_param_dist': {'n_estimators': [5, 10], 'num_leaves': [4, 8]},
+            'rf_param_dist': {'n_estimators': [5, 10], 'max_depth': [2, 3]}
+        }
+
+        with tempfile.TemporaryDirectory() as matrix_dir:
+            train_x, _ = train_model._create_shared_training_matrix(matrix_dir)
+
+            # A worker process gets the matrix as an np.memmap of the same file, not as a pickled copy
+            worker_type, worker_filename, worker_pid = Parallel(n_jobs=2, backend='loky')(
+                [delayed(type)(train_x), delayed(getattr)(train_x, 'filename'), delayed(os.getpid)()])
+            self.assertIs(worker_type, np.memmap)
+            self.assertEqual(worker_filename, train_x.filename)
+            self.assertNotEqual(worker_pid, os.getpid())
+            del train_x
+
+            # The cross-validation fits run in worker processes
+            output = io.StringIO()
+            with contextlib.redirect_stdout(output):
+                best_params, _ = _shared_matrix_random_search(
+                    matrix_dir, RandomForestRegressor(random_state=42), train_model.config['rf_param_dist'], 'RF',
+                    train_model.config, search_n_jobs=2)
+
+            worker_pids = {int(pid) for pid in re.findall(r'search worker (\d+)', output.getvalue())}
+            self.assertTrue(worker_pids)
+            self.assertNotIn(os.getpid(), worker_pids)
+            self.assertIn(best_params['max_depth'], [2, 3])
+
+        # The sequential and concurrent searches on the shared matrix find the same parameters
+        train_model.config.update({'shared_training_matrix': True, 'search_core_budget': 4})
+        sequential_results, _, _ = train_model.random_search_hyper_parameter_tuning()
+
+        train_model.config['search_scheduler'] = 'concurrent'
+        concurrent_results, _, _ = train_model.random_search_hyper_parameter_tuning()
+
+        self.assertEqual([best_params for best_params, _, _ in concurrent_results],
+                         [best_params for best_params, _, _ in sequential_results])
+        self.assertIsNone(train_model.shared_matrix_dir)
+
+if __name__ == '__main__':
+    unittest.main()
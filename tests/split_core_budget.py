@@ -0,0 +1,66 @@
+import unittest
+from unittest.mock import patch, mock_open
+import os
+import sys
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel
+
+class TestTrainModel(unittest.TestCase):
+
+    def setUp(self):
+        # Sample training data of 120 rows
+        rng = np.random.default_rng(0)
+        train_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 120),
+                                 'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 120) / 12),
+                                 'month_cos': np.cos(2 * np.pi * rng.integers(0, 12, 120) / 12)})
+        train_df['target'] = train_df['sales_sum_lag_1'] * 2 + 10 + rng.normal(0, 5, 120)
+
+        # Instantiate the class without reading the config file
+        with patch('builtins.open', mock_open(read_data='{}')):
+            self.train_model = TrainModel(train_df)
+
+        self.train_model.config = {
+            'cross_validation_fold_size': 3,
+            'random_search_iter_size': 4,
+            'search_mode': 'shared_n_estimators',
+            'xgb_param_dist': {'n_estimators': [5, 10], 'max_depth': [2, 3]},
+            'lgb_param_dist': {'n_estimators': [5, 10], 'num_leaves': [4, 8]},
+            'rf_param_dist': {'n_estimators': [5, 10], 'max_depth': [2, 3]}
+        }
+        self.model_list = self.train_model._create_model_list()
+
+    def test_split_core_budget(self):
+        # Each model gets an equal share, boosting models use at most one fit per fold and the rest as threads
+        self.train_model.config['search_core_budget'] = 20
+        self.assertEqual(self.train_model._split_core_budget(self.model_list), [(3, 2), (3, 2), (8, 1)])
+
+        # A share smaller than the fold count is used by fits only
+        self.train_model.config['search_core_budget'] = 6
+        self.assertEqual(self.train_model._split_core_budget(self.model_list), [(2, 1), (2, 1), (2, 1)])
+
+        # Each model gets at least one core, even if the budget is smaller than the number of models
+        self.train_model.config['search_core_budget'] = 2
+        self.assertEqual(self.train_model._split_core_budget(self.model_list), [(1, 1), (1, 1), (1, 1)])
+
+        # A null budget is the number of CPUs
+        self.train_model.config['search_core_budget'] = None
+        with patch('os.cpu_count', return_value=8):
+            self.assertEqual(self.train_model._split_core_budget(self.model_list), [(2, 1), (2, 1), (4, 1)])
+
+    def test_concurrent_search(self):
+        # The concurrent searches find the same parameters as the sequential searches
+        sequential_results, _, _ = self.train_model.random_search_hyper_parameter_tuning()
+
+        self.train_model.config.update({'search_scheduler': 'concurrent', 'search_core_budget': 3})
+        concurrent_results, _, _ = self.train_model.random_search_hyper_parameter_tuning()
+
+        self.assertEqual([model_name for _, _, model_name in concurrent_results], ['XGB', 'LGB', 'RF'])
+        self.assertEqual([best_params for best_params, _, _ in concurrent_results],
+                         [best_params for best_params, _, _ in sequential_results])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import os
+import tempfile
+import sys
+import numpy as np
+import pandas as pd
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from exploratory_data_analysis.streaming_analyze_data import StreamingAnalyzeData, QuantileSketch
+
+class TestStreamingAnalyzeData(unittest.TestCase):
+
+    def test_streaming_analyze_data(self):
+        # Sample daily sales data with missing prices
+        rng = np.random.default_rng(0)
+        df = pd.DataFrame({
+            'date': ['01.01.2013'] * 50000,
+            'shop_id': rng.integers(0, 60, 50000),
+            'item_price': rng.lognormal(5, 1, 50000),
+            'item_cnt_day': rng.poisson(2, 50000).astype(float)
+        })
+        df.loc[rng.choice(50000, 500, replace=False), 'item_price'] = np.nan
+
+        # Analyze the data in uneven chunks, and in two merged parts
+        analyze_data = StreamingAnalyzeData(sample_size=5000, sketch_size=512)
+        for start in range(0, 50000, 7000):
+            analyze_data.update(df.iloc[start:start + 7000])
+
+        first_part, second_part = StreamingAnalyzeData(sample_size=5000, sketch_size=512), StreamingAnalyzeData(
+            sample_size=5000, sketch_size=512, random_state=1)
+        first_part.update(df.iloc[:20000])
+        second_part.update(df.iloc[20000:])
+        first_part.merge(second_part)
+
+        # A csv file is read chunk by chunk
+        with tempfile.TemporaryDirectory() as temp_dir:
+            df.to_csv(temp_dir + '/sales_train.csv', index=False)
+            csv_analysis = StreamingAnalyzeData.from_csv(temp_dir + '/sales_train.csv', chunk_size=9000,
+                                                         sample_size=5000, sketch_size=512)
+
+        expected = df.describe().T
+        for analysis in [analyze_data, first_part, csv_analysis]:
+            statistics = analysis.get_statistics()
+
+            # Moments, min, max and missing values are exact
+            self.assertEqual(analysis.n_rows, 50000)
+            self.assertEqual(analysis.null_counts.to_dict(),
+                             {'date': 0, 'shop_id': 0, 'item_price': 500, 'item_cnt_day': 0})
+            for column_name in ['count', 'mean', 'std', 'min', 'max']:
+                np.testing.assert_allclose(statistics[column_name], expected[column_name], rtol=1e-9)
+
+            # Quantiles are estimates within a small rank error
+            for column_name in ['shop_id', 'item_price']:
+                values = df[column_name].dropna().to_numpy()
+                for q, quantile_name in [(0.25, '25%'), (0.5, '50%'), (0.75, '75%')]:
+                    rank = np.mean(values <= statistics.loc[column_name, quantile_name])
+                    self.assertLess(abs(rank - q), 0.02)
+
+            # The correlation is calculated on a sample of the numeric rows
+            self.assertEqual(list(analysis.df.columns), ['shop_id', 'item_price', 'item_cnt_day'])
+            self.assertEqual(len(analysis.df), 5000)
+
+            # The default csv float parser does not round trip every price
+            if analysis is not csv_analysis:
+                self.assertEqual(len(analysis.df.merge(df.drop(columns=['date']).drop_duplicates())), 5000)
+
+        # The reservoir sample is uniform over the chunks
+        self.assertAlmostEqual(analyze_data.df['shop_id'].mean(), df['shop_id'].mean(), delta=1.0)
+
+        # Merged sketches give the same quantiles as a single sketch within the rank error
+        values = rng.normal(0, 1, 100000)
+        sketch, first_sketch, second_sketch = QuantileSketch(256), QuantileSketch(256), QuantileSketch(256)
+        sketch.update(values)
+        first_sketch.update(values[:30000])
+        second_sketch.update(values[30000:])
+        first_sketch.merge(second_sketch)
+        for quantile_sketch in [sketch, first_sketch]:
+            self.assertEqual(sum(len(level) * 2 ** i for i, level in enumerate(quantile_sketch.levels)), 100000)
+            ranks = [np.mean(values <= value) for value in quantile_sketch.quantile([0.01, 0.5, 0.99])]
+            np.testing.assert_allclose(ranks, [0.01, 0.5, 0.99], atol=0.02)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,57 @@
+import unittest
+from unittest.mock import patch, mock_open
+import os
+import sys
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.train_models import TrainModel
+
+class TestTrainModel(unittest.TestCase):
+
+    def test_successive_halving_search(self):
+        # Sample training data of 200 rows
+        rng = np.random.default_rng(0)
+        train_df = pd.DataFrame({'sales_sum_lag_1': rng.uniform(0, 100, 200),
+                                 'month_sin': np.sin(2 * np.pi * rng.integers(0, 12, 200) / 12)})
+        train_df['target'] = train_df['sales_sum_lag_1'] * 2 + 10 + rng.normal(0, 5, 200)
+
+        # Instantiate the class without reading the config file
+        with patch('builtins.open', mock_open(read_data='{}')):
+            train_model = TrainModel(train_df)
+
+        model = RandomForestRegressor(n_estimators=5, random_state=42)
+        param_space = {'max_depth': [1, 2, 3, 4, 5], 'min_samples_leaf': [1, 5], 'n_estimators': [5, 20]}
+
+        for halving_resource, full_resource in [('n_samples', 200), ('n_estimators', 20)]:
+            # 10 candidates with a factor of 3 are evaluated in 3 rungs
+            train_model.config = {'cross_validation_fold_size': 3, 'random_search_iter_size': 10,
+                                  'halving_factor': 3, 'halving_resource': halving_resource}
+
+            # The scores of each call are recorded with its resource
+            calls = []
+            cross_validate_mape = train_model._cross_validate_mape
+
+            def recording_cross_validate_mape(model, params, n_rows=None):
+                score = cross_validate_mape(model, params, n_rows)
+                resource = n_rows if halving_resource == 'n_samples' else params['n_estimators']
+                calls.append((resource, params, score))
+                return score
+
+            with patch.object(train_model, '_cross_validate_mape', side_effect=recording_cross_validate_mape):
+                best_params = train_model._successive_halving_search(model, param_space)
+
+            # The last rung is evaluated with the full resource, and its best candidate is returned
+            self.assertEqual(len({resource for resource, _, _ in calls}), 3)
+            self.assertEqual(calls[-1][0], full_resource)
+            last_rung = [(params, score) for resource, params, score in calls if resource == full_resource]
+            self.assertEqual(best_params, min(last_rung, key=lambda call: call[1])[0])
+
+            if halving_resource == 'n_estimators':
+                self.assertEqual(best_params['n_estimators'], 20)
+
+if __name__ == '__main__':
+    unittest.main()
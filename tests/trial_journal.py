@@ -0,0 +1,38 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Add the parent directory to the system path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '../')))
+from modelling.trial_journal import TrialJournal
+
+class TestTrialJournal(unittest.TestCase):
+
+    def test_trial_journal(self):
+        with tempfile.TemporaryDirectory() as journal_dir:
+            journal_path = journal_dir + '/journal.jsonl'
+
+            # Sample trials
+            trial = {"model": "XGBRegressor", "params": {"max_depth": 3, "learning_rate": 0.1}, "fold": 0}
+            reordered_trial = {"fold": 0, "params": {"learning_rate": 0.1, "max_depth": 3}, "model": "XGBRegressor"}
+
+            journal = TrialJournal(journal_path, data_fingerprint='abc')
+            self.assertIsNone(journal.get_scores(trial))
+            journal.add_trial(trial, 12.5)
+
+            # A line of a killed process is incomplete
+            with open(journal_path, 'a') as f:
+                f.write('{"data_fingerprint": "abc", "tri')
+
+            # Completed trials are loaded again, only for the same data fingerprint
+            self.assertEqual(TrialJournal(journal_path, data_fingerprint='abc').get_scores(reordered_trial), 12.5)
+            self.assertIsNone(TrialJournal(journal_path, data_fingerprint='def').get_scores(trial))
+
+            # A trial appended after the incomplete line is loaded as well
+            journal = TrialJournal(journal_path, data_fingerprint='abc')
+            journal.add_trial({**trial, "fold": 1}, 14.0)
+            self.assertEqual(TrialJournal(journal_path, data_fingerprint='abc').get_scores({**trial, "fold": 1}), 14.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,8 @@
+import hashlib
+import pandas as pd
+
+def data_fingerprint(df):
+    row_hashes = pd.util.hash_pandas_object(df, index=False).to_numpy()
+    fingerprint = hashlib.blake2b(row_hashes.tobytes(), digest_size=16)
+    fingerprint.update(str([(col_name, str(dtype)) for col_name, dtype in df.dtypes.items()]).encode())
+    return fingerprint.hexdigest()
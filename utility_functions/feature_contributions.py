@@ -0,0 +1,115 @@
+import numpy as np
+import xgboost as xgb
+from scipy import sparse
+from sklearn.ensemble import ExtraTreesRegressor, RandomForestRegressor
+from modelling.model_registry import LazyModel
+
+# Number of rows explained together, which bounds the memory of the contributions and the RF decision paths
+CONTRIBUTION_CHUNK_ROWS = 10000
+
+
+def _create_tree_contribution_matrix(tree, n_features):
+    """
+    Creates the sparse [node, feature] matrix of a sklearn tree, which has the sum of the value changes
+    along the path from the root to the node, at the features of the splits on the path.
+
+    The contributions of a row are the row of the leaf the row reaches, so the rows are only routed
+    with the apply of the tree, which sends missing values to the same child as the prediction.
+    The matrix is created level by level, the rows of a level are the rows of their parents
+    plus the value change of their own split.
+
+    Args:
+        tree (sklearn.tree._tree.Tree): The fitted tree.
+        n_features (int): Number of features.
+
+    Returns:
+        sparse.csr_matrix: Summed value changes of the path of each node by feature.
+    """
+    node_values = tree.value[:, 0, 0]
+    level_nodes = np.array([0])
+    level_matrix = sparse.csr_matrix((1, n_features))
+    node_order, level_matrices = [level_nodes], [level_matrix]
+
+    while True:
+        parent_positions = np.flatnonzero(tree.children_left[level_nodes] != -1)
+        if len(parent_positions) == 0:
+            break
+
+        parent_nodes = level_nodes[parent_positions]
+        child_nodes = np.concatenate([tree.children_left[parent_nodes], tree.children_right[parent_nodes]])
+        parent_positions = np.concatenate([parent_positions, parent_positions])
+        parent_nodes = np.concatenate([parent_nodes, parent_nodes])
+
+        value_changes = sparse.csr_matrix((node_values[child_nodes] - node_values[parent_nodes],
+                                           (np.arange(len(child_nodes)), tree.feature[parent_nodes])),
+                                          shape=(len(child_nodes), n_features))
+        level_nodes, level_matrix = child_nodes, level_matrix[parent_positions] + value_changes
+        node_order.append(level_nodes)
+        level_matrices.append(level_matrix)
+
+    # The rows are ordered by level, they are put back in the order of the node ids
+    node_positions = np.empty(tree.node_count, dtype=np.int64)
+    node_positions[np.concatenate(node_order)] = np.arange(tree.node_count)
+
+    return sparse.vstack(level_matrices, format='csr')[node_positions]
+
+
+def feature_contributions(model, x, chunk_size=CONTRIBUTION_CHUNK_ROWS):
+    """
+    Calculates the contribution of each feature to the prediction of each row with the native tree paths
+    of the model, in chunks of rows.
+
+    XGBoost and LightGBM models use their own contribution predictions (SHAP values). RF models use
+    the paths of their trees: the contribution of a feature is the sum of the value changes
+    of the splits on the feature along the path to the leaf of the row, averaged over the trees.
+    The contributions and the bias of a row add up to its prediction for all models, also with missing values.
+
+    Args:
+        model: A trained XGBoost, LightGBM or sklearn forest model, or a LazyModel of the model registry.
+        x (pd.DataFrame): Feature rows.
+        chunk_size (int): Number of rows explained together.
+
+    Yields:
+        np.ndarray: Contributions of the rows of a chunk, with the bias in the last column.
+
+    Raises:
+        ValueError: If the model has no native contribution path.
+    """
+    # The path is picked by the class of the model, so a lazy model of the registry is loaded first
+    if isinstance(model, LazyModel):
+        model = model.load()
+
+    # Other sklearn ensembles also have estimators_, but their trees are not averaged like in a forest
+    is_forest = isinstance(model, (RandomForestRegressor, ExtraTreesRegressor))
+
+    if is_forest:
+        # The path matrices of the trees are created once and reused for all chunks
+        n_features = x.shape[1]
+        tree_matrices = [(estimator, _create_tree_contribution_matrix(estimator.tree_, n_features))
+                         for estimator in model.estimators_]
+        bias = np.mean([estimator.tree_.value[0, 0, 0] for estimator in model.estimators_])
+
+    elif not hasattr(model, 'get_booster') and not hasattr(model, 'booster_'):
+        raise ValueError(f"{type(model).__name__} has no native feature contribution path.")
+
+    for start in range(0, len(x), chunk_size):
+        chunk_x = x.iloc[start:start + chunk_size]
+
+        if is_forest:
+            chunk_array = chunk_x.to_numpy(dtype=np.float32)
+            contributions = np.zeros((len(chunk_x), n_features + 1))
+
+            # decision_path does not follow missing_go_to_left, so the path is taken from the leaf of apply
+            for estimator, tree_matrix in tree_matrices:
+                contributions[:, :-1] += tree_matrix[estimator.apply(chunk_array)].toarray()
+
+            contributions[:, :-1] /= len(tree_matrices)
+            contributions[:, -1] = bias
+
+        elif hasattr(model, 'get_booster'):
+            contributions = model.get_booster().predict(xgb.DMatrix(chunk_x), pred_contribs=True)
+
+        else:
+            contributions = model.booster_.predict(chunk_x, pred_contrib=True)
+
+        yield np.asarray(contributions, dtype=np.float64)
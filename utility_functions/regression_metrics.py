@@ -0,0 +1,152 @@
+import numpy as np
+
+# Maximum number of resampled rows gathered together in bootstrap_regression_metrics
+BOOTSTRAP_BATCH_INDICES = 2 ** 21
+
+
+def create_group_index(group_values):
+    """
+    Creates the group index of the rows for grouped_regression_metrics, e.g. from the shop_id of each row.
+    The index can be created once and reused for the predictions of all models.
+
+    Args:
+        group_values (array-like): Group of each row.
+
+    Returns:
+        np.ndarray: Sorted unique groups.
+        np.ndarray: Position of the group of each row in the unique groups.
+    """
+    group_labels, group_index = np.unique(np.asarray(group_values), return_inverse=True)
+    return group_labels, group_index.ravel()
+
+
+def regression_metrics(y_true, y_pred):
+    """
+    Calculates MAPE, MAE, RMSE and bias of the predictions together, reusing the same error array.
+    MAPE skips the rows with zero target like mean_absolute_percentage_error.
+
+    Args:
+        y_true (array-like): True values.
+        y_pred (array-like): Predicted values.
+
+    Returns:
+        dict: MAPE (%), MAE, RMSE and bias (mean of prediction - true value).
+    """
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    error = np.asarray(y_pred, dtype=np.float64).ravel() - y_true
+    nonzero = y_true != 0
+
+    bias = error.sum() / len(error)
+    rmse = np.sqrt(np.dot(error, error) / len(error))
+
+    # The error array is overwritten with the absolute error, and then with the absolute percentage error
+    np.abs(error, out=error)
+    mae = error.sum() / len(error)
+    np.divide(error, np.abs(y_true), out=error, where=nonzero)
+    mape = error.sum(where=nonzero) / nonzero.sum() * 100
+
+    return {"mape": mape, "mae": mae, "rmse": rmse, "bias": bias}
+
+
+def grouped_regression_metrics(y_true, y_pred, group_index, n_groups):
+    """
+    Calculates MAPE, MAE, RMSE and bias of the predictions for each group with weighted bincounts,
+    so all groups are calculated together without sorting or splitting the rows.
+
+    Args:
+        y_true (array-like): True values.
+        y_pred (array-like): Predicted values.
+        group_index (np.ndarray): Group position of each row, from create_group_index.
+        n_groups (int): Number of groups.
+
+    Returns:
+        dict: Arrays of MAPE (%), MAE, RMSE, bias and the row count for each group.
+            MAPE is NaN for the groups which only have zero targets.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    error = np.asarray(y_pred, dtype=np.float64).ravel() - y_true
+    nonzero = y_true != 0
+
+    count = np.bincount(group_index, minlength=n_groups)
+    bias_sum = np.bincount(group_index, weights=error, minlength=n_groups)
+    squared_error_sum = np.bincount(group_index, weights=error * error, minlength=n_groups)
+
+    np.abs(error, out=error)
+    absolute_error_sum = np.bincount(group_index, weights=error, minlength=n_groups)
+
+    # Rows with zero target get zero weight and are not counted
+    np.divide(error, np.abs(y_true), out=error, where=nonzero)
+    error[~nonzero] = 0
+    percentage_error_sum = np.bincount(group_index, weights=error, minlength=n_groups)
+    nonzero_count = np.bincount(group_index, weights=nonzero, minlength=n_groups)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return {
+            "mape": percentage_error_sum / nonzero_count * 100,
+            "mae": absolute_error_sum / count,
+            "rmse": np.sqrt(squared_error_sum / count),
+            "bias": bias_sum / count,
+            "count": count
+        }
+
+
+def bootstrap_regression_metrics(y_true, y_pred, n_resamples=1000, confidence_level=0.95, random_state=0):
+    """
+    Calculates bootstrap confidence intervals of MAPE, MAE and RMSE of the predictions.
+
+    The row errors are calculated once, and the resamples are rows of a random index matrix. The indices of a batch
+    of resamples are counted with one bincount, and the error sums of all resamples of the batch are one matrix
+    product of the counts with the row errors. The batches are limited to BOOTSTRAP_BATCH_INDICES indices, which
+    bounds the memory for large test sets. The same random_state gives the same resamples for every model with
+    the same number of rows, so the intervals of the models are comparable.
+
+    Args:
+        y_true (array-like): True values.
+        y_pred (array-like): Predicted values.
+        n_resamples (int): Number of bootstrap resamples.
+        confidence_level (float): Confidence level of the intervals.
+        random_state (int): Seed of the resamples.
+
+    Returns:
+        dict: (lower bound, upper bound) of MAPE (%), MAE and RMSE, which are NaN if there is no row.
+    """
+    y_true = np.asarray(y_true, dtype=np.float64).ravel()
+    error = np.asarray(y_pred, dtype=np.float64).ravel() - y_true
+    nonzero = y_true != 0
+    n_rows = len(y_true)
+
+    # An empty set has no resamples, and the batch size below would divide by zero
+    if n_rows == 0:
+        return {metric_name: (np.nan, np.nan) for metric_name in ["mape", "mae", "rmse"]}
+
+    # Absolute error, squared error, absolute percentage error and nonzero target flag of each row
+    row_errors = np.empty((n_rows, 4))
+    row_errors[:, 0] = np.abs(error)
+    row_errors[:, 1] = error * error
+    row_errors[:, 2] = 0
+    np.divide(row_errors[:, 0], np.abs(y_true), out=row_errors[:, 2], where=nonzero)
+    row_errors[:, 3] = nonzero
+
+    rng = np.random.default_rng(random_state)
+    resamples_per_batch = max(1, BOOTSTRAP_BATCH_INDICES // n_rows)
+
+    resample_sums = np.empty((n_resamples, 4))
+    for start in range(0, n_resamples, resamples_per_batch):
+        n_batch_resamples = min(resamples_per_batch, n_resamples - start)
+        resample_index = rng.integers(0, n_rows, size=(n_batch_resamples, n_rows))
+
+        # Each resample counts its indices in its own range of the bincount
+        resample_index += np.arange(n_batch_resamples)[:, None] * n_rows
+        resample_counts = np.bincount(resample_index.ravel(), minlength=n_batch_resamples * n_rows)
+        resample_sums[start:start + n_batch_resamples] = \
+            resample_counts.reshape(n_batch_resamples, n_rows).astype(np.float64) @ row_errors
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        resample_metrics = {
+            "mape": resample_sums[:, 2] / resample_sums[:, 3] * 100,
+            "mae": resample_sums[:, 0] / n_rows,
+            "rmse": np.sqrt(resample_sums[:, 1] / n_rows)
+        }
+
+    quantiles = [(1 - confidence_level) / 2, (1 + confidence_level) / 2]
+    return {metric_name: tuple(np.nanquantile(values, quantiles)) for metric_name, values in resample_metrics.items()}